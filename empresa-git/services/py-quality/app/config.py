@@ -20,6 +20,27 @@ class Settings(BaseSettings):
     # Duplicates detection
     dup_threshold: float = 0.90
     dup_key_columns: str = "nombre,email"
+    # Candidate generation: "blocking" (key prefixes/suffixes) or "minhash" (LSH)
+    dup_engine: str = "blocking"
+    # MinHash signature: dup_minhash_bands bands of dup_minhash_rows values each
+    dup_minhash_bands: int = 20
+    dup_minhash_rows: int = 4
+    dup_shingle_size: int = 3
+    # Rows kept per blocking key (bounds the comparisons per row)
+    dup_block_max_size: int = 50
+    # Blocking recall is estimated on one row in dup_recall_stride, up to dup_recall_sample rows
+    dup_recall_stride: int = 97
+    dup_recall_sample: int = 100
+    # Candidate pairs are scored per tile of rows on dup_workers threads (-1 for all cores)
+    dup_tile_rows: int = 2048
+    dup_workers: int = -1
+    # Report one duplicate_cluster issue per group of duplicates instead of one issue per pair
+    dup_clusters: bool = False
+
+    # Column routing: also route columns by the type inferred from their values
+    # (only when the name says nothing); compiled plans are cached per header
+    route_types: bool = False
+    route_plan_cache_size: int = 256
 
     # Date normalization
     date_output_fmt: str = "YYYY-MM-DD"
@@ -27,6 +48,18 @@ class Settings(BaseSettings):
     # Preview limits
     preview_max_rows: int = 100
 
+    # Streaming ingestion
+    chunk_rows: int = 50000
+    stream_threshold_mb: int = 256
+    xlsx_stream_threshold_mb: int = 16
+
+    # CSV parsing: "auto" (pyarrow above the size threshold), "c" or "pyarrow"
+    csv_engine: str = "auto"
+    pyarrow_csv_min_mb: int = 8
+
+    # Parsed dataset cache (shared between services within and across requests)
+    dataset_cache_mb: int = 512
+
     # Logging
     log_level: str = "INFO"
 
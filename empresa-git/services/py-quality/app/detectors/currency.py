@@ -1,101 +1,94 @@
 """Currency detector"""
-import re
-from typing import List
 import pandas as pd
-from app.schemas import Issue, IssueKind, Severity
-
-
-# Currency symbols and codes
-CURRENCY_SYMBOLS = ["€", "$", "£", "¥"]
-CURRENCY_CODES = ["EUR", "USD", "GBP", "JPY"]
-
-
-def detect(df: pd.DataFrame, column: str, config: dict = None) -> List[Issue]:
+from app.schemas import IssueBatch, IssueKind, Severity
+from app.normalizers.currency import parse_series
+from app.utils import ColumnView, column_view
+
+
+def detect(
+    df: pd.DataFrame,
+    column: str,
+    config: dict = None,
+    state: dict = None,
+    view: ColumnView = None,
+) -> IssueBatch:
     """
     Detect currency format issues
 
     Checks for:
     - Unparseable currency values
-    - Mixed currency symbols
+    - Mixed currencies (symbols count as their ISO code: "€" is EUR)
     - Invalid formats
 
+    When a ``state`` dict is passed (chunked detection) the currencies seen
+    are carried across calls and the mixed-currency warning is emitted by
+    ``finalize``.
+
     Args:
         df: DataFrame to check
         column: Column name to check
         config: Optional configuration
+        state: Optional cross-chunk state, shared between calls
+        view: Column view shared with the other detectors of the column
 
     Returns:
-        List of Issue objects
+        IssueBatch with the issues found
     """
-    issues = []
-
     if column not in df.columns:
-        return issues
-
-    currencies_found = set()
-
-    for idx, value in df[column].items():
-        # Skip if empty/null
-        if pd.isna(value) or str(value).strip() == "":
-            continue
-
-        value_str = str(value).strip()
-
-        # Detect currency symbol/code
-        currency_detected = None
-        for symbol in CURRENCY_SYMBOLS:
-            if symbol in value_str:
-                currency_detected = symbol
-                currencies_found.add(symbol)
-                break
-
-        if not currency_detected:
-            for code in CURRENCY_CODES:
-                if code in value_str.upper():
-                    currency_detected = code
-                    currencies_found.add(code)
-                    break
-
-        # Try to extract numeric value
-        # Remove currency symbols and codes
-        numeric_str = value_str
-        for symbol in CURRENCY_SYMBOLS + CURRENCY_CODES:
-            numeric_str = numeric_str.replace(symbol, "")
-
-        # Replace comma with dot (European format)
-        numeric_str = numeric_str.replace(",", ".").strip()
-
-        # Try to parse as float
-        try:
-            float(numeric_str)
-        except ValueError:
-            issues.append(
-                Issue(
-                    kind=IssueKind.CURRENCY,
-                    severity=Severity.ERROR,
-                    row=int(idx),
-                    col=column,
-                    details={
-                        "value": value_str,
-                        "reason": "Cannot parse numeric value from currency string",
-                    },
-                )
-            )
+        return IssueBatch.empty()
+
+    streaming = state is not None
+    if not streaming:
+        state = {}
+
+    currencies_found = state.setdefault("currencies", set())
+
+    # Distinct non-blank values, parsed with the normalizer's rules
+    distinct = column_view(df, column, view).distinct
+    _, currencies, parsed = parse_series(pd.Series(distinct.values, dtype=object))
+    currencies_found.update(currencies[pd.notna(currencies)])
+    rows, codes = distinct.select(~parsed)
+
+    issues = IssueBatch.build(
+        IssueKind.CURRENCY,
+        Severity.ERROR,
+        rows,
+        column,
+        shared={"reason": "Cannot parse numeric value from currency string"},
+        value=distinct.take(distinct.values, codes),
+    )
+
+    if not streaming:
+        issues = IssueBatch.concat([issues, finalize(column, state)])
+
+    return issues
+
+
+def finalize(column: str, state: dict) -> IssueBatch:
+    """
+    Emit the mixed-currency warning once all values of a column have been seen
+
+    Args:
+        column: Column name
+        state: State accumulated by ``detect``
+
+    Returns:
+        IssueBatch with the issues found
+    """
+    currencies_found = sorted(state.get("currencies", set()))
 
     # Check for mixed currencies
     if len(currencies_found) > 1:
         # Add warning about mixed currencies (only once)
-        issues.append(
-            Issue(
-                kind=IssueKind.CURRENCY,
-                severity=Severity.WARN,
-                row=None,
-                col=column,
-                details={
-                    "reason": f"Mixed currencies detected: {', '.join(currencies_found)}",
-                    "currencies": list(currencies_found),
-                },
-            )
+        return IssueBatch.build(
+            IssueKind.CURRENCY,
+            Severity.WARN,
+            [None],
+            column,
+            shared={
+                "reason": f"Mixed currencies detected: {', '.join(currencies_found)}",
+                "currencies": currencies_found,
+            },
         )
 
-    return issues
+    return IssueBatch.empty()
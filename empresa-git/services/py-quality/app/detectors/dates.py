@@ -1,74 +1,166 @@
 """Date format detector"""
-from typing import List, Set
+import re
+import numpy as np
 import pandas as pd
-from app.schemas import Issue, IssueKind, Severity
+from app.schemas import IssueBatch, IssueKind, Severity
+from app.utils import ColumnView, column_view
 
 
-def detect(df: pd.DataFrame, column: str, config: dict = None) -> List[Issue]:
+def detect(
+    df: pd.DataFrame,
+    column: str,
+    config: dict = None,
+    state: dict = None,
+    view: ColumnView = None,
+) -> IssueBatch:
     """
     Detect inconsistent date formats in a column
 
     Checks if dates use mixed formats (DD/MM/YYYY vs YYYY-MM-DD, etc.)
 
+    The dominant format is only known once the whole column has been seen,
+    so when a ``state`` dict is passed (chunked detection) values are
+    accumulated across calls and issues are emitted by ``finalize``. Any
+    dated row may end up reported, so the state grows with the number of
+    dated rows: about 12 bytes each (a row number and a value code), plus
+    the column's distinct dated values.
+
     Args:
         df: DataFrame to check
         column: Column name to check
         config: Optional configuration
+        state: Optional cross-chunk state, shared between calls
+        view: Column view shared with the other detectors of the column
 
     Returns:
-        List of Issue objects
+        IssueBatch with the issues found
     """
-    issues = []
-
     if column not in df.columns:
-        return issues
+        return IssueBatch.empty()
+
+    streaming = state is not None
+    if not streaming:
+        state = {}
+
+    # Each distinct non-blank value is classified once, column-wide
+    distinct = column_view(df, column, view).distinct
+    formats = classify_date_formats(pd.Series(distinct.values, dtype=object)).to_numpy()
+    dated = pd.notna(formats)
+    rows, codes = distinct.select(dated)
+
+    # Dated rows are kept until the dominant format is known, as the row
+    # number and a code into the column's distinct dated values: O(rows),
+    # though the values themselves (dates repeat) grow with the calendar span
+    value_codes = state.setdefault("value_codes", {})
+    value_formats = state.setdefault("value_formats", [])
+    format_codes = state.setdefault("format_codes", {})
+    counts = state.setdefault("format_counts", [])
+
+    chunk_codes = np.full(len(formats), -1, dtype=np.int32)
+    for position in np.flatnonzero(dated):
+        value = distinct.values[position]
+        code = value_codes.get(value)
+        if code is None:
+            code = value_codes[value] = len(value_codes)
+            value_formats.append(format_codes.setdefault(formats[position], len(format_codes)))
+        chunk_codes[position] = code
+    row_codes = chunk_codes[codes]
+
+    # Per-format counts, formats numbered in order of first appearance
+    row_formats = np.asarray(value_formats, dtype=np.int32)[row_codes]
+    counts.extend([0] * (len(format_codes) - len(counts)))
+    for format_code, count in zip(*np.unique(row_formats, return_counts=True)):
+        counts[format_code] += int(count)
+
+    state.setdefault("rows", []).append(np.asarray(rows, dtype=np.int64))
+    state.setdefault("codes", []).append(row_codes)
+
+    if streaming:
+        return IssueBatch.empty()
+    return finalize(column, state)
+
+
+def finalize(column: str, state: dict) -> IssueBatch:
+    """
+    Emit date format issues once all values of a column have been seen
 
-    # Track detected formats
-    formats_found: Set[str] = set()
-    values_by_format = {}
+    Args:
+        column: Column name
+        state: State accumulated by ``detect``
 
-    for idx, value in df[column].items():
-        # Skip if empty/null
-        if pd.isna(value) or str(value).strip() == "":
-            continue
+    Returns:
+        IssueBatch with the issues found
+    """
+    counts = state.get("format_counts")
+
+    # If multiple formats found, report as issues
+    if not counts or len(counts) <= 1:
+        return IssueBatch.empty()
+
+    # Determine which format is most common (the first seen wins ties)
+    labels = np.array(list(state["format_codes"]), dtype=object)
+    dominant = int(np.argmax(counts))
+    dominant_format = labels[dominant]
+
+    # Report non-dominant formats as issues, grouped by format
+    rows = np.concatenate(state["rows"])
+    codes = np.concatenate(state["codes"])
+    row_formats = np.asarray(state["value_formats"], dtype=np.int32)[codes]
+    order = np.argsort(row_formats, kind="stable")
+    order = order[row_formats[order] != dominant]
+
+    values = np.array(list(state["value_codes"]), dtype=object)[codes[order]]
+    detected = labels[row_formats[order]]
+
+    return IssueBatch.build(
+        IssueKind.DATE_FORMAT,
+        Severity.WARN,
+        rows[order],
+        column,
+        shared={"dominant_format": dominant_format},
+        value=values,
+        detected_format=detected,
+        reason="Inconsistent date format. Found " + detected + f", expected {dominant_format}",
+    )
+
+
+def classify_date_formats(values: pd.Series) -> pd.Series:
+    """
+    Label the date format of a whole column of strings at once
 
-        value_str = str(value).strip()
+    Vectorized equivalent of ``detect_date_format``: the separator is the
+    first of ``/``, ``-`` and ``.`` present, and a single regex extract per
+    separator yields the three parts whose lengths decide the format.
 
-        # Try to detect format
-        detected_format = detect_date_format(value_str)
+    Args:
+        values: Series of stripped strings
 
-        if detected_format:
-            formats_found.add(detected_format)
-            if detected_format not in values_by_format:
-                values_by_format[detected_format] = []
-            values_by_format[detected_format].append((int(idx), value_str))
+    Returns:
+        Series of format labels (None where not recognized)
+    """
+    labels = pd.Series([None] * len(values), index=values.index, dtype=object)
+    remaining = pd.Series(True, index=values.index)
 
-    # If multiple formats found, report as issues
-    if len(formats_found) > 1:
-        # Determine which format is most common
-        format_counts = {fmt: len(vals) for fmt, vals in values_by_format.items()}
-        dominant_format = max(format_counts, key=format_counts.get)
-
-        # Report non-dominant formats as issues
-        for fmt, occurrences in values_by_format.items():
-            if fmt != dominant_format:
-                for row_idx, value_str in occurrences:
-                    issues.append(
-                        Issue(
-                            kind=IssueKind.DATE_FORMAT,
-                            severity=Severity.WARN,
-                            row=row_idx,
-                            col=column,
-                            details={
-                                "value": value_str,
-                                "detected_format": fmt,
-                                "dominant_format": dominant_format,
-                                "reason": f"Inconsistent date format. Found {fmt}, expected {dominant_format}",
-                            },
-                        )
-                    )
-
-    return issues
+    for sep in ("/", "-", "."):
+        has_sep = remaining & values.str.contains(sep, regex=False)
+        remaining &= ~has_sep
+        if not has_sep.any():
+            continue
+
+        escaped = re.escape(sep)
+        parts = values[has_sep].str.extract(
+            f"^([^{escaped}]*){escaped}[^{escaped}]*{escaped}([^{escaped}]*)$"
+        )
+        first_len = parts[0].str.len()
+        last_len = parts[1].str.len()
+
+        labels[has_sep] = np.select(
+            [first_len == 4, last_len == 4, last_len == 2],
+            [f"YYYY{sep}MM{sep}DD", f"DD{sep}MM{sep}YYYY", f"DD{sep}MM{sep}YY"],
+            default=None,
+        )
+
+    return labels
 
 
 def detect_date_format(value: str) -> str | None:
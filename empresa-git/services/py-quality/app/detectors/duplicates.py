@@ -1,28 +1,339 @@
 """Duplicates detector using fuzzy matching"""
-from typing import List
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
-from rapidfuzz import fuzz
-from app.schemas import Issue, IssueKind, Severity
+from rapidfuzz import fuzz, process
+from app.schemas import IssueBatch, IssueKind, Severity, DedupeEngine
 from app.config import settings
-from app.utils import hash_row
+from app.utils import (
+    MinHasher,
+    connected_components,
+    normalize_keys,
+    normalized_fingerprints,
+    object_array,
+)
 
 
-def detect(df: pd.DataFrame, column: str = None, config: dict = None) -> List[Issue]:
+# Characters of each key value used as prefix and suffix blocking keys
+BLOCK_PREFIX_CHARS = 8
+BLOCK_SUFFIX_CHARS = 8
+
+# Cells of one similarity matrix; larger ones are computed in slabs of rows
+SCORE_MATRIX_CELLS = 1_000_000
+
+
+def detect(
+    df: pd.DataFrame,
+    column: str = None,
+    config: dict = None,
+    state: dict = None,
+    frame_blocks: Optional[List[List[tuple]]] = None,
+) -> IssueBatch:
     """
     Detect duplicate rows using fuzzy matching
 
+    Exact duplicates (equal normalized key values) are found by 64-bit row
+    fingerprints (see ``fingerprint_rows``); repeats within the frame are
+    resolved in bulk. The other rows are only compared with earlier rows
+    sharing a block. With the ``blocking`` engine blocks are the prefix or
+    the suffix of one of their key values; with the ``minhash`` engine they
+    are the LSH bands of a MinHash signature over character shingles of the
+    key values (see ``MinHasher``), so candidates are found in time linear
+    in the rows.
+    Candidates of both engines are verified with the same fuzzy scoring
+    against ``dup_threshold``. Each block keeps its latest
+    ``dup_block_max_size`` rows, which bounds the comparisons per row. The
+    recall lost to blocking is estimated on a sample of rows (one in
+    ``dup_recall_stride``, up to ``dup_recall_sample``) compared with every
+    earlier row; see ``summarize``.
+
+    Rows are handled in tiles of ``dup_tile_rows``: candidates are gathered
+    row by row, then all the candidate pairs of the tile are scored together
+    by one ``rapidfuzz.process.cdist`` matrix per key column on
+    ``dup_workers`` threads (see ``score_pairs``), as are the tile's recall
+    sample rows.
+
+    When a ``state`` dict is passed (chunked detection) the rows already seen
+    are carried across calls, so duplicates spanning chunks are reported.
+
     Args:
         df: DataFrame to check
         column: Not used for duplicates (checks entire rows)
-        config: Optional configuration (dup_threshold, dup_key_columns)
+        config: Optional configuration (dup_threshold, dup_key_columns,
+            dup_engine, dup_minhash_bands, dup_minhash_rows, dup_shingle_size,
+            dup_block_max_size, dup_recall_stride, dup_recall_sample,
+            dup_tile_rows, dup_workers)
+        state: Optional cross-chunk state, shared between calls
+        frame_blocks: Blocks of every row of df, when the caller has them
+            already (see ``block_keys``); computed per tile otherwise
 
     Returns:
-        List of Issue objects
+        IssueBatch with the issues found
     """
-    issues = []
-
     # Get config
-    threshold = config.get("dup_threshold", settings.dup_threshold) if config else settings.dup_threshold
+    threshold = _option(config, "dup_threshold")
+    block_max_size = _option(config, "dup_block_max_size")
+    recall_stride = _option(config, "dup_recall_stride")
+    recall_sample = _option(config, "dup_recall_sample")
+    tile_rows = _option(config, "dup_tile_rows")
+    workers = _option(config, "dup_workers")
+
+    if state is None:
+        state = {}
+
+    # Key columns are fixed by the first chunk so every chunk hashes alike
+    if "keys" not in state:
+        state["keys"] = key_columns(df, config)
+
+    available_keys = state["keys"]
+    if not available_keys:
+        return IssueBatch.empty()
+
+    # The engine is fixed by the first chunk too: blocks of both engines differ
+    engine = state.setdefault("engine", DedupeEngine(_option(config, "dup_engine")))
+
+    # Rows kept for comparison, by position: row number and key values per column
+    seen_rows: List[int] = state.setdefault("rows", [])
+    seen_values: List[List[str]] = state.setdefault("values", [[] for _ in available_keys])
+    exact = state.setdefault("exact", {})  # row fingerprint -> position
+    blocks = state.setdefault("blocks", {})  # block key -> latest positions
+    # Leading positions loaded from a dedupe index rather than seen in this input
+    reference = state.get("reference", 0)
+    stats = state.setdefault(
+        "stats",
+        {"comparisons": 0, "all_pairs": 0, "sampled": 0, "recall_rows": 0, "recall_found": 0},
+    )
+
+    normalized, fingerprints = normalized_fingerprints(df, available_keys)
+    index = df.index.to_numpy()
+
+    # Rows repeating an earlier row of the frame are exact duplicates of its
+    # first occurrence: resolved in bulk, only first occurrences are looped over
+    codes, _ = pd.factorize(fingerprints)
+    _, first_rows = np.unique(codes, return_index=True)
+    first_of = first_rows[codes]
+
+    matched = np.full(len(df), -1, dtype=np.int64)  # position each row duplicates
+    resolved = np.full(len(df), -1, dtype=np.int64)  # position each first occurrence stands for
+    similarity = np.ones(len(df))
+    method = np.full(len(df), "exact", dtype=object)
+
+    for start in range(0, len(first_rows), tile_rows):
+        tile = first_rows[start : start + tile_rows]
+        tile_keys = list(zip(*(normalized[col].to_numpy()[tile].tolist() for col in available_keys)))
+        if frame_blocks is None:
+            tile_blocks = block_keys(tile_keys, engine, config)
+        else:
+            tile_blocks = [frame_blocks[row] for row in tile.tolist()]
+
+        frame_of: Dict[int, int] = {}  # position -> frame row of the rows stored in the tile
+        left: List[int] = []  # candidate pairs (positions of the scored row and an earlier row)
+        right: List[int] = []
+        sampled: List[Tuple[tuple, int]] = []  # (key values, position) of the rows used for recall
+
+        # Candidates are gathered row by row, so rows of the tile see the earlier ones
+        for row, idx, fingerprint, key_values, row_blocks in zip(
+            tile.tolist(), index[tile].tolist(), fingerprints[tile].tolist(), tile_keys, tile_blocks
+        ):
+            # Check for exact match first
+            if fingerprint in exact:
+                matched[row] = resolved[row] = exact[fingerprint]
+                continue
+
+            # Fuzzy candidates: the rows sharing a block, oldest first
+            position = len(seen_rows)
+            resolved[row] = position
+            frame_of[position] = row
+            candidates = sorted({pos for block in row_blocks for pos in blocks.get(block, ())})
+            left.extend([position] * len(candidates))
+            right.extend(candidates)
+            stats["all_pairs"] += position
+
+            # Sampled rows are also compared with every earlier row
+            if idx % recall_stride == 0 and position and stats["sampled"] < recall_sample:
+                stats["sampled"] += 1
+                sampled.append((key_values, position))
+
+            # Store this row
+            seen_rows.append(idx)
+            for values, value in zip(seen_values, key_values):
+                values.append(value)
+            exact[fingerprint] = position
+            for block in row_blocks:
+                blocks.setdefault(block, deque(maxlen=block_max_size)).append(position)
+
+        # Score the candidate pairs of the whole tile at once
+        stats["comparisons"] += len(left)
+        matches = _first_matches(
+            np.asarray(left, dtype=np.int64),
+            np.asarray(right, dtype=np.int64),
+            seen_values,
+            threshold,
+            workers,
+        )
+        for position, (match, score) in matches.items():
+            row = frame_of[position]
+            matched[row] = match
+            similarity[row] = round(score, 2)
+            method[row] = "fuzzy"
+
+        if sampled:
+            best = _best_similarities(sampled, seen_values, workers)
+            for (_, position), score in zip(sampled, best):
+                if score >= threshold:
+                    stats["recall_rows"] += 1
+                    stats["recall_found"] += position in matches
+
+    # Repeats point where their first occurrence was matched, or at it when it was stored
+    repeats = first_of != np.arange(len(df))
+    matched[repeats] = resolved[first_of[repeats]]
+
+    hits = np.flatnonzero(matched >= 0)
+    positions = matched[hits]
+    sources = np.full(len(hits), None, dtype=object)
+    sources[positions < reference] = "index"
+
+    return IssueBatch.build(
+        IssueKind.DUPLICATE,
+        Severity.WARN,
+        index[hits],
+        shared={"match_fields": available_keys},
+        duplicate_of=[seen_rows[position] for position in positions.tolist()],
+        similarity=similarity[hits],
+        method=method[hits],
+        source=sources,
+    )
+
+
+def finalize(column: str, state: dict) -> IssueBatch:
+    """Duplicates are reported as they are found; nothing is pending"""
+    return IssueBatch.empty()
+
+
+def summarize(state: dict) -> Dict[str, Any]:
+    """
+    Describe the work done by ``detect`` for the issue summary
+
+    Args:
+        state: State accumulated by ``detect``
+
+    Returns:
+        Dictionary with the pairs compared, the pairs an all-pairs scan would
+        compare, and the estimated recall of blocking (None when no sampled
+        row had a duplicate) with the number of sampled duplicates behind it
+    """
+    stats = state.get("stats")
+    if not stats:
+        return {}
+
+    return {
+        "engine": state["engine"].value,
+        "comparisons": stats["comparisons"],
+        "all_pairs_comparisons": stats["all_pairs"],
+        "recall_estimate": (
+            round(stats["recall_found"] / stats["recall_rows"], 3) if stats["recall_rows"] else None
+        ),
+        "recall_sample": stats["recall_rows"],
+    }
+
+
+def cluster_rows(issues: IssueBatch) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group duplicate rows into clusters, transitively
+
+    Pairwise ``duplicate`` issues link a row to its match and
+    ``duplicate_cluster`` issues link their survivor to every member; the
+    clusters are the connected components of those links (union-find, see
+    ``connected_components``). Matches against a dedupe index are left out:
+    they point at index records, not at rows.
+
+    Args:
+        issues: Issues of any kind (only duplicate ones are used)
+
+    Returns:
+        Tuple of (every clustered row in ascending order, its cluster's
+        survivor: the earliest row of the cluster)
+    """
+    pairs = issues.take(issues.is_kind(IssueKind.DUPLICATE) & ~issues.has_detail("source"))
+    records = issues.take(issues.is_kind(IssueKind.DUPLICATE_CLUSTER))
+
+    members = records.detail_array("members")
+    sizes = np.fromiter((len(rows) for rows in members), dtype=np.int64, count=len(members))
+    left = np.concatenate([pairs.row, np.repeat(records.row, sizes)])
+    right = np.concatenate(
+        [pairs.detail_array("duplicate_of").astype(np.int64)]
+        + [np.asarray(rows, dtype=np.int64) for rows in members]
+    )
+    if not len(left):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    return connected_components(left, right)
+
+
+def cluster(issues: IssueBatch) -> IssueBatch:
+    """
+    Replace pairwise duplicate issues with one issue per cluster
+
+    A group of n near-identical rows yields n - 1 ``duplicate`` issues,
+    each pointing at the first match found; they are collapsed into one
+    ``duplicate_cluster`` issue on the survivor (the earliest row) listing
+    the other members, with the lowest similarity among them.
+
+    Args:
+        issues: Issues of any kind (the others are kept, in order)
+
+    Returns:
+        IssueBatch with the other issues followed by the cluster issues
+    """
+    is_pair = issues.is_kind(IssueKind.DUPLICATE) & ~issues.has_detail("source")
+    pairs = issues.take(is_pair)
+    rows, survivors = cluster_rows(pairs)
+    if not len(rows):
+        return issues
+
+    # Similarity of each member's own match (survivors have none)
+    similarity = pd.Series(pairs.detail_array("similarity").astype(float), index=pairs.row)
+    clusters = pd.DataFrame({"row": rows, "survivor": survivors})
+    clusters = clusters[clusters["row"] != clusters["survivor"]]
+    clusters["similarity"] = similarity.reindex(clusters["row"]).to_numpy()
+    grouped = clusters.groupby("survivor", sort=True)
+
+    return IssueBatch.concat(
+        [
+            issues.take(~is_pair),
+            IssueBatch.build(
+                IssueKind.DUPLICATE_CLUSTER,
+                Severity.WARN,
+                grouped.size().index,
+                shared={"match_fields": pairs.detail("match_fields", 0)},
+                members=[tuple(group.tolist()) for _, group in grouped["row"]],
+                size=(grouped.size() + 1).tolist(),
+                similarity=grouped["similarity"].min().round(2).tolist(),
+            ),
+        ]
+    )
+
+
+def _option(config: Optional[dict], name: str) -> Any:
+    """Value of a setting, overridden by config when present"""
+    return config.get(name, getattr(settings, name)) if config else getattr(settings, name)
+
+
+def key_columns(df: pd.DataFrame, config: dict = None) -> List[str]:
+    """
+    Columns compared to find duplicates
+
+    Args:
+        df: DataFrame (or first chunk) to check
+        config: Optional configuration (dup_key_columns)
+
+    Returns:
+        The configured key columns present in df, else its first two text
+        columns (CSV values are all read as text: columns whose values all
+        parse as numbers, such as row ids, are left out)
+    """
     key_columns = (
         config.get("dup_key_columns", settings.dup_key_columns_list)
         if config
@@ -33,79 +344,229 @@ def detect(df: pd.DataFrame, column: str = None, config: dict = None) -> List[Is
     available_keys = [col for col in key_columns if col in df.columns]
 
     if not available_keys:
-        # Fallback: use all string columns
-        available_keys = df.select_dtypes(include=["object"]).columns.tolist()[:2]
+        # Fallback: use the first text columns
+        available_keys = [
+            col for col in df.select_dtypes(include=["object"]).columns if _is_text(df[col])
+        ][:2]
+
+    return available_keys
+
+
+def _is_text(series: pd.Series) -> bool:
+    """Whether a column has values that are not numbers"""
+    values = series.dropna()
+    return bool(pd.to_numeric(values, errors="coerce").isna().any())
+
+
+def key_rows(df: pd.DataFrame, keys: List[str]) -> List[Tuple[str, ...]]:
+    """
+    Normalized key values of every row, built column-wise
+
+    Args:
+        df: DataFrame holding the rows
+        keys: Key columns (missing ones count as empty)
+
+    Returns:
+        One tuple of stripped, lowercased values per row ("" for nulls)
+    """
+    normalized = normalize_keys(df, keys)
+    return list(zip(*(normalized[col].tolist() for col in keys)))
+
+
+def block_keys(
+    rows: List[Tuple[str, ...]], engine: DedupeEngine, config: dict = None
+) -> List[List[tuple]]:
+    """
+    Blocks of each row for a candidate engine
+
+    Args:
+        rows: Normalized key values of each row (see ``key_rows``)
+        engine: Candidate generation engine
+        config: Optional configuration (MinHash parameters)
+
+    Returns:
+        Per row, the keys of the blocks it belongs to
+    """
+    if engine == DedupeEngine.MINHASH:
+        hasher = MinHasher(
+            _option(config, "dup_minhash_bands"),
+            _option(config, "dup_minhash_rows"),
+            _option(config, "dup_shingle_size"),
+        )
+        return hasher.band_keys(rows)
+    return [_block_keys(key_values) for key_values in rows]
+
+
+def _block_keys(key_values: Tuple[str, ...]) -> List[tuple]:
+    """Blocking keys of a row: prefix and suffix of each non-empty key value"""
+    keys = []
+    for col, value in enumerate(key_values):
+        if value:
+            keys.append((col, "prefix", value[:BLOCK_PREFIX_CHARS]))
+            keys.append((col, "suffix", value[-BLOCK_SUFFIX_CHARS:]))
+    return keys
 
-    if not available_keys:
-        return issues
 
-    # Create composite key for each row
-    seen = {}  # hash -> (row_index, values)
-
-    for idx in range(len(df)):
-        row = df.iloc[idx]
-
-        # Build composite key
-        key_values = {}
-        for col in available_keys:
-            val = row.get(col, "")
-            key_values[col] = str(val).strip().lower() if pd.notna(val) else ""
-
-        # Compute hash
-        row_hash = hash_row(key_values, available_keys)
-
-        # Check for exact hash match first
-        if row_hash in seen:
-            dup_idx, dup_values = seen[row_hash]
-            issues.append(
-                Issue(
-                    kind=IssueKind.DUPLICATE,
-                    severity=Severity.WARN,
-                    row=idx,
-                    col=None,
-                    details={
-                        "duplicate_of": dup_idx,
-                        "match_fields": available_keys,
-                        "similarity": 1.0,
-                        "method": "exact",
-                    },
-                )
+def _first_matches(
+    left: np.ndarray,
+    right: np.ndarray,
+    seen_values: List[List[str]],
+    threshold: float,
+    workers: int,
+) -> Dict[int, Tuple[int, float]]:
+    """
+    Score candidate pairs and keep the first match of each scored row
+
+    Args:
+        left: Position of the scored row of each pair (pairs grouped by it)
+        right: Position of the earlier row of each pair (ascending per row)
+        seen_values: Key values of the stored rows, per column
+        threshold: Minimum average similarity of a match
+        workers: Scoring threads (-1 for all cores)
+
+    Returns:
+        Mapping of scored row position to (matched position, similarity)
+    """
+    if not len(left):
+        return {}
+
+    # Pairs reference stored rows: only the distinct ones are looked up
+    left_rows, left_codes = np.unique(left, return_inverse=True)
+    right_rows, right_codes = np.unique(right, return_inverse=True)
+    similarity = _average_ratios(
+        [
+            (
+                left_codes,
+                object_array([values[pos] for pos in left_rows.tolist()]),
+                right_codes,
+                object_array([values[pos] for pos in right_rows.tolist()]),
             )
+            for values in seen_values
+        ],
+        workers,
+    )
+
+    # NaN (no key filled in both rows) never passes
+    passing = np.flatnonzero(similarity >= threshold)
+    scored, first = np.unique(left[passing], return_index=True)
+    return {
+        int(position): (int(right[pair]), float(similarity[pair]))
+        for position, pair in zip(scored, passing[first])
+    }
+
+
+def score_pairs(
+    left: np.ndarray, columns: List[Tuple[List[str], List[str]]], workers: int = -1
+) -> np.ndarray:
+    """
+    Average similarity of pairs of rows over their key columns
+
+    Columns only count for a pair when filled in both rows. Per column, the
+    distinct left and right values of the pairs are scored against each
+    other by one ``rapidfuzz.process.cdist`` call on ``workers`` threads,
+    and each pair reads its score from that matrix. Matrices larger than
+    ``SCORE_MATRIX_CELLS`` are split into slabs of consecutive pairs.
+
+    Args:
+        left: Left row of each pair (pairs with the same left row consecutive)
+        columns: Per key column, the left and right values of every pair
+        workers: Scoring threads (-1 for all cores)
+
+    Returns:
+        Average similarity (0-1) of each pair, NaN when no column is filled in both
+    """
+    return _average_ratios(
+        [
+            (*pd.factorize(object_array(left_values)), *pd.factorize(object_array(right_values)))
+            for left_values, right_values in columns
+        ],
+        workers,
+    )
+
+
+def _average_ratios(
+    columns: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]], workers: int
+) -> np.ndarray:
+    """
+    ``score_pairs`` over factorized values
+
+    Args:
+        columns: Per key column, the left codes, distinct left values, right
+            codes and distinct right values of the pairs
+        workers: Scoring threads (-1 for all cores)
+
+    Returns:
+        Average similarity (0-1) of each pair, NaN when no column is filled in both
+    """
+    size = len(columns[0][0])
+    totals = np.zeros(size)
+    counts = np.zeros(size, dtype=np.int64)
+
+    for left_codes, left_values, right_codes, right_values in columns:
+        left_values = np.asarray(left_values, dtype=object)
+        right_values = np.asarray(right_values, dtype=object)
+        pairs = np.flatnonzero((left_values != "")[left_codes] & (right_values != "")[right_codes])
+        if not len(pairs):
             continue
 
-        # Check for fuzzy matches
-        for existing_hash, (existing_idx, existing_values) in seen.items():
-            # Compare values using fuzzy matching
-            similarities = []
-            for col in available_keys:
-                val1 = key_values.get(col, "")
-                val2 = existing_values.get(col, "")
-
-                if val1 and val2:
-                    similarity = fuzz.ratio(val1, val2) / 100.0
-                    similarities.append(similarity)
-
-            if similarities:
-                avg_similarity = sum(similarities) / len(similarities)
-
-                if avg_similarity >= threshold:
-                    issues.append(
-                        Issue(
-                            kind=IssueKind.DUPLICATE,
-                            severity=Severity.WARN,
-                            row=idx,
-                            col=None,
-                            details={
-                                "duplicate_of": existing_idx,
-                                "match_fields": available_keys,
-                                "similarity": round(avg_similarity, 2),
-                                "method": "fuzzy",
-                            },
-                        )
-                    )
-                    break
-
-        # Store this row
-        seen[row_hash] = (idx, key_values)
-
-    return issues
+        slabs = -(-len(left_values) * len(right_values) // SCORE_MATRIX_CELLS)
+        for slab in np.array_split(pairs, slabs):
+            queries, query_codes = np.unique(left_codes[slab], return_inverse=True)
+            choices, choice_codes = np.unique(right_codes[slab], return_inverse=True)
+            matrix = process.cdist(
+                left_values[queries],
+                right_values[choices],
+                scorer=fuzz.ratio,
+                dtype=np.float64,
+                workers=workers,
+            )
+            totals[slab] += matrix[query_codes, choice_codes] / 100.0
+        counts[pairs] += 1
+
+    return np.divide(totals, counts, out=np.full(size, np.nan), where=counts > 0)
+
+
+def _best_similarities(
+    sampled: List[Tuple[Tuple[str, ...], int]], seen_values: List[List[str]], workers: int
+) -> np.ndarray:
+    """
+    Highest average similarity of each sampled row against every row stored before it
+
+    Per key column, the sampled values are scored against the stored ones by
+    one ``rapidfuzz.process.cdist`` call (in slabs of sampled rows when the
+    matrix would exceed ``SCORE_MATRIX_CELLS``).
+
+    Args:
+        sampled: Key values and stored position of each sampled row
+        seen_values: Key values of the stored rows, per column
+        workers: Scoring threads (-1 for all cores)
+
+    Returns:
+        Best average similarity (0-1) of each sampled row, 0 when none is comparable
+    """
+    positions = np.array([position for _, position in sampled], dtype=np.int64)
+    stored = int(positions.max())
+    slab_rows = max(1, SCORE_MATRIX_CELLS // max(stored, 1))
+    best = np.zeros(len(sampled))
+
+    for start in range(0, len(sampled), slab_rows):
+        rows = slice(start, start + slab_rows)
+        limit = int(positions[rows].max())
+        earlier = np.arange(limit) < positions[rows, None]
+        totals = np.zeros(earlier.shape)
+        counts = np.zeros(earlier.shape, dtype=np.int64)
+
+        for col, values in enumerate(seen_values):
+            queries = np.array([key_values[col] for key_values, _ in sampled[rows]], dtype=object)
+            choices = np.asarray(values[:limit], dtype=object)
+            filled = earlier & (queries != "")[:, None] & (choices != "")[None, :]
+            matrix = process.cdist(
+                queries, choices, scorer=fuzz.ratio, dtype=np.float64, workers=workers
+            )
+            totals += np.where(filled, matrix / 100.0, 0.0)
+            counts += filled
+
+        averages = np.divide(totals, counts, out=np.zeros(earlier.shape), where=counts > 0)
+        best[rows] = averages.max(axis=1)
+
+    return best
@@ -1,15 +1,17 @@
 """Email detector"""
 import re
-from typing import List
 import pandas as pd
-from app.schemas import Issue, IssueKind, Severity
+from app.schemas import IssueBatch, IssueKind, Severity
+from app.utils import ColumnView, column_view
 
 
 # Simple email regex (not exhaustive, no MX check)
 EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 
-def detect(df: pd.DataFrame, column: str, config: dict = None) -> List[Issue]:
+def detect(
+    df: pd.DataFrame, column: str, config: dict = None, view: ColumnView = None
+) -> IssueBatch:
     """
     Detect invalid email addresses
 
@@ -17,35 +19,37 @@ def detect(df: pd.DataFrame, column: str, config: dict = None) -> List[Issue]:
         df: DataFrame to check
         column: Column name to check
         config: Optional configuration
+        view: Column view shared with the other detectors of the column
 
     Returns:
-        List of Issue objects
+        IssueBatch with the issues found
     """
-    issues = []
-
     if column not in df.columns:
-        return issues
-
-    for idx, value in df[column].items():
-        # Skip if empty/null
-        if pd.isna(value) or str(value).strip() == "":
-            continue
-
-        value_str = str(value).strip()
-
-        # Check against regex
-        if not EMAIL_PATTERN.match(value_str):
-            issues.append(
-                Issue(
-                    kind=IssueKind.EMAIL_INVALID,
-                    severity=Severity.ERROR,
-                    row=int(idx),
-                    col=column,
-                    details={
-                        "value": value_str,
-                        "reason": "Email format invalid",
-                    },
-                )
-            )
-
-    return issues
+        return IssueBatch.empty()
+
+    # Non-blank values, stripped (emails are mostly unique: no factorizing)
+    values = column_view(df, column, view).values
+
+    invalid = values[~valid_email_mask(values)]
+
+    return IssueBatch.build(
+        IssueKind.EMAIL_INVALID,
+        Severity.ERROR,
+        invalid.index,
+        column,
+        shared={"reason": "Email format invalid"},
+        value=invalid,
+    )
+
+
+def valid_email_mask(values: pd.Series) -> pd.Series:
+    """
+    Match EMAIL_PATTERN against a whole column of strings at once
+
+    Args:
+        values: Series of strings
+
+    Returns:
+        Boolean Series, True where the value is a valid email
+    """
+    return values.str.match(EMAIL_PATTERN).fillna(False).astype(bool)
@@ -1,10 +1,12 @@
 """ID/SKU detector"""
-from typing import List
 import pandas as pd
-from app.schemas import Issue, IssueKind, Severity
+from app.schemas import IssueBatch, IssueKind, Severity
+from app.utils import ColumnView, column_view
 
 
-def detect(df: pd.DataFrame, column: str, config: dict = None) -> List[Issue]:
+def detect(
+    df: pd.DataFrame, column: str, config: dict = None, view: ColumnView = None
+) -> IssueBatch:
     """
     Detect missing or empty IDs/SKUs
 
@@ -12,30 +14,22 @@ def detect(df: pd.DataFrame, column: str, config: dict = None) -> List[Issue]:
         df: DataFrame to check
         column: Column name to check
         config: Optional configuration
+        view: Column view shared with the other detectors of the column
 
     Returns:
-        List of Issue objects
+        IssueBatch with the issues found
     """
-    issues = []
-
     if column not in df.columns:
-        return issues
-
-    for idx, value in df[column].items():
-        # Check if empty/null
-        is_empty = pd.isna(value) or str(value).strip() == ""
-
-        if is_empty:
-            issues.append(
-                Issue(
-                    kind=IssueKind.ID_MISSING,
-                    severity=Severity.ERROR,
-                    row=int(idx),
-                    col=column,
-                    details={
-                        "reason": "Required ID field is empty",
-                    },
-                )
-            )
-
-    return issues
+        return IssueBatch.empty()
+
+    # Check if empty/null
+    series = df[column]
+    empty = column_view(df, column, view).blank
+
+    return IssueBatch.build(
+        IssueKind.ID_MISSING,
+        Severity.ERROR,
+        series.index[empty],
+        column,
+        shared={"reason": "Required ID field is empty"},
+    )
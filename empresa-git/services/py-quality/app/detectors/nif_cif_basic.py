@@ -1,51 +1,168 @@
-"""NIF/CIF basic detector (superficial validation)"""
-import re
-from typing import List
+"""NIF/NIE/CIF detector (format and control character validation)"""
+import numpy as np
 import pandas as pd
-from app.schemas import Issue, IssueKind, Severity
+from app.schemas import IssueBatch, IssueKind, Severity
+from app.utils import ColumnView, column_view
 
 
-# Basic pattern: 8-10 alphanumeric characters, often letter at start or end
-NIF_CIF_PATTERN = re.compile(r"^[A-Z0-9]{8,10}$")
+# Optional prefix letter, 7-8 digits and a control character
+ID_PARTS_PATTERN = r"^([A-Z]?)([0-9]{7,8})([A-Z0-9])$"
 
+# Separators people type inside IDs ("12345678-Z", "B 1234567 4")
+ID_SEPARATORS = r"[\s.\-]"
 
-def detect(df: pd.DataFrame, column: str, config: dict = None) -> List[Issue]:
+# NIF/NIE control letters, indexed by number mod 23
+NIF_LETTERS = "TRWAGMYFPDXBNJZSQVHLCKE"
+
+# NIE prefixes stand for a leading digit
+NIE_PREFIXES = {"X": 0, "Y": 1, "Z": 2}
+
+# NIF of people without DNI: K/L/M + 7 digits + NIF letter
+KLM_PREFIXES = "KLM"
+
+# CIF: organisation letter + 7 digits + control digit or letter
+CIF_PREFIXES = "ABCDEFGHJNPQRSUVW"
+CIF_LETTERS = "JABCDEFGHI"
+CIF_LETTER_ONLY = "NPQRSW"
+CIF_DIGIT_ONLY = "ABEH"
+
+# Reason of each failed check
+CHECK_REASONS = {
+    "format": "Does not match the NIF, NIE or CIF format",
+    "nif_letter": "NIF control letter does not match the number (mod 23)",
+    "nie_letter": "NIE control letter does not match the number (mod 23)",
+    "cif_control": "CIF control character does not match the digits",
+}
+
+
+def detect(
+    df: pd.DataFrame, column: str, config: dict = None, view: ColumnView = None
+) -> IssueBatch:
     """
-    Basic NIF/CIF validation (pattern-based, not exhaustive)
+    Validate Spanish tax IDs: NIF (DNI), NIE and CIF
+
+    Values that are not shaped like any of them get a WARN (``format``
+    check). Well-formed values whose control character is wrong get an
+    ERROR naming the failed check, with the corrected ID as suggestion.
 
     Args:
         df: DataFrame to check
         column: Column name to check
         config: Optional configuration
+        view: Column view shared with the other detectors of the column
 
     Returns:
-        List of Issue objects
+        IssueBatch with the issues found
     """
-    issues = []
-
     if column not in df.columns:
-        return issues
-
-    for idx, value in df[column].items():
-        # Skip if empty/null
-        if pd.isna(value) or str(value).strip() == "":
-            continue
-
-        value_str = str(value).strip().upper()
-
-        # Check basic pattern
-        if not NIF_CIF_PATTERN.match(value_str):
-            issues.append(
-                Issue(
-                    kind=IssueKind.NIF_CIF_BASIC,
-                    severity=Severity.WARN,
-                    row=int(idx),
-                    col=column,
-                    details={
-                        "value": value_str,
-                        "reason": "Does not match typical NIF/CIF pattern (8-10 alphanumeric characters)",
-                    },
-                )
-            )
-
-    return issues
+        return IssueBatch.empty()
+
+    # Non-blank values, uppercased (IDs are mostly unique: no factorizing)
+    values = column_view(df, column, view).upper
+
+    checks = validate_ids(values)
+    failed = checks[checks["check"].notna()]
+    is_format = (failed["check"] == "format").to_numpy(dtype=int)
+
+    return IssueBatch.build(
+        IssueKind.NIF_CIF_BASIC,
+        np.array([Severity.ERROR, Severity.WARN], dtype=object)[is_format],
+        failed.index,
+        column,
+        value=values[failed.index],
+        check=failed["check"],
+        reason=failed["check"].map(CHECK_REASONS),
+        suggestion=failed["suggestion"],
+    )
+
+
+def validate_ids(values: pd.Series) -> pd.DataFrame:
+    """
+    Check the format and control character of a column of IDs at once
+
+    The number is extracted with one regex and turned into digit arrays;
+    control characters are then computed with column-level arithmetic:
+
+    - NIF: 8 digits, letter ``NIF_LETTERS[number % 23]``
+    - NIE: X/Y/Z (as 0/1/2) + 7 digits, same letter rule
+    - K/L/M: letter + 7 digits, same letter rule on the 7 digits
+    - CIF: letter + 7 digits; digits in odd positions are doubled (adding
+      the digits of the result), the rest added. The control is
+      ``(10 - total % 10) % 10`` as a digit, or ``CIF_LETTERS`` of it,
+      depending on the organisation letter
+
+    Args:
+        values: Series of uppercased, stripped IDs
+
+    Returns:
+        DataFrame aligned with values, with columns ``check`` (failed check
+        or None) and ``suggestion`` (corrected ID or None)
+    """
+    result = pd.DataFrame({"check": None, "suggestion": None}, index=values.index, dtype=object)
+    if values.empty:
+        return result
+
+    parts = values.str.replace(ID_SEPARATORS, "", regex=True).str.extract(ID_PARTS_PATTERN)
+    prefix, digits, control = parts[0], parts[1], parts[2]
+    n_digits = digits.str.len()
+
+    is_nif = (prefix == "") & (n_digits == 8) & control.str.isalpha()
+    is_nie = prefix.isin(list(NIE_PREFIXES)) & (n_digits == 7) & control.str.isalpha()
+    is_klm = prefix.isin(list(KLM_PREFIXES)) & (n_digits == 7) & control.str.isalpha()
+    is_cif = prefix.isin(list(CIF_PREFIXES)) & (n_digits == 7)
+    well_formed = is_nif | is_nie | is_klm | is_cif
+    result.loc[~well_formed, "check"] = "format"
+
+    # NIF, NIE and K/L/M: mod 23 letter over the number
+    lettered = is_nif | is_nie | is_klm
+    if lettered.any():
+        number = pd.to_numeric(digits[lettered]).to_numpy(dtype=np.int64)
+        nie_digit = prefix[lettered].map(NIE_PREFIXES).fillna(0).to_numpy(dtype=np.int64)
+        number += nie_digit * 10_000_000
+        expected = np.array(list(NIF_LETTERS), dtype=object)[number % 23]
+
+        wrong = control[lettered].to_numpy(dtype=object) != expected
+        wrong_index = lettered[lettered].index[wrong]
+        result.loc[wrong_index, "check"] = np.where(is_nie[wrong_index], "nie_letter", "nif_letter")
+        result.loc[wrong_index, "suggestion"] = (
+            prefix[wrong_index] + digits[wrong_index] + expected[wrong]
+        )
+
+    # CIF: control digit or letter over the 7 digits
+    if is_cif.any():
+        matrix = _digit_matrix(digits[is_cif], 7)
+        doubled = matrix[:, 0::2] * 2
+        total = (doubled // 10 + doubled % 10).sum(axis=1) + matrix[:, 1::2].sum(axis=1)
+        control_digit = (10 - total % 10) % 10
+
+        expected_digit = control_digit.astype(str).astype(object)
+        expected_letter = np.array(list(CIF_LETTERS), dtype=object)[control_digit]
+        cif_prefix = prefix[is_cif].to_numpy(dtype=object)
+        cif_control = control[is_cif].to_numpy(dtype=object)
+
+        letter_only = np.isin(cif_prefix, list(CIF_LETTER_ONLY))
+        digit_only = np.isin(cif_prefix, list(CIF_DIGIT_ONLY))
+        ok = np.where(
+            letter_only,
+            cif_control == expected_letter,
+            np.where(
+                digit_only,
+                cif_control == expected_digit,
+                (cif_control == expected_letter) | (cif_control == expected_digit),
+            ),
+        )
+
+        wrong_index = is_cif[is_cif].index[~ok]
+        suggested_control = np.where(letter_only, expected_letter, expected_digit)[~ok]
+        result.loc[wrong_index, "check"] = "cif_control"
+        result.loc[wrong_index, "suggestion"] = (
+            prefix[wrong_index] + digits[wrong_index] + suggested_control
+        )
+
+    return result
+
+
+def _digit_matrix(digits: pd.Series, width: int) -> np.ndarray:
+    """Turn a Series of fixed-width digit strings into an (n, width) int array"""
+    buffer = "".join(digits.tolist()).encode("ascii")
+    return (np.frombuffer(buffer, dtype=np.uint8) - ord("0")).astype(np.int64).reshape(-1, width)
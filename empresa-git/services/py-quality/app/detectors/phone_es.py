@@ -1,9 +1,10 @@
 """Phone (Spanish) detector"""
 import re
-from typing import List
+import numpy as np
 import pandas as pd
-from app.schemas import Issue, IssueKind, Severity
+from app.schemas import IssueBatch, IssueKind, Severity
 from app.config import settings
+from app.utils import ColumnView, column_view
 
 
 def normalize_phone(value: str) -> str:
@@ -11,7 +12,9 @@ def normalize_phone(value: str) -> str:
     return re.sub(r"[^\d+]", "", value)
 
 
-def detect(df: pd.DataFrame, column: str, config: dict = None) -> List[Issue]:
+def detect(
+    df: pd.DataFrame, column: str, config: dict = None, view: ColumnView = None
+) -> IssueBatch:
     """
     Detect invalid Spanish phone numbers
 
@@ -22,76 +25,61 @@ def detect(df: pd.DataFrame, column: str, config: dict = None) -> List[Issue]:
         df: DataFrame to check
         column: Column name to check
         config: Optional configuration (phone_cc, phone_length)
+        view: Column view shared with the other detectors of the column
 
     Returns:
-        List of Issue objects
+        IssueBatch with the issues found
     """
-    issues = []
-
     if column not in df.columns:
-        return issues
+        return IssueBatch.empty()
 
     phone_cc = config.get("phone_cc", settings.phone_cc) if config else settings.phone_cc
     phone_length = (
         config.get("phone_length", settings.phone_length) if config else settings.phone_length
     )
 
-    for idx, value in df[column].items():
-        # Skip if empty/null
-        if pd.isna(value) or str(value).strip() == "":
-            continue
+    # Distinct non-blank values, checked with column-wide string operations
+    distinct = column_view(df, column, view).distinct
+    values = pd.Series(distinct.values, dtype=object)
+    normalized = normalize_phones(values)
+    lengths = normalized.str.len()
+
+    expected_total_length = len(phone_cc) + phone_length
+    international = normalized.str.startswith("+")
+    wrong_length = international & (lengths != expected_total_length)
+    wrong_cc = international & ~wrong_length & ~normalized.str.startswith(phone_cc)
+    # National format - suggest adding country code
+    missing_cc = ~international & (lengths == phone_length)
+    wrong_digits = ~international & ~missing_cc
 
-        value_str = str(value).strip()
-        normalized = normalize_phone(value_str)
+    got = lengths.astype(str)
+    reasons = np.select(
+        [wrong_length, wrong_cc, missing_cc, wrong_digits],
+        [
+            f"Expected {expected_total_length} characters with {phone_cc}, got " + got,
+            f"Expected country code {phone_cc}",
+            f"Missing country code {phone_cc}",
+            f"Expected {phone_length} digits, got " + got,
+        ],
+        default="",
+    ).astype(object)
+    severities = np.array([Severity.ERROR, Severity.WARN], dtype=object)[missing_cc.to_numpy(int)]
+    suggestions = (phone_cc + normalized).where(missing_cc, None)
 
-        # Check format
-        issue_found = False
-        reason = None
+    rows, codes = distinct.select((wrong_length | wrong_cc | missing_cc | wrong_digits).to_numpy())
 
-        if normalized.startswith("+"):
-            # International format
-            expected_total_length = len(phone_cc) + phone_length
-            if len(normalized) != expected_total_length:
-                issue_found = True
-                reason = f"Expected {expected_total_length} characters with {phone_cc}, got {len(normalized)}"
-            elif not normalized.startswith(phone_cc):
-                issue_found = True
-                reason = f"Expected country code {phone_cc}"
-        else:
-            # National format - suggest adding country code
-            if len(normalized) == phone_length:
-                issues.append(
-                    Issue(
-                        kind=IssueKind.PHONE_INVALID,
-                        severity=Severity.WARN,
-                        row=int(idx),
-                        col=column,
-                        details={
-                            "value": value_str,
-                            "normalized": normalized,
-                            "reason": f"Missing country code {phone_cc}",
-                            "suggestion": f"{phone_cc}{normalized}",
-                        },
-                    )
-                )
-                continue
-            else:
-                issue_found = True
-                reason = f"Expected {phone_length} digits, got {len(normalized)}"
+    return IssueBatch.build(
+        IssueKind.PHONE_INVALID,
+        severities[codes],
+        rows,
+        column,
+        value=values.to_numpy()[codes],
+        normalized=normalized.to_numpy()[codes],
+        reason=reasons[codes],
+        suggestion=suggestions.to_numpy()[codes],
+    )
 
-        if issue_found:
-            issues.append(
-                Issue(
-                    kind=IssueKind.PHONE_INVALID,
-                    severity=Severity.ERROR,
-                    row=int(idx),
-                    col=column,
-                    details={
-                        "value": value_str,
-                        "normalized": normalized,
-                        "reason": reason,
-                    },
-                )
-            )
 
-    return issues
+def normalize_phones(values: pd.Series) -> pd.Series:
+    """Remove all non-digit and non-plus characters from a column of strings"""
+    return values.str.replace(r"[^\d+]", "", regex=True)
@@ -1,10 +1,13 @@
 """Price detector"""
-from typing import List
+import numpy as np
 import pandas as pd
-from app.schemas import Issue, IssueKind, Severity
+from app.schemas import IssueBatch, IssueKind, Severity
+from app.utils import ColumnView, column_view
 
 
-def detect(df: pd.DataFrame, column: str, config: dict = None) -> List[Issue]:
+def detect(
+    df: pd.DataFrame, column: str, config: dict = None, view: ColumnView = None
+) -> IssueBatch:
     """
     Detect price issues (zero or negative values)
 
@@ -12,54 +15,31 @@ def detect(df: pd.DataFrame, column: str, config: dict = None) -> List[Issue]:
         df: DataFrame to check
         column: Column name to check
         config: Optional configuration
+        view: Column view shared with the other detectors of the column
 
     Returns:
-        List of Issue objects
+        IssueBatch with the issues found
     """
-    issues = []
-
     if column not in df.columns:
-        return issues
-
-    for idx, value in df[column].items():
-        # Skip if empty/null
-        if pd.isna(value):
-            continue
-
-        # Try to convert to float
-        try:
-            price = float(value)
-        except (ValueError, TypeError):
-            continue
-
-        # Check for zero
-        if price == 0:
-            issues.append(
-                Issue(
-                    kind=IssueKind.PRICE_ZERO,
-                    severity=Severity.WARN,
-                    row=int(idx),
-                    col=column,
-                    details={
-                        "value": price,
-                        "reason": "Zero price may indicate missing data",
-                    },
-                )
-            )
-
-        # Check for negative
-        elif price < 0:
-            issues.append(
-                Issue(
-                    kind=IssueKind.PRICE_NEGATIVE,
-                    severity=Severity.ERROR,
-                    row=int(idx),
-                    col=column,
-                    details={
-                        "value": price,
-                        "reason": "Negative prices are invalid",
-                    },
-                )
-            )
-
-    return issues
+        return IssueBatch.empty()
+
+    # Values that do not parse as numbers (or are empty) are skipped
+    prices = column_view(df, column, view).numeric
+
+    # Check for zero and negative
+    zero = prices == 0
+    negative = prices < 0
+    flagged = prices[zero | negative]
+    # 1 for zero prices, 0 for negative ones
+    is_zero = zero[flagged.index].to_numpy(dtype=int)
+
+    return IssueBatch.build(
+        np.array([IssueKind.PRICE_NEGATIVE, IssueKind.PRICE_ZERO], dtype=object)[is_zero],
+        np.array([Severity.ERROR, Severity.WARN], dtype=object)[is_zero],
+        flagged.index,
+        column,
+        value=flagged.astype(float),
+        reason=np.array(
+            ["Negative prices are invalid", "Zero price may indicate missing data"], dtype=object
+        )[is_zero],
+    )
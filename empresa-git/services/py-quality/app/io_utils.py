@@ -1,11 +1,88 @@
-"""I/O utilities for reading and writing CSV/XLSX files"""
+"""I/O utilities for reading and writing CSV/XLSX/Parquet/Arrow files"""
 import base64
+import binascii
+import bz2
+import codecs
+import csv
+import gzip
+import hashlib
+import io
+import itertools
+import lzma
 import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import Callable, FrozenSet, Iterable, Iterator, List, Optional
+import numpy as np
+import openpyxl
 import pandas as pd
-from app.schemas import InputSpec, FileType
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from app.schemas import InputSpec, FileType, CsvEngine, Compression
+from app.config import settings
+
+
+# File extensions understood for each file type
+FILE_EXTENSIONS = {
+    ".csv": FileType.CSV,
+    ".xlsx": FileType.XLSX,
+    ".xls": FileType.XLSX,
+    ".parquet": FileType.PARQUET,
+    ".pq": FileType.PARQUET,
+    ".arrow": FileType.ARROW,
+    ".feather": FileType.ARROW,
+    ".ipc": FileType.ARROW,
+}
+
+# Compression codec for columnar outputs
+COLUMNAR_COMPRESSION = "zstd"
+
+# Whole-file compression: extensions, magic bytes and stream openers
+COMPRESSION_EXTENSIONS = {
+    ".gz": Compression.GZIP,
+    ".bz2": Compression.BZ2,
+    ".xz": Compression.XZ,
+}
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": Compression.GZIP,
+    b"BZh": Compression.BZ2,
+    b"\xfd7zXZ\x00": Compression.XZ,
+}
+COMPRESSION_OPENERS = {
+    Compression.GZIP: gzip.open,
+    Compression.BZ2: bz2.open,
+    Compression.XZ: lzma.open,
+}
+
+# Rough expansion of compressed text, used to decide when to stream
+COMPRESSED_SIZE_FACTOR = 5
+
+# Dialect sniffing: value that requests it, bytes inspected and candidates
+AUTO = "auto"
+SNIFF_BYTES = 64 * 1024
+SNIFF_DELIMITERS = ",;\t|"
+SNIFF_ENCODINGS = ("utf-8", "cp1252", "latin-1")
+UTF16_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+# Header sniffing: data rows compared with the first one, and value shapes
+# a column name never has
+SNIFF_HEADER_ROWS = 20
+NUMBER_SHAPE = re.compile(r"^[-+]?(\d+([.,]\d*)?|[.,]\d+)([eE][-+]?\d+)?$")
+EMAIL_SHAPE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+PHONE_SHAPE = re.compile(r"^\+?[\d\s\-().]{8,15}$")
+DATE_SHAPE = re.compile(r"^\d{1,4}[/.-]\d{1,2}[/.-]\d{1,4}$")
+
+# pandas' default NA strings, so the pyarrow CSV engine nulls the same cells
+PANDAS_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
 
 
 class IOError(Exception):
@@ -14,12 +91,109 @@ class IOError(Exception):
     pass
 
 
-def load_frame(spec: InputSpec) -> pd.DataFrame:
+class DatasetCache:
+    """
+    Bounded LRU of parsed DataFrames, evicted by memory footprint
+
+    Entries are keyed by ``dataset_key`` so the same content parsed with the
+    same options is only decoded and parsed once. Cached frames are shared:
+    callers must copy before mutating them.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[tuple, tuple[pd.DataFrame, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[pd.DataFrame]:
+        """Return the cached frame for key (marking it recently used) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: tuple, df: pd.DataFrame) -> None:
+        """Store a frame, evicting least recently used entries to stay in budget"""
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (df, size)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def clear(self) -> None:
+        """Drop every cached frame"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache instance
+dataset_cache = DatasetCache(settings.dataset_cache_mb * 1024 * 1024)
+
+
+def dataset_key(spec: InputSpec, columns: Optional[Iterable[str]] = None) -> tuple:
+    """
+    Build the cache key identifying a dataset and how it is parsed
+
+    Inline content is keyed by a SHA-256 of the payload, files by their
+    absolute path, modification time and size.
+
+    Args:
+        spec: Input specification
+        columns: Column projection requested on top of spec (see load_frame)
+
+    Returns:
+        Hashable cache key
+    """
+    if spec.content_b64:
+        source = ("b64", hashlib.sha256(spec.content_b64.encode("ascii")).hexdigest())
+    elif spec.file_path:
+        try:
+            stat = os.stat(spec.file_path)
+        except OSError as e:
+            raise IOError(f"File not found: {spec.file_path}") from e
+        source = ("path", os.path.abspath(spec.file_path), stat.st_mtime_ns, stat.st_size)
+    else:
+        raise IOError("Either file_path or content_b64 must be provided")
+
+    options = (
+        spec.file_type.value,
+        spec.compression,
+        spec.delimiter,
+        spec.encoding,
+        spec.header,
+        tuple(sorted(spec.columns_map.items())) if spec.columns_map else None,
+        _wanted_columns(spec, columns),
+    )
+    return source + options
+
+
+def load_frame(spec: InputSpec, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
     """
     Load a pandas DataFrame from InputSpec
 
+    Parsed frames are kept in ``dataset_cache``, so repeated loads of the
+    same dataset (within a request or across requests) are parsed once.
+    The returned frame may be shared: copy it before mutating.
+
     Args:
         spec: Input specification with file path or base64 content
+        columns: Only parse these (normalized) columns; overrides
+            ``spec.columns``. Unknown names are ignored.
 
     Returns:
         pandas DataFrame
@@ -27,59 +201,788 @@ def load_frame(spec: InputSpec) -> pd.DataFrame:
     Raises:
         IOError: If file cannot be read or parsed
     """
+    spec = resolve_dialect(spec)
+    key = dataset_key(spec, columns)
+    df = dataset_cache.get(key)
+    if df is not None:
+        return df
+
+    # A projection can be served from the full frame if that one is cached
+    # (the projection is the last component of the key)
+    wanted = key[-1]
+    if wanted is not None:
+        full = dataset_cache.get(key[:-1] + (None,))
+        if full is not None:
+            return full[[col for col in full.columns if col in wanted]]
+
+    df = _read_frame(spec, columns)
+    dataset_cache.put(key, df)
+    return df
+
+
+def read_header(spec: InputSpec) -> List[str]:
+    """
+    Read the normalized column names of a dataset without loading its rows
+
+    Honours ``spec.columns``, so the result is the set of columns that
+    ``load_frame(spec)`` would return. Names come from the cached frame
+    when the dataset is in ``dataset_cache``; CSV headers are otherwise
+    parsed from the (decompressed) first bytes only.
+
+    Args:
+        spec: Input specification with file path or base64 content
+
+    Returns:
+        List of normalized column names
+
+    Raises:
+        IOError: If file cannot be read or parsed
+    """
+    spec = resolve_dialect(spec)
+    key = dataset_key(spec)
+    wanted = key[-1]
+    for cached_key in (key, key[:-1] + (None,)):
+        df = dataset_cache.get(cached_key)
+        if df is not None:
+            return [col for col in df.columns if wanted is None or col in wanted]
+
     try:
-        # Determine source: base64 or file path
-        if spec.content_b64:
-            # Decode base64 content
+        if spec.file_type == FileType.CSV:
+            with _header_source(spec) as source:
+                raw_names = pd.read_csv(source, nrows=0, **_csv_options(spec)).columns
+        elif spec.file_type == FileType.XLSX:
+            workbook = openpyxl.load_workbook(_open_source(spec), read_only=True, data_only=True)
             try:
-                file_bytes = base64.b64decode(spec.content_b64)
-                file_obj = BytesIO(file_bytes)
-            except Exception as e:
-                raise IOError(f"Failed to decode base64 content: {e}")
-        elif spec.file_path:
-            # Read from file path
-            if not os.path.exists(spec.file_path):
-                raise IOError(f"File not found: {spec.file_path}")
-            file_obj = spec.file_path
+                first_row = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+            finally:
+                workbook.close()
+            raw_names = list(first_row) if spec.header else list(range(len(first_row)))
+        elif spec.file_type == FileType.PARQUET:
+            raw_names = pq.read_schema(_arrow_source(_open_source(spec)), memory_map=True).names
+        elif spec.file_type == FileType.ARROW:
+            raw_names = _read_arrow_schema(_open_source(spec)).names
         else:
-            raise IOError("Either file_path or content_b64 must be provided")
+            raise IOError(f"Unsupported file type: {spec.file_type}")
+
+        names = [_normalize_name(name, spec) for name in raw_names]
+        if wanted is not None:
+            names = [name for name in names if name in wanted]
+        return names
+
+    except IOError:
+        raise
+    except Exception as e:
+        raise IOError(f"Failed to read header: {e}")
+
+
+def _read_frame(spec: InputSpec, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Parse the dataset described by spec into a DataFrame"""
+    try:
+        if spec.file_type == FileType.CSV:
+            return _normalize_columns(_read_csv(spec, columns), spec)
 
         # Read based on file type
+        with _source(spec) as file_obj:
+            if spec.file_type == FileType.XLSX:
+                df = pd.read_excel(
+                    file_obj,
+                    engine="openpyxl",
+                    header=0 if spec.header else None,
+                    usecols=_column_filter(spec, columns),
+                    # Text, as CSV values and streamed chunks are (see _xlsx_text)
+                    dtype=str,
+                )
+            elif spec.file_type == FileType.PARQUET:
+                source = _arrow_source(file_obj)
+                df = pd.read_parquet(
+                    source,
+                    engine="pyarrow",
+                    memory_map=True,
+                    columns=_columnar_projection(spec, columns, file_obj),
+                )
+            elif spec.file_type == FileType.ARROW:
+                df = feather.read_table(
+                    _arrow_source(file_obj),
+                    columns=_columnar_projection(spec, columns, file_obj),
+                    memory_map=True,
+                ).to_pandas()
+            else:
+                raise IOError(f"Unsupported file type: {spec.file_type}")
+
+        return _normalize_columns(df, spec)
+
+    except IOError:
+        raise
+    except Exception as e:
+        raise IOError(f"Failed to load dataframe: {e}")
+
+
+def _read_csv(spec: InputSpec, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Parse a whole CSV with the configured engine
+
+    The multithreaded pyarrow engine is used when selected (or, in auto
+    mode, for large files); anything it cannot parse exactly like the C
+    parser falls back to it.
+    """
+    usecols = _column_filter(spec, columns)
+
+    if _use_pyarrow_csv(spec):
+        try:
+            df = _read_csv_pyarrow(spec, usecols)
+            if df is not None:
+                return df
+        except (pa.ArrowException, ValueError):
+            # Dialect issues: fall back to the C parser
+            pass
+
+    with _source(spec) as source:
+        return pd.read_csv(source, usecols=usecols, **_csv_options(spec))
+
+
+def _use_pyarrow_csv(spec: InputSpec) -> bool:
+    """Resolve the CSV engine for spec"""
+    engine = CsvEngine(spec.csv_engine or settings.csv_engine)
+    if engine != CsvEngine.AUTO:
+        return engine == CsvEngine.PYARROW
+
+    if spec.content_b64:
+        size = len(spec.content_b64) * 3 // 4
+    else:
+        size = os.path.getsize(spec.file_path)
+    return size >= settings.pyarrow_csv_min_mb * 1024 * 1024
+
+
+def _read_csv_pyarrow(
+    spec: InputSpec, usecols: Optional[Callable[[str], bool]]
+) -> Optional[pd.DataFrame]:
+    """
+    Parse a CSV with pyarrow's multithreaded reader, matching pd.read_csv
+
+    Returns None when the input cannot be handled identically (multi-char
+    delimiter, unsupported compression, duplicate column names).
+    """
+    delimiter = spec.delimiter or ","
+    if len(delimiter) != 1:
+        return None
+
+    raw = _open_raw(spec)
+    compression = _detect_compression(spec)
+    if compression not in (None, Compression.GZIP):
+        return None
+
+    def open_input():
+        stream = pa.BufferReader(raw.getbuffer()) if isinstance(raw, BytesIO) else pa.OSFile(raw)
+        if compression:
+            stream = pa.CompressedInputStream(stream, compression.value)
+        return stream
+
+    read_options = pa_csv.ReadOptions(
+        use_threads=True,
+        encoding=spec.encoding or "utf-8",
+        autogenerate_column_names=not spec.header,
+    )
+    parse_options = pa_csv.ParseOptions(delimiter=delimiter)
+    convert_options = pa_csv.ConvertOptions(
+        null_values=PANDAS_NA_VALUES,
+        strings_can_be_null=True,
+    )
+
+    # Column names from the header block; every column is read as text
+    with open_input() as source:
+        schema = pa_csv.open_csv(
+            source,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=convert_options,
+        ).schema
+    if len(set(schema.names)) != len(schema.names):
+        return None
+
+    convert_options.column_types = {name: pa.string() for name in schema.names}
+    if usecols is not None:
+        convert_options.include_columns = [name for name in schema.names if usecols(name)]
+
+    with open_input() as source:
+        table = pa_csv.read_csv(
+            source,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=convert_options,
+        )
+
+    df = table.to_pandas()
+    if not spec.header:
+        df.columns = range(len(df.columns))
+
+    # Arrow nulls in text columns come back as None; pandas uses NaN
+    for col in df.columns[df.dtypes == object]:
+        values = df[col].to_numpy()
+        df[col] = np.where(pd.isna(values), np.nan, values)
+
+    return df
+
+
+def iter_frames(
+    spec: InputSpec, chunk_rows: int, columns: Optional[Iterable[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a dataset as DataFrames of at most ``chunk_rows`` rows
+
+    Chunks keep a global row index, so row numbers reported from a chunk
+    match the ones reported by a full ``load_frame``.
+
+    Args:
+        spec: Input specification with file path or base64 content
+        chunk_rows: Maximum number of rows per chunk
+        columns: Only parse these (normalized) columns, as in load_frame
+
+    Yields:
+        pandas DataFrame chunks
+
+    Raises:
+        IOError: If file cannot be read or parsed
+    """
+    spec = resolve_dialect(spec)
+    try:
         if spec.file_type == FileType.CSV:
-            df = pd.read_csv(
-                file_obj,
-                delimiter=spec.delimiter or ",",
-                encoding=spec.encoding or "utf-8",
-                header=0 if spec.header else None,
-            )
+            # Closed once the chunks are exhausted, or when the generator is
+            with _source(spec) as source, pd.read_csv(
+                source,
+                chunksize=chunk_rows,
+                usecols=_column_filter(spec, columns),
+                **_csv_options(spec),
+            ) as reader:
+                for chunk in reader:
+                    yield _normalize_columns(chunk, spec)
         elif spec.file_type == FileType.XLSX:
-            df = pd.read_excel(
-                file_obj,
-                engine="openpyxl",
-                header=0 if spec.header else None,
-            )
+            yield from _iter_xlsx_frames(spec, chunk_rows, columns)
+        elif spec.file_type in (FileType.PARQUET, FileType.ARROW):
+            offset = 0
+            for batch in _iter_record_batches(spec, chunk_rows, columns):
+                chunk = batch.to_pandas()
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                offset += len(chunk)
+                yield _normalize_columns(chunk, spec)
         else:
             raise IOError(f"Unsupported file type: {spec.file_type}")
 
-        # Apply column mapping if provided
-        if spec.columns_map:
-            df = df.rename(columns=spec.columns_map)
-
-        # Normalize column names: strip and lowercase
-        df.columns = df.columns.str.strip().str.lower()
-
-        return df
-
     except IOError:
         raise
     except Exception as e:
         raise IOError(f"Failed to load dataframe: {e}")
 
 
+def resolve_chunk_rows(spec: InputSpec) -> Optional[int]:
+    """
+    Decide whether a dataset should be streamed in chunks
+
+    Args:
+        spec: Input specification
+
+    Returns:
+        Rows per chunk, or None to load the whole frame at once
+    """
+    if spec.chunk_rows:
+        return spec.chunk_rows
+
+    if spec.content_b64:
+        size = len(spec.content_b64) * 3 // 4
+    elif spec.file_path and os.path.exists(spec.file_path):
+        size = os.path.getsize(spec.file_path)
+    else:
+        return None
+
+    if _detect_compression(spec) is not None:
+        size *= COMPRESSED_SIZE_FACTOR
+
+    # Workbooks are zipped XML: a small file already holds many rows
+    threshold_mb = (
+        settings.xlsx_stream_threshold_mb
+        if spec.file_type == FileType.XLSX
+        else settings.stream_threshold_mb
+    )
+    if size > threshold_mb * 1024 * 1024:
+        return settings.chunk_rows
+    return None
+
+
+def resolve_dialect(spec: InputSpec) -> InputSpec:
+    """
+    Fill in the CSV options left to auto-detection
+
+    ``delimiter="auto"``, ``encoding="auto"`` and ``header=None`` are
+    resolved from the first ``SNIFF_BYTES`` of (decompressed) content, so
+    the file is parsed once with the right dialect instead of being retried
+    with different settings.
+
+    Args:
+        spec: Input specification
+
+    Returns:
+        spec itself when nothing is sniffed, else a copy with concrete options
+
+    Raises:
+        IOError: If the content cannot be read
+    """
+    if spec.file_type != FileType.CSV:
+        if spec.header is None:
+            return spec.model_copy(update={"header": True})
+        return spec
+
+    sniff_delimiter = (spec.delimiter or "").lower() == AUTO
+    sniff_encoding = (spec.encoding or "").lower() == AUTO
+    if not (sniff_delimiter or sniff_encoding or spec.header is None):
+        return spec
+
+    head = _decompressed_head(spec, SNIFF_BYTES)
+    encoding = _sniff_encoding(head) if sniff_encoding else spec.encoding or "utf-8"
+    try:
+        text = head.decode(encoding, errors="ignore")
+    except LookupError as e:
+        raise IOError(f"Unknown encoding: {encoding}") from e
+
+    # Only whole lines: the prefix may end in the middle of a record
+    if len(head) == SNIFF_BYTES and "\n" in text:
+        text = text[: text.rindex("\n") + 1]
+    text = text.lstrip("\ufeff")
+
+    update = {"encoding": encoding}
+    if sniff_delimiter:
+        update["delimiter"] = _sniff_delimiter(text)
+    if spec.header is None:
+        update["header"] = _sniff_header(text, update.get("delimiter", spec.delimiter or ","))
+    return spec.model_copy(update=update)
+
+
+@contextmanager
+def _header_source(spec: InputSpec) -> Iterator:
+    """
+    CSV content to parse the header row from: the whole lines of the
+    decompressed first ``SNIFF_BYTES``, or the full content when the first
+    line does not fit there (or the encoding is not ASCII-compatible)
+    """
+    head = _decompressed_head(spec, SNIFF_BYTES)
+    encoding = (spec.encoding or "utf-8").lower().replace("_", "-")
+    if len(head) < SNIFF_BYTES:
+        yield BytesIO(head)
+    elif b"\n" not in head or encoding.startswith(("utf-16", "utf-32")):
+        with _source(spec) as source:
+            yield source
+    else:
+        yield BytesIO(head[: head.rindex(b"\n") + 1])
+
+
+def _decompressed_head(spec: InputSpec, size: int) -> bytes:
+    """Read the first bytes of the content, decompressing only that prefix"""
+    compression = _detect_compression(spec)
+    if compression is None:
+        return _head_bytes(spec, size)
+
+    # Inline content is decoded as the decompressor consumes it
+    if spec.content_b64:
+        raw = io.BufferedReader(_Base64Reader(spec.content_b64))
+    else:
+        raw = _open_raw(spec)
+    try:
+        with COMPRESSION_OPENERS[compression](raw, "rb") as stream:
+            return stream.read(size)
+    except (OSError, EOFError, lzma.LZMAError, binascii.Error) as e:
+        raise IOError(f"Failed to decompress content: {e}")
+
+
+def _sniff_encoding(head: bytes) -> str:
+    """Pick the first candidate encoding that decodes the prefix"""
+    if head.startswith(UTF16_BOMS):
+        return "utf-16"
+
+    # A UTF-8 BOM is skipped by both CSV engines
+    for encoding in SNIFF_ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            # Not final: the prefix may cut a multi-byte character
+            decoder.decode(head, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return SNIFF_ENCODINGS[-1]
+
+
+def _sniff_delimiter(text: str) -> str:
+    """Guess the field delimiter of a CSV prefix, defaulting to a comma"""
+    try:
+        return csv.Sniffer().sniff(text, delimiters=SNIFF_DELIMITERS).delimiter
+    except csv.Error:
+        pass
+
+    # Ragged samples: the candidate found on most lines
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return ","
+    counts = {
+        delimiter: sum(delimiter in line for line in lines) for delimiter in SNIFF_DELIMITERS
+    }
+    best = max(counts, key=counts.get)
+    return best if counts[best] else ","
+
+
+def _sniff_header(text: str, delimiter: str) -> bool:
+    """
+    Tell whether the first line of a CSV prefix is a header row
+
+    The first row is data when one of its cells is numeric, repeats
+    another, or has the email, phone or date shape of the values below it
+    in its column. Anything else, all-text rows included, is a header: a
+    data row taken for a header loses one row, a header taken for data
+    breaks every column name.
+    """
+    lines = text.splitlines()[: SNIFF_HEADER_ROWS + 1]
+    if len(delimiter) == 1:
+        rows = list(csv.reader(lines, delimiter=delimiter))
+    else:
+        rows = [line.split(delimiter) for line in lines]
+    rows = [[cell.strip() for cell in row] for row in rows if any(cell.strip() for cell in row)]
+    if len(rows) < 2:
+        return True
+
+    first, data = rows[0], rows[1:]
+    names = [cell for cell in first if cell]
+    if len(set(names)) != len(names):
+        return False
+
+    for position, cell in enumerate(first):
+        if not cell:
+            continue
+        if NUMBER_SHAPE.match(cell):
+            return False
+        column = [row[position] for row in data if position < len(row) and row[position]]
+        for shape in (EMAIL_SHAPE, PHONE_SHAPE, DATE_SHAPE):
+            if shape.match(cell) and any(shape.match(value) for value in column):
+                return False
+    return True
+
+
+def _open_source(spec: InputSpec):
+    """
+    Return a path or file-like object for the dataset described by spec
+
+    Compressed content is decompressed as a stream. Workbooks and columnar
+    files need random access, so those are decompressed into memory.
+    Parse through ``_source`` so the stream is closed afterwards.
+    """
+    raw = _open_raw(spec)
+    compression = _detect_compression(spec)
+    if compression is None:
+        return raw
+
+    stream = COMPRESSION_OPENERS[compression](raw, "rb")
+    if spec.file_type == FileType.CSV:
+        return stream
+    with stream:
+        return BytesIO(stream.read())
+
+
+@contextmanager
+def _source(spec: InputSpec) -> Iterator:
+    """
+    ``_open_source`` for the duration of a parse, closing the decompression
+    stream it may open (and the file under it) afterwards
+
+    Paths are opened and closed by the parsers themselves; in-memory
+    buffers are left to the garbage collector, as Arrow data read from
+    them may still reference their memory.
+    """
+    source = _open_source(spec)
+    try:
+        yield source
+    finally:
+        if not isinstance(source, (str, BytesIO)):
+            source.close()
+
+
+def _open_raw(spec: InputSpec):
+    """Return a path or in-memory buffer with the (possibly compressed) bytes"""
+    if spec.content_b64:
+        # Decode base64 content
+        try:
+            return BytesIO(base64.b64decode(spec.content_b64))
+        except Exception as e:
+            raise IOError(f"Failed to decode base64 content: {e}")
+    elif spec.file_path:
+        # Read from file path
+        if not os.path.exists(spec.file_path):
+            raise IOError(f"File not found: {spec.file_path}")
+        return spec.file_path
+    else:
+        raise IOError("Either file_path or content_b64 must be provided")
+
+
+def _detect_compression(spec: InputSpec) -> Optional[Compression]:
+    """Use the declared compression, else sniff the magic bytes"""
+    if spec.compression:
+        return spec.compression
+
+    head = _head_bytes(spec, 6)
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _head_bytes(spec: InputSpec, size: int) -> bytes:
+    """Read the first bytes of the raw content without decoding all of it"""
+    if spec.content_b64:
+        try:
+            return io.BufferedReader(_Base64Reader(spec.content_b64)).read(size)
+        except Exception as e:
+            raise IOError(f"Failed to decode base64 content: {e}")
+    elif spec.file_path:
+        try:
+            with open(spec.file_path, "rb") as f:
+                return f.read(size)
+        except OSError as e:
+            raise IOError(f"File not found: {spec.file_path}") from e
+    else:
+        raise IOError("Either file_path or content_b64 must be provided")
+
+
+class _Base64Reader(io.RawIOBase):
+    """
+    Binary stream decoding base64 text lazily, one read at a time
+
+    Whitespace is skipped, as ``base64.b64decode`` does, so line-wrapped
+    payloads (``base64.encodebytes``, MIME) decode like unwrapped ones.
+    """
+
+    def __init__(self, text: str):
+        self._text = text
+        self._position = 0
+        # Alphabet characters read but not decoded yet
+        self._pending = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        # Whole 4-character groups that fit the buffer (3 bytes each)
+        wanted = max(len(buffer) // 3, 1) * 4
+        while len(self._pending) < wanted and self._position < len(self._text):
+            window = self._text[self._position : self._position + wanted]
+            self._position += len(window)
+            self._pending += "".join(window.split())
+
+        if self._position < len(self._text):
+            usable = wanted
+        else:
+            usable = len(self._pending)
+        data = base64.b64decode(self._pending[:usable])
+        self._pending = self._pending[usable:]
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _arrow_source(file_obj):
+    """Wrap in-memory content so pyarrow reads it without another copy"""
+    if isinstance(file_obj, BytesIO):
+        return pa.BufferReader(file_obj.getbuffer())
+    return file_obj
+
+
+def _iter_xlsx_frames(
+    spec: InputSpec, chunk_rows: int, columns: Optional[Iterable[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream the first worksheet of a workbook in row batches
+
+    Uses openpyxl's read-only mode, which parses the sheet XML lazily, and
+    fills per-column buffers directly so at most ``chunk_rows`` rows are
+    held at once. Cells are read as text (see ``_xlsx_text``) and blank
+    rows at the end of the sheet are dropped, as ``pd.read_excel`` does.
+    """
+    workbook = openpyxl.load_workbook(_open_source(spec), read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+
+        first_row = next(rows, None)
+        if first_row is None:
+            return
+        if spec.header:
+            raw_names = list(first_row)
+        else:
+            raw_names = list(range(len(first_row)))
+            rows = itertools.chain([first_row], rows)
+
+        names = [_normalize_name(name, spec) for name in raw_names]
+        wanted = _wanted_columns(spec, columns)
+        positions = [i for i, name in enumerate(names) if wanted is None or name in wanted]
+        names = [names[i] for i in positions]
+
+        buffers: List[list] = [[] for _ in positions]
+        buffered = 0
+        pending_blank = 0
+        offset = 0
+
+        for row in rows:
+            if all(value is None for value in row):
+                # Only kept if a non-blank row follows
+                pending_blank += 1
+                continue
+
+            for _ in range(pending_blank):
+                for buffer in buffers:
+                    buffer.append(np.nan)
+            buffered += pending_blank
+            pending_blank = 0
+
+            for buffer, i in zip(buffers, positions):
+                value = row[i] if i < len(row) else None
+                buffer.append(_xlsx_text(value))
+            buffered += 1
+
+            if buffered >= chunk_rows:
+                yield _xlsx_chunk(names, buffers, offset, buffered)
+                offset += buffered
+                buffers = [[] for _ in positions]
+                buffered = 0
+
+        if buffered:
+            yield _xlsx_chunk(names, buffers, offset, buffered)
+    finally:
+        workbook.close()
+
+
+def _xlsx_text(value):
+    """
+    Text of a cell value, as ``pd.read_excel(dtype=str)`` reads it
+
+    Types are not inferred per chunk: a column of phone numbers with a
+    blank cell would become floats (``600123456.0``) in one chunk and
+    ints in another.
+    """
+    if value is None:
+        return np.nan
+    if isinstance(value, float) and value.is_integer():
+        # Whole numbers read as ints, like pandas' openpyxl reader does
+        value = int(value)
+    return str(value)
+
+
+def _xlsx_chunk(names: list, buffers: List[list], offset: int, n_rows: int) -> pd.DataFrame:
+    """Build a text DataFrame chunk from column buffers"""
+    df = pd.DataFrame(
+        dict(zip(range(len(names)), buffers)),
+        index=pd.RangeIndex(offset, offset + n_rows),
+        dtype=object,
+    )
+    df.columns = names
+    return df
+
+
+def _read_arrow_schema(file_obj) -> pa.Schema:
+    """Read the schema of an Arrow IPC file without touching its batches"""
+    source = _arrow_source(file_obj)
+    if isinstance(source, str):
+        source = pa.memory_map(source, "r")
+    with source:
+        return pa.ipc.open_file(source).schema
+
+
+def _iter_record_batches(
+    spec: InputSpec, chunk_rows: int, columns: Optional[Iterable[str]] = None
+) -> Iterator[pa.RecordBatch]:
+    """Yield record batches of at most chunk_rows rows from a columnar file"""
+    file_obj = _open_source(spec)
+    projection = _columnar_projection(spec, columns, file_obj)
+    source = _arrow_source(file_obj)
+
+    if spec.file_type == FileType.PARQUET:
+        with pq.ParquetFile(source, memory_map=True) as parquet:
+            yield from parquet.iter_batches(batch_size=chunk_rows, columns=projection)
+        return
+
+    if isinstance(source, str):
+        source = pa.memory_map(source, "r")
+    with source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if projection is not None:
+                batch = batch.select(projection)
+            # IPC batches are written by the producer: re-slice to our bound
+            for start in range(0, batch.num_rows, chunk_rows):
+                yield batch.slice(start, chunk_rows)
+
+
+def _wanted_columns(
+    spec: InputSpec, columns: Optional[Iterable[str]] = None
+) -> Optional[FrozenSet[str]]:
+    """Normalized names of the columns to load, or None for all of them"""
+    if columns is None:
+        columns = spec.columns
+    if columns is None or not spec.header:
+        return None
+    return frozenset(col.strip().lower() for col in columns)
+
+
+def _column_filter(
+    spec: InputSpec, columns: Optional[Iterable[str]] = None
+) -> Optional[Callable[[str], bool]]:
+    """Build a pandas ``usecols`` predicate over raw header names"""
+    wanted = _wanted_columns(spec, columns)
+    if wanted is None:
+        return None
+    return lambda name: _normalize_name(name, spec) in wanted
+
+
+def _columnar_projection(
+    spec: InputSpec, columns: Optional[Iterable[str]], file_obj
+) -> Optional[List[str]]:
+    """Resolve the raw column names to read from a Parquet/Arrow schema"""
+    wanted = _wanted_columns(spec, columns)
+    if wanted is None:
+        return None
+
+    if spec.file_type == FileType.PARQUET:
+        names = pq.read_schema(_arrow_source(file_obj), memory_map=True).names
+    else:
+        names = _read_arrow_schema(file_obj).names
+    return [name for name in names if _normalize_name(name, spec) in wanted]
+
+
+def _csv_options(spec: InputSpec) -> dict:
+    """Build pandas.read_csv keyword arguments from spec"""
+    return {
+        "delimiter": spec.delimiter or ",",
+        "encoding": spec.encoding or "utf-8",
+        "header": 0 if spec.header else None,
+        # Values stay text: inferred dtypes depend on the rows parsed together,
+        # so a chunk of "+34655987654" or "600123456" next to a blank would
+        # come back as numbers ("600123456.0") that a full load keeps as text
+        "dtype": str,
+    }
+
+
+def _normalize_columns(df: pd.DataFrame, spec: InputSpec) -> pd.DataFrame:
+    """Apply column mapping and normalize column names"""
+    df.columns = [_normalize_name(name, spec) for name in df.columns]
+    return df
+
+
+def _normalize_name(name, spec: InputSpec):
+    """Map a raw column name through columns_map, then strip and lowercase it"""
+    # Apply column mapping if provided
+    if spec.columns_map:
+        name = spec.columns_map.get(name, name)
+
+    # Normalize column names: strip and lowercase
+    return name.strip().lower() if isinstance(name, str) else name
+
+
 def save_frame(
     df: pd.DataFrame,
     path: str,
     file_type: Optional[FileType] = None,
+    compression: Optional[Compression] = None,
 ) -> str:
     """
     Save a pandas DataFrame to file
@@ -88,6 +991,8 @@ def save_frame(
         df: DataFrame to save
         path: Output file path
         file_type: File type (inferred from extension if not provided)
+        compression: Whole-file compression (inferred from a .gz/.bz2/.xz
+            extension if not provided)
 
     Returns:
         Absolute path to saved file
@@ -99,23 +1004,23 @@ def save_frame(
         # Ensure parent directory exists
         Path(path).parent.mkdir(parents=True, exist_ok=True)
 
-        # Infer file type from extension if not provided
+        # Infer file type and compression from extension if not provided
         if not file_type:
-            ext = Path(path).suffix.lower()
-            if ext == ".csv":
-                file_type = FileType.CSV
-            elif ext in [".xlsx", ".xls"]:
-                file_type = FileType.XLSX
-            else:
-                raise IOError(f"Cannot infer file type from extension: {ext}")
+            file_type = get_file_type_from_path(path)
+        if not compression:
+            compression = get_compression_from_path(path)
 
-        # Write based on file type
-        if file_type == FileType.CSV:
-            df.to_csv(path, index=False, encoding="utf-8")
-        elif file_type == FileType.XLSX:
-            df.to_excel(path, index=False, engine="openpyxl")
+        if compression and file_type == FileType.CSV:
+            with COMPRESSION_OPENERS[compression](path, "wb") as out:
+                _write_frame(df, out, file_type)
+        elif compression:
+            # Zip-based and columnar writers seek back: render, then compress
+            buffer = BytesIO()
+            _write_frame(df, buffer, file_type)
+            with COMPRESSION_OPENERS[compression](path, "wb") as out:
+                out.write(buffer.getbuffer())
         else:
-            raise IOError(f"Unsupported file type: {file_type}")
+            _write_frame(df, path, file_type)
 
         return os.path.abspath(path)
 
@@ -125,10 +1030,31 @@ def save_frame(
         raise IOError(f"Failed to save dataframe: {e}")
 
 
+def _write_frame(df: pd.DataFrame, target, file_type: FileType) -> None:
+    """Write df to a path or binary file object"""
+    # Write based on file type
+    if file_type == FileType.CSV:
+        df.to_csv(target, index=False, encoding="utf-8")
+    elif file_type == FileType.XLSX:
+        df.to_excel(target, index=False, engine="openpyxl")
+    elif file_type == FileType.PARQUET:
+        _arrow_compatible(df).to_parquet(
+            target, engine="pyarrow", index=False, compression=COLUMNAR_COMPRESSION
+        )
+    elif file_type == FileType.ARROW:
+        _arrow_compatible(df).reset_index(drop=True).to_feather(
+            target, compression=COLUMNAR_COMPRESSION
+        )
+    else:
+        raise IOError(f"Unsupported file type: {file_type}")
+
+
 def get_file_type_from_path(path: str) -> FileType:
     """
     Determine file type from file path extension
 
+    A trailing compression extension is ignored (``data.csv.gz`` is CSV).
+
     Args:
         path: File path
 
@@ -138,10 +1064,66 @@ def get_file_type_from_path(path: str) -> FileType:
     Raises:
         IOError: If extension is not supported
     """
-    ext = Path(path).suffix.lower()
-    if ext == ".csv":
-        return FileType.CSV
-    elif ext in [".xlsx", ".xls"]:
-        return FileType.XLSX
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    if suffixes and suffixes[-1] in COMPRESSION_EXTENSIONS:
+        suffixes.pop()
+
+    ext = suffixes[-1] if suffixes else ""
+    if ext in FILE_EXTENSIONS:
+        return FILE_EXTENSIONS[ext]
     else:
         raise IOError(f"Unsupported file extension: {ext}")
+
+
+def get_compression_from_path(path: str) -> Optional[Compression]:
+    """
+    Determine whole-file compression from file path extension
+
+    Args:
+        path: File path
+
+    Returns:
+        Compression enum, or None for uncompressed files
+    """
+    return COMPRESSION_EXTENSIONS.get(Path(path).suffix.lower())
+
+
+def with_compression_suffix(path: str, compression: Optional[Compression]) -> str:
+    """
+    Replace the compression extension of a path
+
+    Args:
+        path: File path, with or without a compression extension
+        compression: Target compression (None strips the extension)
+
+    Returns:
+        Path ending in the extension for compression
+    """
+    if get_compression_from_path(path):
+        path = str(Path(path).with_suffix(""))
+    if compression is None:
+        return path
+    ext = next(ext for ext, codec in COMPRESSION_EXTENSIONS.items() if codec == compression)
+    return path + ext
+
+
+def _arrow_compatible(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Make object columns writable by pyarrow
+
+    Fixes write strings into columns that were parsed as numbers, leaving
+    mixed-type object columns that Arrow cannot type; those are written as
+    strings.
+    """
+    mixed = [
+        col
+        for col in df.columns
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) != "string"
+    ]
+    if not mixed:
+        return df
+
+    df = df.copy()
+    for col in mixed:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
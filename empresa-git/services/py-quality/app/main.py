@@ -1,7 +1,7 @@
 """FastAPI main application"""
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import health, infer, issues, fixes
+from app.routers import health, infer, issues, fixes, dedupe
 from app.config import settings
 
 # Create FastAPI app
@@ -25,6 +25,7 @@ app.include_router(health.router, tags=["health"])
 app.include_router(infer.router, tags=["infer"])
 app.include_router(issues.router, tags=["issues"])
 app.include_router(fixes.router, tags=["fixes"])
+app.include_router(dedupe.router, tags=["dedupe"])
 
 
 @app.on_event("startup")
@@ -41,5 +42,18 @@ async def root():
     return {
         "name": "Python Quality Service",
         "version": "0.1.0",
-        "endpoints": ["/health", "/version", "/infer", "/detect_issues", "/preview_fixes", "/apply_fixes"],
+        "endpoints": [
+            "/health",
+            "/version",
+            "/infer",
+            "/detect_issues",
+            "/preview_fixes",
+            "/apply_fixes",
+            "/infer/upload",
+            "/detect_issues/upload",
+            "/preview_fixes/upload",
+            "/apply_fixes/upload",
+            "/dedupe_index/{name}",
+            "/dedupe_index/{name}/match",
+        ],
     }
@@ -1,11 +1,79 @@
 """Currency normalizer"""
 import re
 from typing import Tuple, Optional
+import numpy as np
+import pandas as pd
 
 
 CURRENCY_SYMBOLS = ["€", "$", "£", "¥"]
 CURRENCY_CODES = ["EUR", "USD", "GBP", "JPY"]
 
+# ISO code of each symbol, and the code assumed when none is present
+SYMBOL_CODES = {"€": "EUR", "$": "USD", "£": "GBP", "¥": "JPY"}
+DEFAULT_CURRENCY = "EUR"
+
+# Any symbol or code (in any case, as codes are detected), removed to leave the amount
+CURRENCY_MARKERS = re.compile(
+    "|".join(re.escape(marker) for marker in CURRENCY_SYMBOLS + CURRENCY_CODES), re.IGNORECASE
+)
+
+
+def parse_series(values: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse a column of currency strings in a single vectorized pass
+
+    The currency is an ISO code written in the value (any case), else the
+    first symbol found. Amounts use European rules when needed: with both
+    dots and commas, dots are thousands separators; a lone comma is the
+    decimal separator.
+
+    Args:
+        values: Series of currency strings (e.g. "€1.234,56", "1234.56 EUR")
+
+    Returns:
+        Tuple of (amounts as floats, currency codes or None, parse-ok mask)
+    """
+    text = values.astype(str).str.strip()
+    upper = text.str.upper()
+
+    # Earlier symbols and codes take precedence: apply them last
+    codes = np.full(len(text), None, dtype=object)
+    for symbol in reversed(CURRENCY_SYMBOLS):
+        codes[text.str.contains(symbol, regex=False).to_numpy()] = SYMBOL_CODES[symbol]
+    for code in reversed(CURRENCY_CODES):
+        codes[upper.str.contains(code, regex=False).to_numpy()] = code
+
+    # Extract numeric part
+    numeric = text.str.replace(CURRENCY_MARKERS, "", regex=True).str.strip()
+    european = numeric.str.contains(".", regex=False) & numeric.str.contains(",", regex=False)
+    numeric = numeric.where(~european, numeric.str.replace(".", "", regex=False))
+    numeric = numeric.str.replace(",", ".", regex=False)
+
+    amounts = pd.to_numeric(numeric, errors="coerce").to_numpy(dtype=float)
+    ok = ~np.isnan(amounts)
+    return amounts, codes, ok
+
+
+def normalize_series(values: pd.Series, config: dict = None) -> pd.Series:
+    """
+    Normalize a column of currency strings to "<amount> <code>"
+
+    Args:
+        values: Series of currency strings
+        config: Optional configuration
+
+    Returns:
+        Series of normalized strings (None where the value cannot be parsed)
+    """
+    amounts, codes, ok = parse_series(values)
+
+    normalized = pd.Series([None] * len(values), index=values.index, dtype=object)
+    if ok.any():
+        formatted = pd.Series(amounts[ok]).map("{:.2f}".format)
+        code = np.where(pd.isna(codes[ok]), DEFAULT_CURRENCY, codes[ok])
+        normalized[ok] = (formatted + " " + code).to_numpy()
+    return normalized
+
 
 def normalize(value: str, config: dict = None) -> Tuple[Optional[float], str]:
     """
@@ -22,48 +90,7 @@ def normalize(value: str, config: dict = None) -> Tuple[Optional[float], str]:
     if not value:
         return None, ""
 
-    value_str = str(value).strip()
-
-    # Detect currency
-    currency_code = "EUR"  # Default
-    for symbol in CURRENCY_SYMBOLS:
-        if symbol in value_str:
-            if symbol == "€":
-                currency_code = "EUR"
-            elif symbol == "$":
-                currency_code = "USD"
-            elif symbol == "£":
-                currency_code = "GBP"
-            elif symbol == "¥":
-                currency_code = "JPY"
-            break
-
-    for code in CURRENCY_CODES:
-        if code in value_str.upper():
-            currency_code = code
-            break
-
-    # Extract numeric part
-    numeric_str = value_str
-
-    # Remove currency symbols and codes
-    for symbol in CURRENCY_SYMBOLS + CURRENCY_CODES:
-        numeric_str = numeric_str.replace(symbol, "")
-
-    numeric_str = numeric_str.strip()
-
-    # Handle European format (comma as decimal separator)
-    # If there are both dots and commas, assume European format
-    if "." in numeric_str and "," in numeric_str:
-        # Remove dots (thousands separator) and replace comma with dot
-        numeric_str = numeric_str.replace(".", "").replace(",", ".")
-    elif "," in numeric_str:
-        # Only commas - replace with dot
-        numeric_str = numeric_str.replace(",", ".")
-
-    # Try to parse
-    try:
-        numeric_value = float(numeric_str)
-        return numeric_value, currency_code
-    except ValueError:
+    amounts, codes, ok = parse_series(pd.Series([value], dtype=object))
+    if not ok[0]:
         return None, ""
+    return float(amounts[0]), codes[0] or DEFAULT_CURRENCY
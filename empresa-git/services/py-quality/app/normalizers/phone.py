@@ -1,5 +1,6 @@
 """Phone normalizer"""
 import re
+import pandas as pd
 from app.config import settings
 
 
@@ -28,3 +29,27 @@ def normalize(value: str, config: dict = None) -> str:
 
     # Add country code
     return f"{phone_cc}{cleaned}"
+
+
+def normalize_series(values: pd.Series, config: dict = None) -> pd.Series:
+    """
+    Normalize a column of phone number strings to E.164 format
+
+    Vectorized equivalent of ``normalize``: empty strings are kept as they
+    are.
+
+    Args:
+        values: Series of phone number strings
+        config: Optional configuration (phone_cc)
+
+    Returns:
+        Series of normalized phone numbers
+    """
+    phone_cc = config.get("phone_cc", settings.phone_cc) if config else settings.phone_cc
+
+    # Remove all non-digit and non-plus characters
+    cleaned = values.str.replace(r"[^\d+]", "", regex=True)
+
+    # Add country code unless already present
+    normalized = cleaned.where(cleaned.str.startswith("+"), phone_cc + cleaned)
+    return normalized.where(values != "", values)
@@ -1,9 +1,10 @@
 """Routers package exports"""
-from . import health, infer, issues, fixes
+from . import health, infer, issues, fixes, dedupe
 
 __all__ = [
     "health",
     "infer",
     "issues",
     "fixes",
+    "dedupe",
 ]
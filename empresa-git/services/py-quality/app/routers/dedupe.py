@@ -0,0 +1,110 @@
+"""Persistent dedupe index routes (build and match)"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.schemas import InputSpec, DedupeIndexInfo, DetectIssuesResponse
+from app.services import dedupe_service
+from app.services.dedupe_service import IndexNotFoundError
+from app.io_utils import IOError
+from app.routers.uploads import upload_spec
+
+router = APIRouter()
+
+
+@router.post("/dedupe_index/{name}", response_model=DedupeIndexInfo)
+async def build_index(name: str, spec: InputSpec):
+    """
+    Build (or rebuild) a dedupe index from a reference dataset
+
+    Args:
+        name: Index name (letters, digits, ``_`` and ``-``)
+        spec: Input specification of the reference dataset
+
+    Returns:
+        DedupeIndexInfo of the new index
+    """
+    try:
+        return dedupe_service.build_index(spec, name)
+    except (IOError, ValueError, IndexNotFoundError) as e:
+        raise _http_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail={"code": "INTERNAL_ERROR", "message": str(e)}
+        )
+
+
+@router.post("/dedupe_index/{name}/upload", response_model=DedupeIndexInfo)
+async def build_index_upload(name: str, spec: InputSpec = Depends(upload_spec)):
+    """
+    Build (or rebuild) a dedupe index from an uploaded reference file
+
+    Returns:
+        DedupeIndexInfo of the new index
+    """
+    return await build_index(name, spec)
+
+
+@router.get("/dedupe_index/{name}", response_model=DedupeIndexInfo)
+async def index_info(name: str):
+    """
+    Describe a dedupe index
+
+    Args:
+        name: Index name
+
+    Returns:
+        DedupeIndexInfo
+    """
+    try:
+        return dedupe_service.index_info(name)
+    except (ValueError, IndexNotFoundError) as e:
+        raise _http_error(e)
+
+
+@router.post("/dedupe_index/{name}/match", response_model=DetectIssuesResponse)
+async def match_index(
+    name: str,
+    spec: InputSpec,
+    append: bool = Query(False, description="Add the distinct rows to the index"),
+):
+    """
+    Find duplicates of a dataset in a dedupe index (and within the dataset)
+
+    Args:
+        name: Index name
+        spec: Input specification of the new rows
+        append: Add the new distinct rows to the index afterwards
+
+    Returns:
+        DetectIssuesResponse with duplicate issues and the index description
+    """
+    try:
+        return dedupe_service.match_index(spec, name, append)
+    except (IOError, ValueError, IndexNotFoundError) as e:
+        raise _http_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail={"code": "INTERNAL_ERROR", "message": str(e)}
+        )
+
+
+@router.post("/dedupe_index/{name}/match/upload", response_model=DetectIssuesResponse)
+async def match_index_upload(
+    name: str,
+    append: bool = Query(False, description="Add the distinct rows to the index"),
+    spec: InputSpec = Depends(upload_spec),
+):
+    """
+    Find duplicates of an uploaded file in a dedupe index
+
+    Returns:
+        DetectIssuesResponse with duplicate issues and the index description
+    """
+    return await match_index(name, spec, append)
+
+
+def _http_error(error: Exception) -> HTTPException:
+    """Map a service error to its HTTP error"""
+    if isinstance(error, IndexNotFoundError):
+        return HTTPException(status_code=404, detail={"code": "NOT_FOUND", "message": str(error)})
+    if isinstance(error, IOError):
+        return HTTPException(status_code=422, detail={"code": "PARSE_ERROR", "message": str(error)})
+    return HTTPException(status_code=422, detail={"code": "INVALID_REQUEST", "message": str(error)})
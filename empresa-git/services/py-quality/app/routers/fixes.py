@@ -1,8 +1,9 @@
 """Fixes routes (preview and apply)"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from app.schemas import InputSpec, FixResult, PreviewFixesResponse
 from app.services import fixes_service
 from app.io_utils import IOError
+from app.routers.uploads import upload_spec
 
 router = APIRouter()
 
@@ -29,6 +30,20 @@ async def preview_fixes(spec: InputSpec):
         )
 
 
+@router.post("/preview_fixes/upload", response_model=PreviewFixesResponse)
+async def preview_fixes_upload(spec: InputSpec = Depends(upload_spec)):
+    """
+    Preview proposed fixes for an uploaded file
+
+    The file is sent as multipart/form-data (``file`` field) or as the raw
+    request body; options are passed as query parameters.
+
+    Returns:
+        PreviewFixesResponse with fix previews
+    """
+    return await preview_fixes(spec)
+
+
 @router.post("/apply_fixes", response_model=FixResult)
 async def apply_fixes(spec: InputSpec):
     """
@@ -49,3 +64,17 @@ async def apply_fixes(spec: InputSpec):
         raise HTTPException(
             status_code=500, detail={"code": "INTERNAL_ERROR", "message": str(e)}
         )
+
+
+@router.post("/apply_fixes/upload", response_model=FixResult)
+async def apply_fixes_upload(spec: InputSpec = Depends(upload_spec)):
+    """
+    Apply fixes to an uploaded file and generate clean file
+
+    The file is sent as multipart/form-data (``file`` field) or as the raw
+    request body; options are passed as query parameters.
+
+    Returns:
+        FixResult with applied/rejected counts and clean file path
+    """
+    return await apply_fixes(spec)
@@ -1,8 +1,9 @@
 """Infer schema route"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from app.schemas import InputSpec, InferResult
 from app.services import infer_service
 from app.io_utils import IOError
+from app.routers.uploads import upload_spec
 
 router = APIRouter()
 
@@ -27,3 +28,17 @@ async def infer(spec: InputSpec):
         raise HTTPException(
             status_code=500, detail={"code": "INTERNAL_ERROR", "message": str(e)}
         )
+
+
+@router.post("/infer/upload", response_model=InferResult)
+async def infer_upload(spec: InputSpec = Depends(upload_spec)):
+    """
+    Infer schema and data types from an uploaded file
+
+    The file is sent as multipart/form-data (``file`` field) or as the raw
+    request body; options are passed as query parameters.
+
+    Returns:
+        InferResult with column information and KPIs
+    """
+    return await infer(spec)
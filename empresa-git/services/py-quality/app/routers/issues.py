@@ -1,8 +1,9 @@
 """Issues detection routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from app.schemas import InputSpec, DetectIssuesResponse
 from app.services import issues_service
 from app.io_utils import IOError
+from app.routers.uploads import upload_spec
 
 router = APIRouter()
 
@@ -27,3 +28,17 @@ async def detect_issues(spec: InputSpec):
         raise HTTPException(
             status_code=500, detail={"code": "INTERNAL_ERROR", "message": str(e)}
         )
+
+
+@router.post("/detect_issues/upload", response_model=DetectIssuesResponse)
+async def detect_issues_upload(spec: InputSpec = Depends(upload_spec)):
+    """
+    Detect data quality issues in an uploaded file
+
+    The file is sent as multipart/form-data (``file`` field) or as the raw
+    request body; options are passed as query parameters.
+
+    Returns:
+        DetectIssuesResponse with issues and summary
+    """
+    return await detect_issues(spec)
@@ -0,0 +1,164 @@
+"""Binary upload support shared by the data quality routes"""
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, AsyncIterator, Literal, Optional, Union
+from fastapi import HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+from app.schemas import (
+    InputSpec,
+    FileType,
+    Compression,
+    CsvEngine,
+    DedupeEngine,
+    DedupeMode,
+)
+from app.io_utils import IOError, get_file_type_from_path
+from app.config import settings
+
+# Bytes copied per read (or buffered per write) while spooling an upload to disk
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+async def upload_spec(
+    request: Request,
+    file_type: Optional[FileType] = Query(None, description="Inferred from the filename if omitted"),
+    filename: Optional[str] = Query(None, description="Original filename (or X-Filename header)"),
+    delimiter: Optional[str] = Query(",", description="\"auto\" to sniff it"),
+    encoding: Optional[str] = Query("utf-8", description="\"auto\" to sniff it"),
+    compression: Optional[Compression] = Query(None, description="Sniffed if omitted"),
+    # A query string cannot carry null: "auto" stands for header=None
+    header: Optional[Union[bool, Literal["auto"]]] = Query(
+        True, description="\"auto\" to sniff it"
+    ),
+    csv_engine: Optional[CsvEngine] = Query(None),
+    dup_engine: Optional[DedupeEngine] = Query(None),
+    dup_clusters: Optional[bool] = Query(None),
+    dedupe_mode: Optional[DedupeMode] = Query(None),
+    columns_map: Optional[str] = Query(None, description="JSON object: raw name to new name"),
+    column_roles: Optional[str] = Query(None, description="JSON object: column to role"),
+    route_types: Optional[bool] = Query(None),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to load"),
+    rules: Optional[str] = Query(None, description="JSON list of rules"),
+    chunk_rows: Optional[int] = Query(None, gt=0),
+    output_compression: Optional[Compression] = Query(None),
+) -> AsyncIterator[InputSpec]:
+    """
+    Spool a raw upload to a temp file and describe it as an InputSpec
+
+    Accepts either a ``multipart/form-data`` body with a ``file`` field or
+    the raw file as the request body (e.g. ``application/octet-stream``).
+    The body is written to disk as it arrives, so the file is never held in
+    memory as a whole; file operations run in the threadpool so the event
+    loop is not blocked by disk I/O. The temp file is removed once the
+    response is sent.
+
+    Every InputSpec option but the content can be given as a query
+    parameter; mappings and rules are JSON encoded.
+
+    Yields:
+        InputSpec pointing at the spooled file
+    """
+    options = {
+        "compression": compression,
+        "delimiter": delimiter,
+        "encoding": encoding,
+        "header": None if header == "auto" else header,
+        "csv_engine": csv_engine,
+        "dup_engine": dup_engine,
+        "dup_clusters": dup_clusters,
+        "dedupe_mode": dedupe_mode,
+        "columns_map": _json_option("columns_map", columns_map),
+        "column_roles": _json_option("column_roles", column_roles),
+        "route_types": route_types,
+        "columns": [col.strip() for col in columns.split(",")] if columns else None,
+        "rules": _json_option("rules", rules),
+        "chunk_rows": chunk_rows,
+        "output_compression": output_compression,
+    }
+
+    upload_dir = await run_in_threadpool(_make_upload_dir)
+
+    try:
+        content_type = request.headers.get("content-type", "")
+
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            try:
+                upload = form.get("file")
+                if not isinstance(upload, UploadFile):
+                    raise HTTPException(
+                        status_code=422,
+                        detail={"code": "PARSE_ERROR", "message": "Missing 'file' form field"},
+                    )
+                path = _upload_path(upload_dir, filename or upload.filename)
+                await run_in_threadpool(_copy_file, upload.file, path)
+            finally:
+                await form.close()
+        else:
+            path = _upload_path(upload_dir, filename or request.headers.get("x-filename"))
+            out = await run_in_threadpool(open, path, "wb")
+            try:
+                # Small body messages are gathered into one write per COPY_CHUNK_BYTES
+                buffered = bytearray()
+                async for chunk in request.stream():
+                    buffered += chunk
+                    if len(buffered) >= COPY_CHUNK_BYTES:
+                        await run_in_threadpool(out.write, buffered)
+                        buffered.clear()
+                await run_in_threadpool(out.write, buffered)
+            finally:
+                await run_in_threadpool(out.close)
+
+        if file_type is None:
+            try:
+                file_type = get_file_type_from_path(path)
+            except IOError as e:
+                raise HTTPException(
+                    status_code=422, detail={"code": "PARSE_ERROR", "message": str(e)}
+                )
+
+        try:
+            spec = InputSpec(file_path=path, file_type=file_type, **options)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=422, detail={"code": "PARSE_ERROR", "message": str(e)}
+            )
+        yield spec
+    finally:
+        await run_in_threadpool(shutil.rmtree, upload_dir, ignore_errors=True)
+
+
+def _make_upload_dir() -> str:
+    """Create a private temp dir for one upload"""
+    uploads_dir = os.path.join(settings.quality_tmp_dir, "uploads")
+    os.makedirs(uploads_dir, exist_ok=True)
+    return tempfile.mkdtemp(dir=uploads_dir)
+
+
+def _copy_file(source, path: str) -> None:
+    """Copy a (spooled) upload file to path"""
+    source.seek(0)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(source, out, COPY_CHUNK_BYTES)
+
+
+def _upload_path(upload_dir: str, filename: Optional[str]) -> str:
+    """Path for the spooled upload, keeping the client's base filename"""
+    name = os.path.basename(filename or "") or "upload"
+    return os.path.join(upload_dir, name)
+
+
+def _json_option(name: str, value: Optional[str]) -> Any:
+    """Decode a JSON-encoded query parameter"""
+    if value is None:
+        return None
+    try:
+        return json.loads(value)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=422,
+            detail={"code": "PARSE_ERROR", "message": f"Invalid JSON in '{name}': {e}"},
+        )
@@ -1,5 +1,16 @@
 """Schemas package exports"""
-from .types import IssueKind, Severity, FileType, RuleKind, InferredType
+from .types import (
+    IssueKind,
+    Severity,
+    FileType,
+    CsvEngine,
+    DedupeEngine,
+    DedupeMode,
+    ColumnRole,
+    Compression,
+    RuleKind,
+    InferredType,
+)
 from .dto import (
     RuleSpec,
     InputSpec,
@@ -10,15 +21,22 @@ from .dto import (
     InferResult,
     DetectIssuesResponse,
     PreviewFixesResponse,
+    DedupeIndexInfo,
     HealthResponse,
     VersionResponse,
 )
+from .batch import IssueBatch
 
 __all__ = [
     # Types
     "IssueKind",
     "Severity",
     "FileType",
+    "CsvEngine",
+    "DedupeEngine",
+    "DedupeMode",
+    "ColumnRole",
+    "Compression",
     "RuleKind",
     "InferredType",
     # DTOs
@@ -31,6 +49,9 @@ __all__ = [
     "InferResult",
     "DetectIssuesResponse",
     "PreviewFixesResponse",
+    "DedupeIndexInfo",
     "HealthResponse",
     "VersionResponse",
+    # Columnar containers
+    "IssueBatch",
 ]
@@ -0,0 +1,293 @@
+"""Columnar container for detected issues"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from app.utils import object_array
+from .types import IssueKind, Severity
+from .dto import Issue
+
+
+# Enum members by code (position), used to encode kind and severity columns
+KINDS: List[IssueKind] = list(IssueKind)
+SEVERITIES: List[Severity] = list(Severity)
+_KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+_SEVERITY_CODES = {severity: code for code, severity in enumerate(SEVERITIES)}
+
+# Row/column code of issues without a row or column
+NO_CODE = -1
+
+
+class IssueBatch:
+    """
+    Issues stored as parallel arrays instead of one ``Issue`` model each
+
+    ``kind``, ``severity`` and ``col`` hold codes into ``KINDS``,
+    ``SEVERITIES`` and ``columns``; ``row`` holds row numbers. Detail
+    fields are dictionary-encoded: each field keeps a list of distinct
+    values and one code per issue (``NO_CODE`` when the issue lacks that
+    field). Batches are only expanded to ``Issue`` objects at the API edge.
+    """
+
+    def __init__(
+        self,
+        kind: np.ndarray,
+        severity: np.ndarray,
+        row: np.ndarray,
+        col: np.ndarray,
+        columns: List[Optional[str]],
+        details: Dict[str, Tuple[np.ndarray, list]],
+    ):
+        self.kind = kind
+        self.severity = severity
+        self.row = row
+        self.col = col
+        self.columns = columns
+        self.details = details
+
+    @classmethod
+    def empty(cls) -> "IssueBatch":
+        """Batch holding no issues"""
+        codes = np.empty(0, dtype=np.int64)
+        return cls(codes, codes, codes, codes, [], {})
+
+    @classmethod
+    def build(
+        cls,
+        kind: Union[IssueKind, Iterable[IssueKind]],
+        severity: Union[Severity, Iterable[Severity]],
+        rows: Iterable[Optional[int]],
+        col: Optional[str] = None,
+        shared: Optional[Dict[str, Any]] = None,
+        **details: Iterable[Any],
+    ) -> "IssueBatch":
+        """
+        Build a batch for issues found in one column
+
+        Args:
+            kind: Kind of every issue, or one kind per issue
+            severity: Severity of every issue, or one severity per issue
+            rows: Row number of each issue (None for column-level issues)
+            col: Column of the issues (None for row-level issues)
+            shared: Detail fields with the same value for every issue
+            **details: Detail fields with one value per issue (None leaves
+                the field out of that issue's details)
+
+        Returns:
+            IssueBatch
+        """
+        if not isinstance(rows, (np.ndarray, pd.Index, pd.Series)):
+            rows = list(rows)
+        row = pd.array(rows, dtype="Int64").to_numpy(dtype=np.int64, na_value=NO_CODE)
+        size = len(row)
+
+        kind_codes = _encode(kind, _KIND_CODES, size)
+        severity_codes = _encode(severity, _SEVERITY_CODES, size)
+
+        encoded: Dict[str, Tuple[np.ndarray, list]] = {}
+        for name, values in details.items():
+            codes, uniques = pd.factorize(object_array(values), use_na_sentinel=True)
+            encoded[name] = (codes.astype(np.int64), _to_python(uniques))
+        for name, value in (shared or {}).items():
+            encoded[name] = (np.zeros(size, dtype=np.int64), [value])
+
+        return cls(
+            kind_codes,
+            severity_codes,
+            row,
+            np.full(size, 0 if col is not None else NO_CODE, dtype=np.int64),
+            [col] if col is not None else [],
+            encoded,
+        )
+
+    @classmethod
+    def concat(cls, batches: Iterable["IssueBatch"]) -> "IssueBatch":
+        """
+        Concatenate batches, keeping their order
+
+        Args:
+            batches: Batches to join
+
+        Returns:
+            IssueBatch with every issue
+        """
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+
+        column_codes: Dict[Optional[str], int] = {}
+        col_parts = []
+        for batch in batches:
+            remap = np.array(
+                [column_codes.setdefault(name, len(column_codes)) for name in batch.columns]
+                + [NO_CODE],
+                dtype=np.int64,
+            )
+            # NO_CODE (-1) indexes the trailing entry of remap
+            col_parts.append(remap[batch.col])
+
+        names = list(dict.fromkeys(name for batch in batches for name in batch.details))
+        details: Dict[str, Tuple[np.ndarray, list]] = {}
+        for name in names:
+            code_parts = []
+            values: list = []
+            for batch in batches:
+                if name in batch.details:
+                    codes, batch_values = batch.details[name]
+                    code_parts.append(np.where(codes == NO_CODE, NO_CODE, codes + len(values)))
+                    values.extend(batch_values)
+                else:
+                    code_parts.append(np.full(len(batch), NO_CODE, dtype=np.int64))
+            details[name] = (np.concatenate(code_parts), values)
+
+        return cls(
+            np.concatenate([batch.kind for batch in batches]),
+            np.concatenate([batch.severity for batch in batches]),
+            np.concatenate([batch.row for batch in batches]),
+            np.concatenate(col_parts),
+            list(column_codes),
+            details,
+        )
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def take(self, positions: Union[np.ndarray, slice]) -> "IssueBatch":
+        """
+        Select issues by position or boolean mask
+
+        Args:
+            positions: Integer positions, boolean mask or slice
+
+        Returns:
+            IssueBatch with the selected issues
+        """
+        return IssueBatch(
+            self.kind[positions],
+            self.severity[positions],
+            self.row[positions],
+            self.col[positions],
+            self.columns,
+            {name: (codes[positions], values) for name, (codes, values) in self.details.items()},
+        )
+
+    def has_cell(self) -> np.ndarray:
+        """Boolean mask of the issues tied to both a row and a column"""
+        return (self.row != NO_CODE) & (self.col != NO_CODE)
+
+    def is_kind(self, kind: IssueKind) -> np.ndarray:
+        """Boolean mask of the issues of one kind"""
+        return self.kind == _KIND_CODES[kind]
+
+    def has_detail(self, name: str) -> np.ndarray:
+        """Boolean mask of the issues with a detail field"""
+        if name not in self.details:
+            return np.zeros(len(self), dtype=bool)
+        return self.details[name][0] != NO_CODE
+
+    def detail_array(self, name: str) -> np.ndarray:
+        """
+        Decode one detail field for every issue
+
+        Args:
+            name: Detail field
+
+        Returns:
+            Object array of the field's values (None where an issue lacks it)
+        """
+        if name not in self.details:
+            return np.full(len(self), None, dtype=object)
+        codes, values = self.details[name]
+        # Trailing None: NO_CODE (-1) indexes it
+        lookup = np.empty(len(values) + 1, dtype=object)
+        lookup[: len(values)] = values
+        return lookup[codes]
+
+    def kinds(self) -> List[IssueKind]:
+        """Kind of each issue"""
+        return [KINDS[code] for code in self.kind]
+
+    def cells(self) -> Iterator[Tuple[IssueKind, int, str]]:
+        """Yield ``(kind, row, col)`` for the issues tied to a cell"""
+        mask = self.has_cell()
+        for kind, row, col in zip(self.kind[mask], self.row[mask], self.col[mask]):
+            yield KINDS[kind], int(row), self.columns[col]
+
+    def cell_groups(self) -> Iterator[Tuple[IssueKind, str, np.ndarray]]:
+        """
+        Group the issues tied to a cell by kind and column
+
+        Yields:
+            Tuples of (kind, column, row numbers), in order of first appearance
+        """
+        mask = self.has_cell()
+        frame = pd.DataFrame({"kind": self.kind[mask], "col": self.col[mask], "row": self.row[mask]})
+        for (kind, col), rows in frame.groupby(["kind", "col"], sort=False)["row"]:
+            yield KINDS[kind], self.columns[col], rows.to_numpy()
+
+    def detail(self, name: str, position: int, default: Any = None) -> Any:
+        """Value of one detail field of the issue at position"""
+        if name not in self.details:
+            return default
+        codes, values = self.details[name]
+        code = codes[position]
+        return default if code == NO_CODE else values[code]
+
+    def counts_by_kind(self) -> Dict[IssueKind, int]:
+        """Number of issues of each kind present"""
+        counts = np.bincount(self.kind, minlength=len(KINDS))
+        return {KINDS[code]: int(count) for code, count in enumerate(counts) if count}
+
+    def counts_by_severity(self) -> Dict[Severity, int]:
+        """Number of issues of each severity present"""
+        counts = np.bincount(self.severity, minlength=len(SEVERITIES))
+        return {SEVERITIES[code]: int(count) for code, count in enumerate(counts) if count}
+
+    def affected_rows(self) -> int:
+        """Number of distinct rows with at least one issue"""
+        return len(np.unique(self.row[self.row != NO_CODE]))
+
+    def to_issues(self, limit: Optional[int] = None) -> List[Issue]:
+        """
+        Expand the batch to ``Issue`` models
+
+        Args:
+            limit: Only expand the first ``limit`` issues
+
+        Returns:
+            List of Issue objects
+        """
+        size = len(self) if limit is None else min(limit, len(self))
+        issues = []
+        for position in range(size):
+            details = {}
+            for name, (codes, values) in self.details.items():
+                code = codes[position]
+                if code != NO_CODE:
+                    details[name] = values[code]
+
+            row = int(self.row[position])
+            col = int(self.col[position])
+            issues.append(
+                Issue(
+                    kind=KINDS[self.kind[position]],
+                    severity=SEVERITIES[self.severity[position]],
+                    row=None if row == NO_CODE else row,
+                    col=None if col == NO_CODE else self.columns[col],
+                    details=details,
+                )
+            )
+        return issues
+
+
+def _encode(value: Any, codes: Dict[Any, int], size: int) -> np.ndarray:
+    """Encode a scalar enum member (or one member per issue) as codes"""
+    if isinstance(value, (str, type(None))) or not isinstance(value, Iterable):
+        return np.full(size, codes[value], dtype=np.int64)
+    return np.fromiter((codes[member] for member in value), dtype=np.int64, count=size)
+
+
+def _to_python(values: np.ndarray) -> list:
+    """Distinct detail values as Python objects (numpy scalars do not serialize)"""
+    return [value.item() if isinstance(value, np.generic) else value for value in values]
@@ -1,7 +1,18 @@
 """Data Transfer Objects (DTOs) for API contracts"""
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
-from .types import IssueKind, Severity, FileType, RuleKind, InferredType
+from .types import (
+    IssueKind,
+    Severity,
+    FileType,
+    CsvEngine,
+    DedupeEngine,
+    DedupeMode,
+    ColumnRole,
+    Compression,
+    RuleKind,
+    InferredType,
+)
 
 
 class RuleSpec(BaseModel):
@@ -19,11 +30,21 @@ class InputSpec(BaseModel):
     file_path: Optional[str] = None
     content_b64: Optional[str] = None
     file_type: FileType
-    delimiter: Optional[str] = ","
-    encoding: Optional[str] = "utf-8"
-    header: bool = True
+    compression: Optional[Compression] = None  # Detected from magic bytes if omitted
+    delimiter: Optional[str] = ","  # "auto" sniffs it from the first bytes
+    encoding: Optional[str] = "utf-8"  # "auto" sniffs it (BOM, UTF-8, CP1252, Latin-1)
+    header: Optional[bool] = True  # None sniffs whether the first CSV row is a header
+    csv_engine: Optional[CsvEngine] = None  # Defaults to settings.csv_engine
+    dup_engine: Optional[DedupeEngine] = None  # Defaults to settings.dup_engine
+    dup_clusters: Optional[bool] = None  # One issue per duplicate cluster; defaults to settings.dup_clusters
+    dedupe_mode: Optional[DedupeMode] = None  # apply_fixes: drop or merge duplicate clusters
     columns_map: Optional[Dict[str, str]] = None
+    column_roles: Optional[Dict[str, ColumnRole]] = None  # Overrides routing by column name
+    route_types: Optional[bool] = None  # Route unnamed columns by inferred type; defaults to settings.route_types
+    columns: Optional[List[str]] = None
     rules: Optional[List[RuleSpec]] = None
+    chunk_rows: Optional[int] = Field(default=None, gt=0)
+    output_compression: Optional[Compression] = None
 
     def model_post_init(self, __context: Any) -> None:
         """Validate that either file_path or content_b64 is provided"""
@@ -94,6 +115,16 @@ class PreviewFixesResponse(BaseModel):
     note: Optional[str] = None
 
 
+class DedupeIndexInfo(BaseModel):
+    """Persistent dedupe index description"""
+
+    name: str
+    engine: DedupeEngine
+    key_columns: List[str]
+    records: int  # Rows loaded: the reference dataset, then every appended upload
+    rows: int  # Distinct rows stored (exact duplicates are stored once)
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
 
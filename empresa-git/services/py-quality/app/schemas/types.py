@@ -8,6 +8,7 @@ class IssueKind(str, Enum):
     EMAIL_INVALID = "email_invalid"
     PHONE_INVALID = "phone_invalid"
     DUPLICATE = "duplicate"
+    DUPLICATE_CLUSTER = "duplicate_cluster"
     DATE_FORMAT = "date_format"
     CURRENCY = "currency"
     PRICE_ZERO = "price_zero"
@@ -33,6 +34,50 @@ class FileType(str, Enum):
 
     CSV = "csv"
     XLSX = "xlsx"
+    PARQUET = "parquet"
+    ARROW = "arrow"  # Arrow IPC file format (Feather v2)
+
+
+class CsvEngine(str, Enum):
+    """CSV parser engines"""
+
+    AUTO = "auto"  # pyarrow for large files, C parser otherwise
+    C = "c"
+    PYARROW = "pyarrow"
+
+
+class DedupeEngine(str, Enum):
+    """Candidate generation engines for duplicate detection"""
+
+    BLOCKING = "blocking"  # Key prefix and suffix blocks
+    MINHASH = "minhash"  # MinHash/LSH buckets over character shingles
+
+
+class DedupeMode(str, Enum):
+    """How apply_fixes resolves duplicate clusters"""
+
+    DROP = "drop"  # Keep the survivor, remove the other rows
+    MERGE = "merge"  # Also fill the survivor's empty cells from the other rows
+
+
+class ColumnRole(str, Enum):
+    """Declared meaning of a column, choosing the detectors run on it"""
+
+    EMAIL = "email"
+    PHONE = "phone"
+    DATE = "date"
+    PRICE = "price"
+    ID = "id"
+    NIF = "nif"
+    NONE = "none"  # No column detector
+
+
+class Compression(str, Enum):
+    """Supported compression codecs for input and output files"""
+
+    GZIP = "gzip"
+    BZ2 = "bz2"
+    XZ = "xz"
 
 
 class RuleKind(str, Enum):
@@ -1,8 +1,10 @@
 """Services package exports"""
-from . import infer_service, issues_service, fixes_service
+from . import infer_service, routing_service, issues_service, fixes_service, dedupe_service
 
 __all__ = [
     "infer_service",
+    "routing_service",
     "issues_service",
     "fixes_service",
+    "dedupe_service",
 ]
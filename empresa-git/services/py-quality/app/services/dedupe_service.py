@@ -0,0 +1,375 @@
+"""Persistent dedupe index: match uploads against records loaded before"""
+import json
+import os
+import re
+import sqlite3
+from collections import deque
+from contextlib import closing
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import pandas as pd
+from app.schemas import InputSpec, DetectIssuesResponse, DedupeIndexInfo, DedupeEngine
+from app.io_utils import load_frame, iter_frames, read_header
+from app.detectors import duplicates
+from app.services.issues_service import calculate_summary
+from app.utils import fingerprint_rows
+from app.config import settings
+
+
+# Index names double as file names
+INDEX_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Settings an index is built with; matching always uses the index's own
+INDEX_OPTIONS = (
+    "dup_engine",
+    "dup_minhash_bands",
+    "dup_minhash_rows",
+    "dup_shingle_size",
+    "dup_block_max_size",
+)
+
+# Most values bound to one SQL lookup (SQLite caps host parameters)
+LOOKUP_BATCH = 500
+
+
+class IndexNotFoundError(Exception):
+    """Raised when a dedupe index does not exist"""
+
+    pass
+
+
+SCHEMA = """
+CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE records (
+    position INTEGER PRIMARY KEY,
+    record INTEGER NOT NULL,
+    key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE blocks (block TEXT NOT NULL, position INTEGER NOT NULL);
+CREATE INDEX blocks_by_key ON blocks (block, position);
+"""
+
+
+def index_path(name: str) -> str:
+    """
+    Path of the SQLite file of a dedupe index
+
+    Args:
+        name: Index name (letters, digits, ``_`` and ``-``)
+
+    Returns:
+        Path under ``quality_tmp_dir``
+
+    Raises:
+        ValueError: If the name is not a valid index name
+    """
+    if not INDEX_NAME_PATTERN.match(name):
+        raise ValueError(f"Invalid index name: {name!r}")
+    return os.path.join(settings.quality_tmp_dir, "dedupe", f"{name}.sqlite")
+
+
+def build_index(spec: InputSpec, name: str) -> DedupeIndexInfo:
+    """
+    Build (or rebuild) a dedupe index from a reference dataset
+
+    The dataset is streamed in chunks. Each distinct row (by normalized key
+    values) is stored with its key values and the blocks it belongs to, so
+    later matches only read the blocks of the rows they bring.
+
+    Args:
+        spec: Input specification of the reference dataset
+        name: Index name
+
+    Returns:
+        DedupeIndexInfo of the new index
+    """
+    path = index_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Build next to the old index and swap, so readers never see a partial one
+    building = f"{path}.building"
+    if os.path.exists(building):
+        os.remove(building)
+
+    header = read_header(spec)
+    configured = [col for col in settings.dup_key_columns_list if col in header]
+    chunk_rows = spec.chunk_rows or settings.chunk_rows
+
+    with closing(sqlite3.connect(building)) as conn:
+        conn.executescript(SCHEMA)
+        meta: Dict[str, Any] = {
+            "name": name,
+            "records": 0,
+            "rows": 0,
+            **{option: getattr(settings, option) for option in INDEX_OPTIONS},
+        }
+        if spec.dup_engine is not None:
+            meta["dup_engine"] = spec.dup_engine.value
+
+        for chunk in iter_frames(spec, chunk_rows, configured or None):
+            if "key_columns" not in meta:
+                meta["key_columns"] = duplicates.key_columns(chunk)
+            # Chunks keep a global row index: it is the record number
+            records = [int(idx) for idx in chunk.index]
+            _append_rows(conn, meta, records, duplicates.key_rows(chunk, meta["key_columns"]))
+            meta["records"] += len(chunk)
+
+        meta.setdefault("key_columns", configured)
+        _write_meta(conn, meta)
+        conn.commit()
+
+    os.replace(building, path)
+    return _info(meta)
+
+
+def index_info(name: str) -> DedupeIndexInfo:
+    """
+    Describe a dedupe index
+
+    Args:
+        name: Index name
+
+    Returns:
+        DedupeIndexInfo
+
+    Raises:
+        IndexNotFoundError: If the index does not exist
+    """
+    with closing(_connect(name)) as conn:
+        return _info(_read_meta(conn))
+
+
+def match_index(spec: InputSpec, name: str, append: bool = False) -> DetectIssuesResponse:
+    """
+    Find the duplicates of an upload in a dedupe index (and within the upload)
+
+    Only the index rows sharing an exact key or a block with the upload are
+    read, so the work is proportional to the upload, not to the index.
+    Issues matching an index row have ``source: "index"`` and their
+    ``duplicate_of`` is the record number in the index (rows of the
+    reference dataset, then rows of each appended upload, in order).
+
+    Blocking recall is not sampled here: it would need every index row.
+
+    Args:
+        spec: Input specification of the upload
+        name: Index name
+        append: Add the upload's distinct rows to the index afterwards
+
+    Returns:
+        DetectIssuesResponse with the duplicate issues; the summary also
+        describes the index (after the append, if any)
+
+    Raises:
+        IndexNotFoundError: If the index does not exist
+        ValueError: If the upload has none of the index key columns
+    """
+    with closing(_connect(name)) as conn:
+        meta = _read_meta(conn)
+        keys = meta["key_columns"]
+
+        present = [col for col in keys if col in read_header(spec)]
+        if not present:
+            raise ValueError(f"Upload has none of the index key columns: {', '.join(keys)}")
+
+        df = load_frame(spec, present)
+        config = {
+            **{option: meta[option] for option in INDEX_OPTIONS},
+            "dup_key_columns": keys,
+            "dup_recall_sample": 0,
+        }
+
+        upload_keys = duplicates.key_rows(df, keys)
+        upload_blocks = duplicates.block_keys(upload_keys, DedupeEngine(meta["dup_engine"]), config)
+        state = _load_state(conn, meta, upload_keys, upload_blocks)
+        reference = state["reference"]
+
+        issues = duplicates.detect(df, config=config, state=state, frame_blocks=upload_blocks)
+
+        # Rows of the index left unread still count as pairs an all-pairs scan compares
+        stats = state["stats"]
+        stats["all_pairs"] += (meta["rows"] - reference) * (len(state["rows"]) - reference)
+
+        if append:
+            # Positions and record numbers are allocated under the write lock,
+            # from the counters as they are now: other appends may have run
+            conn.execute("BEGIN IMMEDIATE")
+            meta = _read_meta(conn)
+            new_keys = list(zip(*(values[reference:] for values in state["values"])))
+            # Upload rows are numbered 0..n-1, so their number picks their blocks
+            new_rows = state["rows"][reference:]
+            records = [meta["records"] + row for row in new_rows]
+            new_blocks = [upload_blocks[row] for row in new_rows]
+            _append_rows(conn, meta, records, new_keys, new_blocks)
+            meta["records"] += len(df)
+            _write_meta(conn, meta)
+            conn.commit()
+
+    summary = calculate_summary(issues, len(df))
+    summary["duplicates"] = duplicates.summarize(state)
+    summary["index"] = _info(meta).model_dump(mode="json")
+
+    return DetectIssuesResponse(issues=issues.to_issues(), summary=summary)
+
+
+def _connect(name: str) -> sqlite3.Connection:
+    """Open an existing index"""
+    path = index_path(name)
+    if not os.path.exists(path):
+        raise IndexNotFoundError(f"Dedupe index not found: {name}")
+    return sqlite3.connect(path)
+
+
+def _read_meta(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Index metadata, with its original types"""
+    return {name: json.loads(value) for name, value in conn.execute("SELECT name, value FROM meta")}
+
+
+def _write_meta(conn: sqlite3.Connection, meta: Dict[str, Any]) -> None:
+    """Store index metadata (values JSON-encoded)"""
+    conn.executemany(
+        "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+        [(name, json.dumps(value)) for name, value in meta.items()],
+    )
+
+
+def _info(meta: Dict[str, Any]) -> DedupeIndexInfo:
+    """DedupeIndexInfo from index metadata"""
+    return DedupeIndexInfo(
+        name=meta["name"],
+        engine=meta["dup_engine"],
+        key_columns=meta["key_columns"],
+        records=meta["records"],
+        rows=meta["rows"],
+    )
+
+
+def _append_rows(
+    conn: sqlite3.Connection,
+    meta: Dict[str, Any],
+    records: List[int],
+    key_rows: List[Tuple[str, ...]],
+    blocks: Optional[List[List[tuple]]] = None,
+) -> None:
+    """
+    Store rows whose key values are not in the index yet, with their blocks
+
+    Args:
+        conn: Open index
+        meta: Index metadata (``rows`` is advanced)
+        records: Record number of each row
+        key_rows: Normalized key values of each row
+        blocks: Blocks of each row, if computed already
+    """
+    if blocks is None:
+        config = {option: meta[option] for option in INDEX_OPTIONS}
+        blocks = duplicates.block_keys(key_rows, DedupeEngine(meta["dup_engine"]), config)
+
+    # Earlier rows of the same batch count as known too
+    known = _existing_keys(conn, [json.dumps(values) for values in key_rows])
+    new_records, new_blocks = [], []
+    for record, values, row_blocks in zip(records, key_rows, blocks):
+        key = json.dumps(values)
+        if key in known:
+            continue
+        known.add(key)
+        position = meta["rows"]
+        meta["rows"] += 1
+        new_records.append((position, record, key))
+        new_blocks.extend((_block_text(block), position) for block in row_blocks)
+
+    conn.executemany("INSERT INTO records (position, record, key) VALUES (?, ?, ?)", new_records)
+    conn.executemany("INSERT INTO blocks (block, position) VALUES (?, ?)", new_blocks)
+
+
+def _existing_keys(conn: sqlite3.Connection, keys: List[str]) -> set:
+    """The keys (JSON-encoded key values) already stored"""
+    found = set()
+    for batch in _batches(sorted(set(keys))):
+        marks = ", ".join("?" * len(batch))
+        rows = conn.execute(f"SELECT key FROM records WHERE key IN ({marks})", batch)
+        found.update(key for (key,) in rows)
+    return found
+
+
+def _load_state(
+    conn: sqlite3.Connection,
+    meta: Dict[str, Any],
+    key_rows: List[Tuple[str, ...]],
+    blocks: List[List[tuple]],
+) -> Dict[str, Any]:
+    """
+    Detector state holding the index rows an upload can match
+
+    Reads the rows with the same key values as upload rows and the latest
+    ``dup_block_max_size`` rows of every block of the upload. They become
+    the leading positions of the state (in index order, so "oldest first"
+    still holds) and are marked as ``reference`` rows.
+
+    Args:
+        conn: Open index
+        meta: Index metadata
+        key_rows: Normalized key values of the upload rows
+        blocks: Blocks of the upload rows
+
+    Returns:
+        State for ``duplicates.detect``
+    """
+    block_max_size = meta["dup_block_max_size"]
+
+    # Latest members of each block (index positions)
+    members: Dict[tuple, List[int]] = {}
+    for block in {block for row_blocks in blocks for block in row_blocks}:
+        positions = conn.execute(
+            "SELECT position FROM blocks WHERE block = ? ORDER BY position DESC LIMIT ?",
+            (_block_text(block), block_max_size),
+        ).fetchall()
+        if positions:
+            members[block] = sorted(position for (position,) in positions)
+
+    # Rows to load: exact matches and block members
+    wanted = {position for positions in members.values() for position in positions}
+    loaded: Dict[int, Tuple[int, str]] = {}
+    for batch in _batches(sorted({json.dumps(values) for values in key_rows})):
+        marks = ", ".join("?" * len(batch))
+        for position, record, key in conn.execute(
+            f"SELECT position, record, key FROM records WHERE key IN ({marks})", batch
+        ):
+            loaded[position] = (record, key)
+    for batch in _batches(sorted(wanted - set(loaded))):
+        marks = ", ".join("?" * len(batch))
+        for position, record, key in conn.execute(
+            f"SELECT position, record, key FROM records WHERE position IN ({marks})", batch
+        ):
+            loaded[position] = (record, key)
+
+    # Renumber the loaded rows 0..n-1, keeping index order
+    order = sorted(loaded)
+    local = {position: number for number, position in enumerate(order)}
+    keys = meta["key_columns"]
+    stored = [json.loads(loaded[position][1]) for position in order]
+    values: List[List[str]] = [list(column) for column in zip(*stored)] or [[] for _ in keys]
+    # Stored values are normalized already, and hash like the raw upload rows
+    fingerprints = fingerprint_rows(pd.DataFrame(dict(zip(keys, values))), keys)
+
+    return {
+        "keys": keys,
+        "engine": DedupeEngine(meta["dup_engine"]),
+        "reference": len(order),
+        "rows": [loaded[position][0] for position in order],
+        "values": values,
+        "exact": {fingerprint: number for number, fingerprint in enumerate(fingerprints.tolist())},
+        "blocks": {
+            block: deque((local[position] for position in positions), maxlen=block_max_size)
+            for block, positions in members.items()
+        },
+    }
+
+
+def _block_text(block: tuple) -> str:
+    """Storable form of a block key (its repr is stable for ints, str and bytes)"""
+    return repr(block)
+
+
+def _batches(values: List[Any]) -> Iterable[List[Any]]:
+    """Split lookup values into batches of at most LOOKUP_BATCH"""
+    for start in range(0, len(values), LOOKUP_BATCH):
+        yield values[start : start + LOOKUP_BATCH]
@@ -1,13 +1,15 @@
 """Fixes service for preview and application of data quality fixes"""
 import os
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
-from app.schemas import InputSpec, FixPreview, FixResult, PreviewFixesResponse
-from app.io_utils import load_frame, save_frame
+from typing import List, Dict, Any, Tuple
+from app.schemas import IssueBatch, InputSpec, FixPreview, FixResult, PreviewFixesResponse, DedupeMode
+from app.detectors import duplicates
+from app.io_utils import load_frame, save_frame, with_compression_suffix
 from app.normalizers import phone, dates, currency, text
-from app.utils import generate_row_id, sample_rows
+from app.utils import generate_row_id, sample_rows, map_distinct
 from app.config import settings
-from app.services.issues_service import detect_issues
+from app.services.issues_service import detect_issue_batch
 
 
 def preview_fixes(spec: InputSpec) -> PreviewFixesResponse:
@@ -22,21 +24,15 @@ def preview_fixes(spec: InputSpec) -> PreviewFixesResponse:
     """
     df = load_frame(spec)
 
-    # Detect issues first
-    issues_response = detect_issues(spec)
-    issues = issues_response.issues
+    # Detect issues first (on the frame already loaded)
+    issues, _ = detect_issue_batch(spec, df)
 
-    # Generate previews
+    # Generate previews (only the cell issues that can be shown are expanded)
     previews: List[FixPreview] = []
     max_rows = settings.preview_max_rows
+    cell_issues = issues.take(issues.has_cell())
 
-    for issue in issues:
-        if len(previews) >= max_rows:
-            break
-
-        if issue.row is None or issue.col is None:
-            continue
-
+    for issue in cell_issues.to_issues(limit=max_rows):
         # Generate fix based on issue kind
         fix = generate_fix(df, issue)
         if fix:
@@ -61,25 +57,25 @@ def apply_fixes(spec: InputSpec) -> FixResult:
     """
     df = load_frame(spec)
 
-    # Detect issues
-    issues_response = detect_issues(spec)
-    issues = issues_response.issues
+    # Detect issues (on the frame already loaded)
+    issues, _ = detect_issue_batch(spec, df)
 
     # Apply fixes
     df_clean = df.copy()
     applied = 0
     rejected = 0
 
-    for issue in issues:
-        if issue.row is None or issue.col is None:
-            continue
+    # One pass per (kind, column): each distinct value is normalized once
+    for kind, col, rows in issues.cell_groups():
+        fixed = apply_column_fix(df_clean, kind, col, rows)
+        applied += fixed
+        rejected += len(rows) - fixed
 
-        # Apply fix
-        success = apply_fix(df_clean, issue)
-        if success:
-            applied += 1
-        else:
-            rejected += 1
+    # Resolve duplicate clusters, all at once
+    removed = 0
+    if spec.dedupe_mode is not None:
+        df_clean, removed = apply_dedupe(df_clean, issues, spec.dedupe_mode)
+        applied += removed
 
     # Write clean file to temp directory
     tmp_dir = os.path.join(settings.quality_tmp_dir, "clean")
@@ -92,13 +88,17 @@ def apply_fixes(spec: InputSpec) -> FixResult:
     else:
         clean_path = os.path.join(tmp_dir, f"clean_data.{spec.file_type.value}")
 
+    if spec.output_compression:
+        clean_path = with_compression_suffix(clean_path, spec.output_compression)
+
     save_frame(df_clean, clean_path, spec.file_type)
 
     summary = {
         "total_issues": len(issues),
-        "rows_affected": len(set(issue.row for issue in issues if issue.row is not None)),
+        "rows_affected": issues.affected_rows(),
         "original_rows": len(df),
         "clean_rows": len(df_clean),
+        "duplicates_removed": removed,
     }
 
     return FixResult(
@@ -159,7 +159,10 @@ def generate_fix(df: pd.DataFrame, issue) -> FixPreview | None:
         explanation = f"Generated ID: {generated_id}"
 
     elif issue.kind == IssueKind.DUPLICATE:
-        explanation = f"Duplicate of row {issue.details.get('duplicate_of')} - consider removing"
+        explanation = (
+            f"Duplicate of row {issue.details.get('duplicate_of')} - "
+            "drop or merge it with dedupe_mode"
+        )
         new_value = None
 
     else:
@@ -177,40 +180,99 @@ def generate_fix(df: pd.DataFrame, issue) -> FixPreview | None:
     )
 
 
-def apply_fix(df: pd.DataFrame, issue) -> bool:
-    """Apply a fix to the dataframe (in-place)"""
-    from app.schemas import IssueKind
+def apply_dedupe(
+    df: pd.DataFrame, issues: IssueBatch, mode: DedupeMode
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Keep one row per duplicate cluster
 
-    row_idx = issue.row
-    col = issue.col
+    Clusters come from the duplicate issues, pairwise or already clustered
+    (see ``duplicates.cluster_rows``); the survivor is the earliest row of
+    each. Every cluster is resolved by the same frame operations: with
+    ``merge`` the survivor's empty cells are first filled with the first
+    value found in the other members (a single groupby over the clustered
+    rows), then the other members are dropped.
+
+    Args:
+        df: Frame to deduplicate
+        issues: Detected issues
+        mode: Drop or merge
+
+    Returns:
+        Tuple of (deduplicated frame, number of rows removed)
+    """
+    rows, survivors = duplicates.cluster_rows(issues)
+    in_frame = rows < len(df)
+    rows, survivors = rows[in_frame], survivors[in_frame]
+    if not len(rows):
+        return df, 0
 
-    if row_idx >= len(df) or col not in df.columns:
-        return False
+    if mode == DedupeMode.MERGE:
+        # Rows are ascending, so each survivor's own values come first
+        merged = df.loc[rows].groupby(survivors, sort=False).first()
+        df.loc[merged.index, merged.columns] = merged
 
-    current_value = df.at[row_idx, col]
+    dropped = rows[rows != survivors]
+    return df.drop(index=dropped), len(dropped)
+
+
+def apply_column_fix(df: pd.DataFrame, kind, col: str, rows: np.ndarray) -> int:
+    """
+    Apply the fix for one issue kind to several cells of a column (in-place)
+
+    Normalizers run once per distinct cell value and the results are
+    written back to every row holding that value.
+
+    Args:
+        df: Frame to fix
+        kind: Issue kind found in the cells
+        col: Column of the cells
+        rows: Row numbers of the cells
+
+    Returns:
+        Number of cells fixed
+    """
+    from app.schemas import IssueKind
+
+    if col not in df.columns:
+        return 0
+    rows = rows[rows < len(df)]
+    if not len(rows):
+        return 0
+
+    current = df.loc[rows, col].astype(str)
+
+    if kind == IssueKind.PHONE_INVALID:
+        fixed = phone.normalize_series(current).to_numpy(dtype=object)
+    elif kind == IssueKind.DATE_FORMAT:
+        fixed = map_distinct(current, _safe(dates.normalize))
+    elif kind == IssueKind.CURRENCY:
+        fixed = currency.normalize_series(current).to_numpy(dtype=object)
+    elif kind == IssueKind.ID_MISSING:
+        fixed = np.array(
+            [generate_row_id(int(row), value) for row, value in zip(rows, current)], dtype=object
+        )
+    else:
+        return 0
 
-    try:
-        if issue.kind == IssueKind.PHONE_INVALID:
-            df.at[row_idx, col] = phone.normalize(str(current_value))
-            return True
+    ok = pd.notna(fixed)
+    if not ok.any():
+        return 0
 
-        elif issue.kind == IssueKind.DATE_FORMAT:
-            normalized = dates.normalize(str(current_value))
-            if normalized:
-                df.at[row_idx, col] = normalized
-                return True
+    if df[col].dtype != object:
+        # Normalized values are text
+        df[col] = df[col].astype(object)
+    df.loc[rows[ok], col] = fixed[ok]
+    return int(ok.sum())
 
-        elif issue.kind == IssueKind.CURRENCY:
-            value_numeric, code = currency.normalize(str(current_value))
-            if value_numeric is not None:
-                df.at[row_idx, col] = f"{value_numeric:.2f} {code}"
-                return True
 
-        elif issue.kind == IssueKind.ID_MISSING:
-            df.at[row_idx, col] = generate_row_id(row_idx, str(current_value))
-            return True
+def _safe(normalize):
+    """Wrap a normalizer so a failure leaves the cell unfixed (None)"""
 
-    except Exception:
-        pass
+    def wrapper(value):
+        try:
+            return normalize(value)
+        except Exception:
+            return None
 
-    return False
+    return wrapper
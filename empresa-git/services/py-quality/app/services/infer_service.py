@@ -1,10 +1,12 @@
 """Schema inference service"""
 import re
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any
 from app.schemas import InferResult, ColumnInfo, InferredType, InputSpec
 from app.io_utils import load_frame
-from app.utils import sample_values
+from app.detectors.email import valid_email_mask
+from app.utils import sample_values, fingerprint_rows
 
 
 def infer_schema(spec: InputSpec) -> InferResult:
@@ -65,6 +67,9 @@ def infer_column(df: pd.DataFrame, column: str, total_rows: int) -> ColumnInfo:
 
     # Infer type
     inferred_type, confidence = infer_type(series)
+    if inferred_type == InferredType.NUMERIC and samples:
+        # CSV values are read as text: report numbers as numbers
+        samples = pd.to_numeric(pd.Series(samples, dtype=object)).tolist()
 
     return ColumnInfo(
         name=column,
@@ -96,8 +101,7 @@ def infer_type(series: pd.Series) -> tuple[InferredType, float]:
     sample = non_null.sample(n=min(50, len(non_null)), random_state=42)
 
     # Check for email
-    email_pattern = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
-    email_matches = sum(1 for val in sample if email_pattern.match(str(val)))
+    email_matches = int(valid_email_mask(sample.astype(str)).sum())
     if email_matches / len(sample) > 0.7:
         return InferredType.EMAIL, round(email_matches / len(sample), 2)
 
@@ -160,8 +164,8 @@ def calculate_kpis(df: pd.DataFrame) -> Dict[str, Any]:
     empty_cells = df.isna().sum().sum()
     empties_pct = (empty_cells / total_cells * 100) if total_cells > 0 else 0
 
-    # Rough duplicate estimate (exact duplicates only)
-    duplicates_suspected = len(df) - len(df.drop_duplicates())
+    # Rough duplicate estimate (rows equal once values are stripped and lowercased)
+    duplicates_suspected = len(df) - len(np.unique(fingerprint_rows(df)))
 
     kpis = {
         "rows": len(df),
@@ -179,6 +183,6 @@ def calculate_kpis(df: pd.DataFrame) -> Dict[str, Any]:
                 price_zeros += (pd.to_numeric(df[col], errors="coerce") == 0).sum()
             except:
                 pass
-        kpis["price_zeros"] = price_zeros
+        kpis["price_zeros"] = int(price_zeros)
 
     return kpis
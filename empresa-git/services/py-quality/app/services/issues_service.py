@@ -1,87 +1,243 @@
 """Issues detection service"""
-from typing import List, Dict, Any
+from types import ModuleType
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 import pandas as pd
-from app.schemas import Issue, InputSpec, DetectIssuesResponse
-from app.io_utils import load_frame
-from app.detectors import email, phone_es, dates, currency, duplicates, price, id_sku, nif_cif_basic
+from app.schemas import IssueBatch, InputSpec, DetectIssuesResponse
+from app.io_utils import load_frame, iter_frames, read_header, resolve_chunk_rows
+from app.detectors import duplicates
+from app.services.routing_service import plan_routes, route_types
+from app.utils import ColumnView
+from app.config import settings
 
 
-def detect_issues(spec: InputSpec) -> DetectIssuesResponse:
+def detect_issues(spec: InputSpec, df: Optional[pd.DataFrame] = None) -> DetectIssuesResponse:
     """
     Detect all data quality issues in a dataset
 
     Args:
         spec: Input specification
+        df: Frame already loaded for spec by the caller (skips loading)
 
     Returns:
         DetectIssuesResponse with issues and summary
     """
-    df = load_frame(spec)
+    issues, summary = detect_issue_batch(spec, df)
 
-    all_issues: List[Issue] = []
+    return DetectIssuesResponse(issues=issues.to_issues(), summary=summary)
 
-    # Detect by column type (heuristically)
-    for col in df.columns:
-        col_lower = col.lower()
 
-        # Email columns
-        if "email" in col_lower or "mail" in col_lower or "correo" in col_lower:
-            all_issues.extend(email.detect(df, col))
+def detect_issue_batch(
+    spec: InputSpec, df: Optional[pd.DataFrame] = None
+) -> Tuple[IssueBatch, Dict[str, Any]]:
+    """
+    Detect all data quality issues in a dataset, in columnar form
+
+    Only the columns some detector will look at are parsed, and large
+    inputs (or any input with ``chunk_rows`` set) are streamed in bounded
+    chunks instead of being loaded whole.
 
-        # Phone columns
-        if ("phone" in col_lower or "telefono" in col_lower or "tel" in col_lower or "móvil" in col_lower or "movil" in col_lower):
-            all_issues.extend(phone_es.detect(df, col))
+    Args:
+        spec: Input specification
+        df: Frame already loaded for spec by the caller (skips loading)
+
+    Returns:
+        Tuple of (IssueBatch with every issue, summary)
+    """
+    if df is None:
+        columns = needed_columns(read_header(spec), spec)
 
-        # Date columns
-        if "fecha" in col_lower or "date" in col_lower or "born" in col_lower:
-            all_issues.extend(dates.detect(df, col))
+        chunk_rows = resolve_chunk_rows(spec)
+        if chunk_rows:
+            return detect_issues_chunked(spec, chunk_rows, columns)
 
-        # Currency columns
-        if "precio" in col_lower or "price" in col_lower or "cost" in col_lower or "amount" in col_lower:
-            # Check both currency format and zero/negative
-            all_issues.extend(currency.detect(df, col))
-            all_issues.extend(price.detect(df, col))
+        df = load_frame(spec, columns)
 
-        # ID columns
-        if "id" in col_lower or "sku" in col_lower or "code" in col_lower or "codigo" in col_lower:
-            all_issues.extend(id_sku.detect(df, col))
+    batches: List[IssueBatch] = []
 
-        # NIF/CIF columns
-        if "nif" in col_lower or "cif" in col_lower or "dni" in col_lower:
-            all_issues.extend(nif_cif_basic.detect(df, col))
+    plan = plan_routes(spec, df.columns, df)
+    for col, detectors in plan.routes.items():
+        # Preprocessed once, shared by every detector of the column
+        view = ColumnView(df[col])
+        for detector in detectors:
+            batches.append(detector.detect(df, col, view=view))
 
     # Detect duplicates (row-level)
-    all_issues.extend(duplicates.detect(df))
+    dup_state: dict = {}
+    batches.append(duplicates.detect(df, config=duplicates_config(spec), state=dup_state))
+
+    all_issues = IssueBatch.concat(batches)
+    if duplicate_clusters(spec):
+        all_issues = duplicates.cluster(all_issues)
 
     # Calculate summary
-    summary = calculate_summary(all_issues, df)
+    summary = calculate_summary(all_issues, len(df))
+    summary["duplicates"] = duplicates.summarize(dup_state)
+    summary["routing"] = plan.describe()
 
-    return DetectIssuesResponse(issues=all_issues, summary=summary)
+    return all_issues, summary
 
 
-def calculate_summary(issues: List[Issue], df: pd.DataFrame) -> Dict[str, Any]:
+def detect_issues_chunked(
+    spec: InputSpec, chunk_rows: int, columns: Optional[List[str]] = None
+) -> Tuple[IssueBatch, Dict[str, Any]]:
     """
-    Calculate summary statistics for issues
+    Detect data quality issues reading the dataset in chunks
+
+    Detectors that need a whole-column view (dominant date format, mixed
+    currencies, previously seen rows) keep their state across chunks and
+    emit their pending issues once the stream is exhausted.
 
     Args:
-        issues: List of issues
-        df: DataFrame
+        spec: Input specification
+        chunk_rows: Maximum number of rows per chunk
+        columns: Only parse these columns (see needed_columns)
 
     Returns:
-        Summary dictionary
+        Tuple of (IssueBatch with every issue, summary)
+    """
+    batches: List[IssueBatch] = []
+    states: Dict[tuple, dict] = {}
+    plan = None
+    total_rows = 0
+
+    for chunk in iter_frames(spec, chunk_rows, columns):
+        if plan is None:
+            plan = plan_routes(spec, chunk.columns, chunk)
+        total_rows += len(chunk)
+
+        for col, detectors in plan.routes.items():
+            view = ColumnView(chunk[col])
+            for detector in detectors:
+                batches.append(_detect_chunk(detector, chunk, col, states, view))
+
+        # Detect duplicates (row-level)
+        batches.append(
+            _detect_chunk(duplicates, chunk, None, states, config=duplicates_config(spec))
+        )
+
+    # Flush detectors that report once the whole column has been seen
+    for (detector, col), state in states.items():
+        batches.append(detector.finalize(col, state))
+
+    all_issues = IssueBatch.concat(batches)
+    if duplicate_clusters(spec):
+        # Clusters span chunks: built once every pair is known
+        all_issues = duplicates.cluster(all_issues)
+    summary = calculate_summary(all_issues, total_rows)
+    summary["duplicates"] = duplicates.summarize(states.get((duplicates, None), {}))
+    summary["routing"] = plan.describe() if plan is not None else {}
+
+    return all_issues, summary
+
+
+def _detect_chunk(
+    detector: ModuleType,
+    chunk: pd.DataFrame,
+    col: str,
+    states: Dict[tuple, dict],
+    view: Optional[ColumnView] = None,
+    config: Optional[dict] = None,
+) -> IssueBatch:
+    """Run a detector on one chunk, threading its state when it keeps any"""
+    if col is None:
+        # Row-level detector
+        if hasattr(detector, "finalize"):
+            return detector.detect(
+                chunk, config=config, state=states.setdefault((detector, col), {})
+            )
+        return detector.detect(chunk, config=config)
+
+    if hasattr(detector, "finalize"):
+        return detector.detect(
+            chunk, col, state=states.setdefault((detector, col), {}), view=view
+        )
+    return detector.detect(chunk, col, view=view)
+
+
+def duplicates_config(spec: Optional[InputSpec]) -> Optional[dict]:
+    """
+    Duplicate detector options requested by the input spec
+
+    Args:
+        spec: Input specification (None when the caller passed a frame only)
+
+    Returns:
+        Config overriding the settings, or None to use them as they are
+    """
+    if spec is None or spec.dup_engine is None:
+        return None
+    return {"dup_engine": spec.dup_engine}
+
+
+def duplicate_clusters(spec: Optional[InputSpec]) -> bool:
+    """
+    Whether duplicates are reported as one issue per cluster
+
+    Args:
+        spec: Input specification (None when the caller passed a frame only)
+
+    Returns:
+        spec.dup_clusters, or settings.dup_clusters when unset
     """
-    from collections import Counter
-    from app.schemas import IssueKind, Severity
+    if spec is None or spec.dup_clusters is None:
+        return settings.dup_clusters
+    return spec.dup_clusters
 
-    kind_counts = Counter(issue.kind for issue in issues)
-    severity_counts = Counter(issue.severity for issue in issues)
 
+def needed_columns(header: List[str], spec: Optional[InputSpec] = None) -> Optional[List[str]]:
+    """
+    Compute the columns detection needs from the header alone
+
+    Args:
+        header: Normalized column names of the dataset
+        spec: Input specification (declared roles, type routing)
+
+    Returns:
+        Columns to load, or None when every column is needed
+    """
+    if route_types(spec):
+        # Any column may route by the type of its values
+        return None
+
+    dup_keys = [col for col in settings.dup_key_columns_list if col in header]
+    if not dup_keys:
+        # Duplicates fall back to the first text columns, only known once loaded
+        return None
+
+    wanted = set(plan_routes(spec, header).routes) | set(dup_keys)
+    return [col for col in header if col in wanted]
+
+
+def route_columns(columns: Iterable[str]) -> Dict[str, List[ModuleType]]:
+    """
+    Decide which column detectors run on each column, by name (see routing_service)
+
+    Args:
+        columns: Normalized column names
+
+    Returns:
+        Mapping of column name to the detector modules to run on it
+    """
+    return plan_routes(None, columns).routes
+
+
+def calculate_summary(issues: IssueBatch, total_rows: int) -> Dict[str, Any]:
+    """
+    Calculate summary statistics for issues
+
+    Args:
+        issues: Detected issues
+        total_rows: Number of rows in the dataset
+
+    Returns:
+        Summary dictionary
+    """
     summary = {
         "total_issues": len(issues),
-        "by_kind": dict(kind_counts),
-        "by_severity": dict(severity_counts),
-        "affected_rows": len(set(issue.row for issue in issues if issue.row is not None)),
-        "total_rows": len(df),
+        "by_kind": issues.counts_by_kind(),
+        "by_severity": issues.counts_by_severity(),
+        "affected_rows": issues.affected_rows(),
+        "total_rows": total_rows,
     }
 
     return summary
@@ -0,0 +1,309 @@
+"""Column routing: the column detectors run on each column"""
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional
+import pandas as pd
+from app.schemas import ColumnRole, InferredType, InputSpec
+from app.detectors import email, phone_es, dates, currency, price, id_sku, nif_cif_basic
+from app.services.infer_service import infer_type
+from app.config import settings
+
+
+# Detectors run on a column of each role
+ROLE_DETECTORS: Dict[ColumnRole, List[ModuleType]] = {
+    ColumnRole.EMAIL: [email],
+    ColumnRole.PHONE: [phone_es],
+    ColumnRole.DATE: [dates],
+    # Check both currency format and zero/negative
+    ColumnRole.PRICE: [currency, price],
+    ColumnRole.ID: [id_sku],
+    ColumnRole.NIF: [nif_cif_basic],
+    ColumnRole.NONE: [],
+}
+
+# Words of a column name giving it a role (lowercase, accents removed)
+ROLE_WORDS: Dict[ColumnRole, frozenset] = {
+    ColumnRole.EMAIL: frozenset({"email", "mail", "correo"}),
+    ColumnRole.PHONE: frozenset({"phone", "telefono", "tel", "telf", "tlf", "movil"}),
+    ColumnRole.DATE: frozenset(
+        {
+            "fecha", "date", "datetime", "birthdate", "dateofbirth", "born", "nac",
+            "created", "updated",
+        }
+    ),
+    ColumnRole.PRICE: frozenset({"precio", "price", "cost", "coste", "costo", "amount"}),
+    ColumnRole.ID: frozenset({"id", "sku", "code", "codigo"}),
+    ColumnRole.NIF: frozenset({"nif", "cif", "dni"}),
+}
+
+# Role words also match at the start or end of a longer word (``idcliente``,
+# ``unitprice``) when the rest of it is at least this long; role words
+# shorter than the second limit must also meet a consonant there, as they
+# often begin or end unrelated words (``idioma``, ``costumbre``, ``candidate``)
+AFFIX_MIN_REST = 4
+AFFIX_ANY_LETTER_LEN = 5
+VOWELS = frozenset("aeiouy")
+
+# Date words also take a shorter rest, at any letter (``enddate``,
+# ``duedate``, ``fechanac``): a three-letter rest qualifies the date
+SHORT_AFFIX_WORDS = frozenset({"date", "fecha"})
+AFFIX_SHORT_REST = 3
+
+# Words spelling a role word but meaning something else; a name with two
+# words joining into one (``cost_center``) is read as the joined word
+NON_ROLE_WORDS = frozenset(
+    {"costcenter", "centrocoste", "hybrid", "headphone", "earphone", "microphone", "mandate"}
+)
+
+# Inferred types trusted for routing: the ones read from the values, not the name
+TYPE_ROLES: Dict[InferredType, ColumnRole] = {
+    InferredType.EMAIL: ColumnRole.EMAIL,
+    InferredType.PHONE: ColumnRole.PHONE,
+    InferredType.PHONE_ES: ColumnRole.PHONE,
+    InferredType.CURRENCY: ColumnRole.PRICE,
+}
+
+
+class RoutingPlan:
+    """
+    Column detectors to run on each column, and why
+
+    Attributes:
+        routes: Detector modules of each routed column, in column order
+        sources: How each routed column was routed: ``role`` (declared),
+            ``name`` (words of its name) or ``type`` (inferred from values)
+    """
+
+    def __init__(self, routes: Dict[str, List[ModuleType]], sources: Dict[str, str]):
+        self.routes = routes
+        self.sources = sources
+
+    def describe(self) -> Dict[str, Dict[str, Any]]:
+        """
+        JSON-ready form of the plan, for the issue summary
+
+        Returns:
+            Per routed column, its detector names and routing source
+        """
+        return {
+            col: {
+                "detectors": [detector.__name__.rsplit(".", 1)[-1] for detector in detectors],
+                "source": self.sources[col],
+            }
+            for col, detectors in self.routes.items()
+        }
+
+
+class RoutingPlanner:
+    """
+    Bounded LRU of compiled routing plans
+
+    Plans are keyed by header signature: the column names, the declared
+    roles and whether inferred types are used. Types are inferred on the
+    first dataset compiled for a signature, and reused for later datasets
+    with the same header.
+    """
+
+    def __init__(self, max_plans: int):
+        self.max_plans = max_plans
+        self._plans: "OrderedDict[tuple, RoutingPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def plan(
+        self,
+        columns: Iterable[str],
+        roles: Optional[Dict[str, ColumnRole]] = None,
+        sample: Optional[pd.DataFrame] = None,
+    ) -> RoutingPlan:
+        """
+        Return the plan for a header, compiling it on first use
+
+        Args:
+            columns: Normalized column names
+            roles: Declared roles, by column
+            sample: Rows to infer the type of columns the name does not
+                route (None to route by name only)
+
+        Returns:
+            RoutingPlan
+        """
+        columns = list(columns)
+        key = (tuple(columns), tuple(sorted((roles or {}).items())), sample is not None)
+
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+
+        plan = compile_plan(columns, roles, sample)
+
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        """Drop every compiled plan"""
+        with self._lock:
+            self._plans.clear()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+# Process-wide planner instance
+routing_planner = RoutingPlanner(settings.route_plan_cache_size)
+
+
+def plan_routes(
+    spec: Optional[InputSpec], columns: Iterable[str], df: Optional[pd.DataFrame] = None
+) -> RoutingPlan:
+    """
+    Routing plan for a dataset, with the roles and type routing of its spec
+
+    Args:
+        spec: Input specification (None routes by name only)
+        columns: Normalized column names
+        df: Loaded rows (or first chunk), used when routing by type
+
+    Returns:
+        RoutingPlan
+    """
+    roles = None
+    if spec is not None and spec.column_roles:
+        # Declared like the raw header; matched against normalized names
+        roles = {name.strip().lower(): role for name, role in spec.column_roles.items()}
+    sample = df if df is not None and route_types(spec) else None
+    return routing_planner.plan(columns, roles, sample)
+
+
+def route_types(spec: Optional[InputSpec]) -> bool:
+    """
+    Whether columns are also routed by inferred type
+
+    Args:
+        spec: Input specification (None when the caller passed a frame only)
+
+    Returns:
+        spec.route_types, or settings.route_types when unset
+    """
+    if spec is None or spec.route_types is None:
+        return settings.route_types
+    return spec.route_types
+
+
+def compile_plan(
+    columns: List[str],
+    roles: Optional[Dict[str, ColumnRole]] = None,
+    sample: Optional[pd.DataFrame] = None,
+) -> RoutingPlan:
+    """
+    Decide which column detectors run on each column
+
+    A declared role wins; otherwise the column gets the role of every word
+    of its name found in ``ROLE_WORDS`` (see ``name_roles``: ``hotel``,
+    ``idioma`` or ``costa`` route nowhere); otherwise, with a sample, the
+    role of its inferred type (see ``TYPE_ROLES``).
+
+    Args:
+        columns: Normalized column names
+        roles: Declared roles, by column
+        sample: Rows to infer types from (None to skip)
+
+    Returns:
+        RoutingPlan
+    """
+    routes: Dict[str, List[ModuleType]] = {}
+    sources: Dict[str, str] = {}
+
+    for col in columns:
+        if roles and col in roles:
+            col_roles, source = [roles[col]], "role"
+        else:
+            col_roles, source = name_roles(col), "name"
+            if not col_roles and sample is not None and col in sample.columns:
+                inferred, _ = infer_type(sample[col])
+                col_roles = [TYPE_ROLES[inferred]] if inferred in TYPE_ROLES else []
+                source = "type"
+
+        detectors = [detector for role in col_roles for detector in ROLE_DETECTORS[role]]
+        if detectors:
+            routes[col] = detectors
+            sources[col] = source
+
+    return RoutingPlan(routes, sources)
+
+
+def name_roles(name: str) -> List[ColumnRole]:
+    """
+    Roles given by the words of a column name
+
+    Names are lowercased without accents and split on anything but
+    letters; plural words count as their singular (``emails``,
+    ``fechas``). A role word matches a whole word, or the start or end of
+    one when the rest is long enough (see ``AFFIX_MIN_REST``), so
+    ``customerid``, ``unitprice`` and ``idcliente`` route but ``hotel``
+    does not. Words in ``NON_ROLE_WORDS`` (``hybrid``, ``headphones``)
+    route nowhere.
+
+    Args:
+        name: Column name
+
+    Returns:
+        Roles found, in ``ROLE_WORDS`` order
+    """
+    words = set()
+    for word in name_words(name):
+        forms = word_forms(word)
+        if not forms & NON_ROLE_WORDS:
+            words |= forms
+
+    return [
+        role
+        for role, role_words in ROLE_WORDS.items()
+        if words & role_words
+        or any(affix_match(word, role_word) for word in words for role_word in role_words)
+    ]
+
+
+def affix_match(word: str, role_word: str) -> bool:
+    """Whether a role word starts or ends a longer word (see ``AFFIX_MIN_REST``)"""
+    rest = len(word) - len(role_word)
+    short = role_word in SHORT_AFFIX_WORDS and rest == AFFIX_SHORT_REST
+    if rest < AFFIX_MIN_REST and not short:
+        return False
+    if word.startswith(role_word):
+        next_letter = word[len(role_word)]
+    elif word.endswith(role_word):
+        next_letter = word[-len(role_word) - 1]
+    else:
+        return False
+    return short or len(role_word) >= AFFIX_ANY_LETTER_LEN or next_letter not in VOWELS
+
+
+def word_forms(word: str) -> set:
+    """A word and its singular forms (``fechas`` -> ``fecha``, ``fech``)"""
+    forms = {word}
+    if word.endswith("s"):
+        forms.add(word[:-1])
+    if word.endswith("es"):
+        forms.add(word[:-2])
+    return forms
+
+
+def name_words(name: str) -> List[str]:
+    """Lowercase, accent-free words of a column name (see ``NON_ROLE_WORDS``)"""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    words: List[str] = []
+    for word in re.findall(r"[a-z]+", text.lower()):
+        if words and word_forms(words[-1] + word) & NON_ROLE_WORDS:
+            words[-1] += word
+        else:
+            words.append(word)
+    return words
@@ -1,14 +1,36 @@
 """Utils package exports"""
-from .hashing import hash_string, hash_row, hash_value
+from .hashing import (
+    hash_string,
+    hash_row,
+    hash_value,
+    normalize_keys,
+    fingerprint_rows,
+    normalized_fingerprints,
+)
 from .idgen import generate_id, generate_row_id
 from .sampling import sample_values, sample_rows
+from .distinct import DistinctValues, distinct_values, map_distinct, object_array
+from .column_view import ColumnView, column_view
+from .minhash import MinHasher
+from .clusters import connected_components
 
 __all__ = [
     "hash_string",
     "hash_row",
     "hash_value",
+    "normalize_keys",
+    "fingerprint_rows",
+    "normalized_fingerprints",
     "generate_id",
     "generate_row_id",
     "sample_values",
     "sample_rows",
+    "DistinctValues",
+    "distinct_values",
+    "map_distinct",
+    "object_array",
+    "ColumnView",
+    "column_view",
+    "MinHasher",
+    "connected_components",
 ]
@@ -0,0 +1,41 @@
+"""Connected components of a graph of row pairs (vectorized union-find)"""
+from typing import Tuple
+import numpy as np
+
+
+def connected_components(left: np.ndarray, right: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group nodes linked by edges, directly or transitively
+
+    Union-find over whole arrays: every round hooks the larger root of each
+    edge under the smaller one, then compresses paths by pointer jumping
+    until every node points at its root. Roots are always the smallest node
+    of their component, so for row numbers the label is the earliest row.
+
+    Args:
+        left: First node of each edge
+        right: Second node of each edge
+
+    Returns:
+        Tuple of (distinct nodes in ascending order, label of each node)
+    """
+    nodes, codes = np.unique(np.concatenate([left, right]), return_inverse=True)
+    first, second = codes[: len(left)], codes[len(left) :]
+    parent = np.arange(len(nodes))
+
+    while True:
+        low = np.minimum(parent[first], parent[second])
+        high = np.maximum(parent[first], parent[second])
+        linked = low != high
+        if not linked.any():
+            break
+        # Union: several edges may hook one root, the smallest wins
+        np.minimum.at(parent, high[linked], low[linked])
+        # Find with path compression, for every node at once
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    return nodes, nodes[parent]
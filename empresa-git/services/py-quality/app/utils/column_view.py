@@ -0,0 +1,79 @@
+"""Per-column preprocessing shared by the detectors of a column"""
+from functools import cached_property
+import numpy as np
+import pandas as pd
+from .distinct import DistinctValues, distinct_values
+
+
+class ColumnView:
+    """
+    Lazily computed, cached forms of one column
+
+    Several detectors can run on the same column (``precio`` goes through
+    currency and price checks); each form is computed the first time a
+    detector asks for it and reused by the others. Stripped text keeps the
+    row labels of the column, so it can be passed as issue rows directly.
+
+    Attributes:
+        series: The raw column
+    """
+
+    def __init__(self, series: pd.Series):
+        self.series = series
+
+    @cached_property
+    def null(self) -> np.ndarray:
+        """Boolean mask of the null cells"""
+        return self.series.isna().to_numpy()
+
+    @cached_property
+    def text(self) -> pd.Series:
+        """Non-null values as stripped strings (blank strings included)"""
+        return self.series[~self.null].astype(str).str.strip()
+
+    @cached_property
+    def blank(self) -> np.ndarray:
+        """Boolean mask of the null or blank cells"""
+        blank = self.null.copy()
+        blank[~self.null] = (self.text == "").to_numpy()
+        return blank
+
+    @cached_property
+    def values(self) -> pd.Series:
+        """Non-blank values as stripped strings"""
+        return self.text[self.text != ""]
+
+    @cached_property
+    def upper(self) -> pd.Series:
+        """Non-blank stripped values, uppercased"""
+        return self.values.str.upper()
+
+    @cached_property
+    def lower(self) -> pd.Series:
+        """Non-blank stripped values, lowercased"""
+        return self.values.str.lower()
+
+    @cached_property
+    def numeric(self) -> pd.Series:
+        """Values as numbers (NaN where they do not parse)"""
+        return pd.to_numeric(self.series, errors="coerce")
+
+    @cached_property
+    def distinct(self) -> DistinctValues:
+        """Distinct non-blank stripped values (see ``distinct_values``)"""
+        return distinct_values(self.series)
+
+
+def column_view(df: pd.DataFrame, column: str, view: ColumnView = None) -> ColumnView:
+    """
+    View of a column, reusing the one a caller already built
+
+    Args:
+        df: DataFrame holding the column
+        column: Column name
+        view: View built by the caller, if any
+
+    Returns:
+        ColumnView of the column
+    """
+    return view if view is not None else ColumnView(df[column])
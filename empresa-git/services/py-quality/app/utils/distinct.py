@@ -0,0 +1,142 @@
+"""Distinct-value evaluation: check each distinct value of a column once"""
+from typing import Any, Callable, Iterable, List, Tuple
+import numpy as np
+import pandas as pd
+
+
+class DistinctValues:
+    """
+    A column factorized into its distinct non-blank values
+
+    Values are converted with ``str(value).strip()``, the same way the
+    detectors read cells, so raw values that only differ in surrounding
+    whitespace share one entry. Null and blank cells get code -1.
+
+    Attributes:
+        codes: Position of each row's value in ``values`` (-1 when blank)
+        values: Distinct stripped values, in order of first appearance
+        index: Row labels of the column
+    """
+
+    def __init__(self, codes: np.ndarray, values: List[str], index: pd.Index):
+        self.codes = codes
+        self.values = values
+        self.index = index
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def map(self, func: Callable[[str], Any]) -> List[Any]:
+        """
+        Evaluate func once per distinct value
+
+        Args:
+            func: Function of the stripped value
+
+        Returns:
+            Results, aligned with ``values``
+        """
+        return [func(value) for value in self.values]
+
+    def row_mask(self, value_mask: np.ndarray) -> np.ndarray:
+        """
+        Broadcast a per-value boolean mask to rows (blank rows are False)
+
+        Args:
+            value_mask: Boolean array aligned with ``values``
+
+        Returns:
+            Boolean array aligned with the rows
+        """
+        lookup = np.append(np.asarray(value_mask, dtype=bool), False)
+        # Code -1 (blank) picks the trailing False
+        return lookup[self.codes]
+
+    def select(self, value_mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the rows whose value passes a per-value mask
+
+        Args:
+            value_mask: Boolean array aligned with ``values``
+
+        Returns:
+            Tuple of (row labels, value codes) of the matching rows, in row order
+        """
+        positions = np.flatnonzero(self.row_mask(value_mask))
+        return np.asarray(self.index[positions]), self.codes[positions]
+
+    def take(self, results: List[Any], codes: np.ndarray) -> np.ndarray:
+        """
+        Broadcast per-value results to the rows with the given codes
+
+        Args:
+            results: Values aligned with ``values`` (e.g. from ``map``)
+            codes: Value codes of the rows (e.g. from ``select``)
+
+        Returns:
+            Object array with one result per row
+        """
+        return object_array(results)[codes]
+
+
+def map_distinct(series: pd.Series, func: Callable[[Any], Any]) -> np.ndarray:
+    """
+    Apply func to a column, calling it once per distinct value
+
+    Unlike ``distinct_values`` values are passed as they are (nulls
+    included), so the result matches ``series.map(func)``.
+
+    Args:
+        series: Column to map
+        func: Function of one value
+
+    Returns:
+        Object array with one result per row
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return object_array([func(value) for value in uniques])[codes]
+
+
+def distinct_values(series: pd.Series) -> DistinctValues:
+    """
+    Factorize a column into its distinct non-blank stripped values
+
+    Args:
+        series: Column to factorize
+
+    Returns:
+        DistinctValues for the column
+    """
+    raw_codes, raw_uniques = pd.factorize(series, use_na_sentinel=True)
+
+    # Raw values that strip to the same text share a code; blanks become -1
+    stripped = [str(value).strip() for value in raw_uniques]
+    stripped_codes, values = pd.factorize(np.asarray(stripped + [""], dtype=object))
+    blank = stripped_codes[-1]
+    stripped_codes = np.where(stripped_codes == blank, -1, stripped_codes)
+    stripped_codes[stripped_codes > blank] -= 1
+    values = [value for value in values if value != ""]
+
+    lookup = np.append(stripped_codes[:-1], -1)
+    # Null rows (raw code -1) pick the trailing -1
+    return DistinctValues(lookup[raw_codes], values, series.index)
+
+
+def object_array(values: Iterable[Any]) -> np.ndarray:
+    """
+    1-D object array of values
+
+    Tuples and other sequences stay single elements, where ``np.array``
+    would read equal-length ones as a second dimension.
+
+    Args:
+        values: Values (list, iterable, Series or 1-D array)
+
+    Returns:
+        Object array with one element per value
+    """
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    if isinstance(values, np.ndarray):
+        return values.astype(object)
+    return np.fromiter(values, dtype=object)
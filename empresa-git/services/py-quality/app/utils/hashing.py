@@ -1,6 +1,13 @@
 """Hashing utilities for deduplication"""
 import hashlib
-from typing import Any
+from typing import Any, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+# Row fingerprints: start value and odd multiplier mixing the hash of each column in
+FINGERPRINT_SEED = np.uint64(0x345678)
+FINGERPRINT_MULTIPLIER = np.uint64(1000003)
 
 
 def hash_string(s: str, length: int = 8) -> str:
@@ -21,6 +28,8 @@ def hash_row(row_dict: dict[str, Any], keys: list[str]) -> str:
     """
     Generate a hash from specific keys in a row
 
+    To hash many rows use ``fingerprint_rows``, which works on whole columns.
+
     Args:
         row_dict: Dictionary representing a row
         keys: Keys to include in hash
@@ -52,3 +61,91 @@ def hash_value(value: Any) -> str:
     """
     val_str = str(value) if value is not None else ""
     return hash_string(val_str)
+
+
+def normalize_keys(df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """
+    Key columns normalized as ``hash_row`` does, whole columns at a time
+
+    Args:
+        df: DataFrame holding the rows
+        keys: Key columns (missing ones count as empty)
+
+    Returns:
+        DataFrame of stripped, lowercased strings ("" for nulls), one
+        column per key, with a fresh RangeIndex
+    """
+    columns = {}
+    for key in keys:
+        codes, text = _normalized_distinct(df, key)
+        columns[key] = text[codes]
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(df)))
+
+
+def fingerprint_rows(df: pd.DataFrame, keys: Optional[List[str]] = None) -> np.ndarray:
+    """
+    64-bit fingerprint of the normalized key values of every row
+
+    Rows share a fingerprint when their values are equal once normalized
+    (see ``normalize_keys``). Each column is factorized and only its
+    distinct values are normalized and hashed (``pd.util.hash_array``,
+    stable across processes); the per-column hashes of each row are then
+    combined. Normalizing is idempotent, so normalized keys hash like the
+    raw rows they came from. Different rows collide with probability about
+    n² / 2**65, negligible for exact-match counting and lookups.
+
+    Args:
+        df: DataFrame holding the rows
+        keys: Key columns (default: every column; missing ones count as empty)
+
+    Returns:
+        uint64 array with one fingerprint per row
+    """
+    keys = list(df.columns) if keys is None else keys
+    fingerprints = np.full(len(df), FINGERPRINT_SEED, dtype=np.uint64)
+    for key in keys:
+        fingerprints = _mix_column(fingerprints, *_normalized_distinct(df, key))
+    return fingerprints
+
+
+def normalized_fingerprints(df: pd.DataFrame, keys: List[str]) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    ``normalize_keys`` and ``fingerprint_rows`` in a single pass
+
+    Each key column is factorized and normalized once, for both results.
+
+    Args:
+        df: DataFrame holding the rows
+        keys: Key columns (missing ones count as empty)
+
+    Returns:
+        Tuple of (normalized key columns, uint64 fingerprint of each row)
+    """
+    columns = {}
+    fingerprints = np.full(len(df), FINGERPRINT_SEED, dtype=np.uint64)
+    for key in keys:
+        codes, text = _normalized_distinct(df, key)
+        columns[key] = text[codes]
+        fingerprints = _mix_column(fingerprints, codes, text)
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(df))), fingerprints
+
+
+def _mix_column(fingerprints: np.ndarray, codes: np.ndarray, text: np.ndarray) -> np.ndarray:
+    """Mix the hash of a normalized key column into the row fingerprints"""
+    # Order-dependent mix, so equal values in swapped columns differ
+    return (fingerprints ^ pd.util.hash_array(text)[codes]) * FINGERPRINT_MULTIPLIER
+
+
+def _normalized_distinct(df: pd.DataFrame, key: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Factorize a key column and normalize each distinct value once
+
+    Returns:
+        Tuple of (code of each row, normalized distinct values followed by
+        "" for nulls, which code -1 picks)
+    """
+    if key not in df.columns:
+        return np.full(len(df), -1, dtype=np.int64), np.array([""], dtype=object)
+    codes, uniques = pd.factorize(df[key], use_na_sentinel=True)
+    text = pd.Index(uniques, dtype=object).astype(str).str.strip().str.lower()
+    return codes, np.append(text.to_numpy(dtype=object), "")
@@ -0,0 +1,108 @@
+"""MinHash signatures and LSH band keys for near-duplicate search"""
+import zlib
+from typing import List, Sequence, Set
+import numpy as np
+
+
+# Modulus of the universal hash functions (a * x + b) mod p
+HASH_PRIME = (1 << 31) - 1
+
+# Fixed seed: signatures must be comparable across chunks and requests
+MINHASH_SEED = 42
+
+
+class MinHasher:
+    """
+    MinHash signatures of rows over the character shingles of their values
+
+    Rows whose shingle sets have Jaccard similarity ``s`` share one of the
+    ``bands`` band keys with probability ``1 - (1 - s ** rows) ** bands``,
+    so bucketing rows by band key finds near-duplicates without comparing
+    all pairs. Shingles are hashed with CRC32, which (unlike ``hash``) is
+    stable across processes.
+
+    Attributes:
+        bands: Number of LSH bands
+        rows: Signature values per band
+        shingle_size: Characters per shingle
+    """
+
+    def __init__(self, bands: int, rows: int, shingle_size: int = 3):
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(MINHASH_SEED)
+        self._a = rng.integers(1, HASH_PRIME, bands * rows, dtype=np.uint64)
+        self._b = rng.integers(0, HASH_PRIME, bands * rows, dtype=np.uint64)
+
+    def shingles(self, values: Sequence[str]) -> Set[int]:
+        """
+        Hashed shingles of a row (empty values add none)
+
+        Args:
+            values: Normalized key values of the row
+
+        Returns:
+            Set of shingle hashes, tagged with the position of their value
+        """
+        size = self.shingle_size
+        hashes = set()
+        for position, value in enumerate(values):
+            if not value:
+                continue
+            # Shingles of the UTF-8 bytes, their CRC chained to the value position's
+            data = value.encode()
+            tag = zlib.crc32(b"%d" % position)
+            grams = {data[i : i + size] for i in range(len(data) - size + 1)} or {data}
+            hashes.update(zlib.crc32(gram, tag) for gram in grams)
+        return hashes
+
+    def signatures(self, rows: List[Sequence[str]]) -> np.ndarray:
+        """
+        MinHash signature of each row, computed for all rows at once
+
+        Args:
+            rows: Normalized key values of each row
+
+        Returns:
+            Array of shape (len(rows), bands * rows); rows without shingles
+            are filled with HASH_PRIME, which no real signature value reaches
+        """
+        shingle_sets = [self.shingles(values) for values in rows]
+        counts = np.fromiter((len(hashes) for hashes in shingle_sets), dtype=np.int64, count=len(rows))
+        signatures = np.full((len(rows), len(self._a)), HASH_PRIME, dtype=np.uint64)
+
+        filled = counts > 0
+        if filled.any():
+            flat = np.fromiter(
+                (value for hashes in shingle_sets for value in hashes),
+                dtype=np.uint64,
+                count=int(counts.sum()),
+            )
+            # One universal hash per signature value: (a * x + b) mod p, min per row
+            permuted = (flat[:, None] % HASH_PRIME * self._a + self._b) % HASH_PRIME
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[filled]
+            signatures[filled] = np.minimum.reduceat(permuted, starts, axis=0)
+
+        return signatures
+
+    def band_keys(self, rows: List[Sequence[str]]) -> List[List[tuple]]:
+        """
+        LSH band keys of each row (none for rows without shingles)
+
+        Args:
+            rows: Normalized key values of each row
+
+        Returns:
+            Per row, one ``(band, signature bytes)`` key per band
+        """
+        signatures = self.signatures(rows)
+        keys = []
+        for signature in signatures:
+            if signature[0] == HASH_PRIME:
+                keys.append([])
+                continue
+            bands = signature.reshape(self.bands, self.rows)
+            keys.append([(band, values.tobytes()) for band, values in enumerate(bands)])
+        return keys
@@ -3,6 +3,15 @@ import pytest
 import pandas as pd
 import os
 import tempfile
+from app.io_utils import dataset_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_dataset_cache():
+    """Start every test with an empty parsed-dataset cache"""
+    dataset_cache.clear()
+    yield
+    dataset_cache.clear()
 
 
 @pytest.fixture
@@ -1,6 +1,7 @@
 """Test apply fixes integration"""
 import pytest
 import os
+import pandas as pd
 from httpx import AsyncClient
 from app.main import app
 from app.schemas import FileType
@@ -44,3 +45,34 @@ async def test_apply_fixes_endpoint(sample_csv_dirty):
     # Cleanup
     if clean_path and os.path.exists(clean_path):
         os.unlink(clean_path)
+
+
+@pytest.mark.asyncio
+async def test_apply_fixes_dedupe_modes(tmp_path):
+    """drop keeps the earliest row of each cluster; merge also fills its empty cells"""
+    path = tmp_path / "clientes.csv"
+    pd.DataFrame(
+        {
+            "nombre": ["Juan Pérez", "Ana López", "juan perez", "Juan Peres"],
+            "email": ["juan@x.com", "ana@y.es", "juan@x.com", "juan@x.com"],
+            "ciudad": [None, "Sevilla", None, "Madrid"],
+        }
+    ).to_csv(path, index=False)
+
+    results = {}
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        for mode in ("drop", "merge"):
+            response = await client.post(
+                "/apply_fixes",
+                json={"file_path": str(path), "file_type": "csv", "dedupe_mode": mode},
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert data["summary"]["duplicates_removed"] == 2
+            assert data["summary"]["clean_rows"] == 2
+            results[mode] = pd.read_csv(data["file_clean_path"])
+            os.unlink(data["file_clean_path"])
+
+    assert results["drop"]["nombre"].tolist() == ["Juan Pérez", "Ana López"]
+    assert results["drop"]["ciudad"].isna().tolist() == [True, False]
+    assert results["merge"]["ciudad"].tolist() == ["Madrid", "Sevilla"]
@@ -0,0 +1,42 @@
+"""Test the per-column view shared by detectors"""
+import numpy as np
+import pandas as pd
+from app.detectors import currency, id_sku, price
+from app.services import issues_service
+from app.utils import ColumnView
+
+
+def test_column_view_forms():
+    """Null, blank, stripped and cased forms keep the row labels"""
+    view = ColumnView(pd.Series([" Ab ", None, "  ", "cD", 3]))
+
+    assert view.null.tolist() == [False, True, False, False, False]
+    assert view.blank.tolist() == [False, True, True, False, False]
+    assert view.values.to_dict() == {0: "Ab", 3: "cD", 4: "3"}
+    assert view.upper.tolist() == ["AB", "CD", "3"]
+    assert view.lower.tolist() == ["ab", "cd", "3"]
+    assert np.isnan(view.numeric[0]) and view.numeric[4] == 3
+    assert view.distinct.values == ["Ab", "cD", "3"]
+    # Cached: computed once, then reused
+    assert view.values is view.values
+
+
+def test_detectors_share_one_view(monkeypatch):
+    """Each routed column gets one view, passed to all of its detectors"""
+    views = []
+
+    class CountingView(ColumnView):
+        def __init__(self, series):
+            views.append(series.name)
+            super().__init__(series)
+
+    monkeypatch.setattr(issues_service, "ColumnView", CountingView)
+    df = pd.DataFrame({"precio_cost_id": ["10 €", "0", "", "-2 $"]})
+
+    issues, _ = issues_service.detect_issue_batch(None, df)
+
+    assert views == ["precio_cost_id"]
+    expected = [
+        detector.detect(df, "precio_cost_id") for detector in (currency, price, id_sku)
+    ]
+    assert len(issues) == sum(len(batch) for batch in expected)
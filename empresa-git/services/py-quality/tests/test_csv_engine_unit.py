@@ -0,0 +1,102 @@
+"""Test the pyarrow CSV engine against the default C parser"""
+import base64
+import gzip
+import pandas as pd
+import pytest
+from app import io_utils
+from app.io_utils import load_frame
+from app.schemas import InputSpec, FileType, CsvEngine
+
+
+CSV_TEXT = (
+    "ID;Nombre;Email;Fecha;Activo;Precio;Vacia;Notas\n"
+    "1;Juan;juan@example.com;2024-01-15;true;10,5;;x\n"
+    ";María;maria@;2024-01-16;False;0;;NA\n"
+    "3;José;;2024-01-17;TRUE;-5;;\n"
+)
+
+
+def _specs(path, **options):
+    return (
+        InputSpec(file_path=path, file_type=FileType.CSV, csv_engine=CsvEngine.C, **options),
+        InputSpec(file_path=path, file_type=FileType.CSV, csv_engine=CsvEngine.PYARROW, **options),
+    )
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"header": False}, {"columns": ["email", "fecha"]}, {"encoding": "latin-1"}],
+)
+def test_pyarrow_matches_c_parser(tmp_path, options):
+    path = tmp_path / "data.csv"
+    path.write_bytes(CSV_TEXT.encode(options.get("encoding", "utf-8")))
+
+    c_spec, arrow_spec = _specs(str(path), delimiter=";", **options)
+
+    # Call the engine directly so a silent fallback cannot hide a mismatch
+    df = io_utils._read_csv_pyarrow(arrow_spec, io_utils._column_filter(arrow_spec))
+
+    assert df is not None
+    pd.testing.assert_frame_equal(
+        io_utils._normalize_columns(df, arrow_spec),
+        io_utils._read_frame(c_spec, c_spec.columns),
+    )
+
+
+def test_pyarrow_reads_gzip_base64(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV_TEXT)
+    payload = base64.b64encode(gzip.compress(path.read_bytes())).decode()
+
+    c_spec, arrow_spec = (
+        InputSpec(content_b64=payload, file_type=FileType.CSV, delimiter=";", csv_engine=engine)
+        for engine in (CsvEngine.C, CsvEngine.PYARROW)
+    )
+
+    df = io_utils._read_csv_pyarrow(arrow_spec, None)
+
+    assert df is not None
+    pd.testing.assert_frame_equal(io_utils._normalize_columns(df, arrow_spec), load_frame(c_spec))
+
+
+def test_type_change_after_first_block(tmp_path, monkeypatch):
+    """A value that breaks the type inferred from the first block still matches pandas"""
+    path = tmp_path / "data.csv"
+    path.write_text("id,codigo\n" + "".join(f"{i},{i}\n" for i in range(5000)) + "5000,ABC\n")
+
+    c_spec, arrow_spec = _specs(str(path))
+    monkeypatch.setattr(
+        io_utils.pa_csv, "ReadOptions", _small_blocks(io_utils.pa_csv.ReadOptions)
+    )
+
+    df = io_utils._read_frame(arrow_spec)
+
+    pd.testing.assert_frame_equal(df, io_utils._read_frame(c_spec))
+    assert df["codigo"].iloc[-1] == "ABC"
+
+
+def test_values_stay_text(sample_csv_dirty):
+    """Both engines keep "+34..." phones and prices as written, never as numbers"""
+    c_spec, arrow_spec = _specs(sample_csv_dirty)
+
+    df = io_utils._read_csv_pyarrow(arrow_spec, None)
+
+    assert df is not None
+    pd.testing.assert_frame_equal(df, load_frame(c_spec))
+    assert df["telefono"].tolist()[:2] == ["600123456", "+34655987654"]
+
+
+def test_auto_engine_uses_size_threshold(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV_TEXT)
+    spec = InputSpec(file_path=str(path), file_type=FileType.CSV)
+
+    monkeypatch.setattr(io_utils.settings, "pyarrow_csv_min_mb", 1)
+    assert io_utils._use_pyarrow_csv(spec) is False
+
+    monkeypatch.setattr(io_utils.settings, "pyarrow_csv_min_mb", 0)
+    assert io_utils._use_pyarrow_csv(spec) is True
+
+
+def _small_blocks(read_options):
+    return lambda **kwargs: read_options(block_size=1024, **kwargs)
@@ -0,0 +1,32 @@
+"""Test the shared vectorized currency parser"""
+import numpy as np
+import pandas as pd
+from app.detectors import currency as currency_detector
+from app.normalizers import currency
+
+
+def test_parse_series_single_pass():
+    """Amounts, codes and parse flags for a whole column"""
+    values = pd.Series(["€1.234,56", "1234.56 eur", "$5", "10,5", "£3", "abc", "12 EUR €"])
+
+    amounts, codes, ok = currency.parse_series(values)
+
+    assert ok.tolist() == [True, True, True, True, True, False, True]
+    np.testing.assert_allclose(amounts[ok], [1234.56, 1234.56, 5.0, 10.5, 3.0, 12.0])
+    assert codes.tolist() == ["EUR", "EUR", "USD", None, "GBP", None, "EUR"]
+    assert currency.normalize_series(values).tolist() == [
+        "1234.56 EUR", "1234.56 EUR", "5.00 USD", "10.50 EUR", "3.00 GBP", None, "12.00 EUR",
+    ]
+
+
+def test_detector_uses_normalizer_rules():
+    """European amounts parse; a symbol and its code are the same currency"""
+    df = pd.DataFrame({"precio": ["€1.234,56", "10 EUR", "n/d", None]})
+
+    issues = currency_detector.detect(df, "precio").to_issues()
+
+    assert [(i.row, i.details["value"]) for i in issues] == [(2, "n/d")]
+
+    mixed = currency_detector.detect(pd.DataFrame({"precio": ["€5", "$5"]}), "precio").to_issues()
+    assert mixed[0].row is None
+    assert mixed[0].details["currencies"] == ["EUR", "USD"]
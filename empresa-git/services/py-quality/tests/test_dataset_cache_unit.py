@@ -0,0 +1,89 @@
+"""Test the parsed dataset cache"""
+import base64
+import os
+import pandas as pd
+import pytest
+from app import io_utils
+from app.io_utils import DatasetCache, dataset_cache, load_frame
+from app.schemas import InputSpec, FileType
+from app.services import fixes_service
+
+
+def test_load_frame_parses_once(sample_csv_dirty, monkeypatch):
+    """Loading the same file twice reuses the parsed frame"""
+    calls = []
+    read_frame = io_utils._read_frame
+    monkeypatch.setattr(io_utils, "_read_frame", lambda *args: calls.append(1) or read_frame(*args))
+
+    spec = InputSpec(file_path=sample_csv_dirty, file_type=FileType.CSV)
+    first = load_frame(spec)
+    second = load_frame(spec)
+
+    assert first is second
+    assert len(calls) == 1
+
+
+def test_apply_fixes_parses_once(sample_csv_dirty, monkeypatch):
+    """apply_fixes shares one parsed frame with issue detection"""
+    calls = []
+    read_frame = io_utils._read_frame
+    monkeypatch.setattr(io_utils, "_read_frame", lambda *args: calls.append(1) or read_frame(*args))
+
+    result = fixes_service.apply_fixes(
+        InputSpec(file_path=sample_csv_dirty, file_type=FileType.CSV)
+    )
+
+    assert len(calls) == 1
+    os.unlink(result.file_clean_path)
+
+
+def test_key_tracks_content_and_options(sample_csv_dirty):
+    """Changed content or parse options produce a different key"""
+    with open(sample_csv_dirty, "rb") as f:
+        payload = base64.b64encode(f.read()).decode()
+
+    spec = InputSpec(content_b64=payload, file_type=FileType.CSV)
+    same = InputSpec(content_b64=payload, file_type=FileType.CSV)
+    other_options = InputSpec(content_b64=payload, file_type=FileType.CSV, delimiter=";")
+
+    assert io_utils.dataset_key(spec) == io_utils.dataset_key(same)
+    assert io_utils.dataset_key(spec) != io_utils.dataset_key(other_options)
+
+    path_spec = InputSpec(file_path=sample_csv_dirty, file_type=FileType.CSV)
+    before = io_utils.dataset_key(path_spec)
+    stat = os.stat(sample_csv_dirty)
+    os.utime(sample_csv_dirty, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert io_utils.dataset_key(path_spec) != before
+
+
+def test_cache_evicts_by_bytes():
+    """Least recently used frames are evicted once the byte budget is exceeded"""
+    df = pd.DataFrame({"a": range(1000)})
+    size = int(df.memory_usage(index=True, deep=True).sum())
+    cache = DatasetCache(max_bytes=size * 2)
+
+    cache.put(("a",), df)
+    cache.put(("b",), df.copy())
+    cache.get(("a",))
+    cache.put(("c",), df.copy())
+
+    assert cache.get(("a",)) is not None
+    assert cache.get(("b",)) is None
+    assert cache.get(("c",)) is not None
+    assert cache.current_bytes <= cache.max_bytes
+
+    # Frames bigger than the whole budget are never cached
+    cache.put(("big",), pd.DataFrame({"a": range(10_000)}))
+    assert cache.get(("big",)) is None
+
+
+def test_projection_served_from_cached_full_frame(sample_csv_dirty, monkeypatch):
+    """A column projection reuses the full frame when it is already cached"""
+    spec = InputSpec(file_path=sample_csv_dirty, file_type=FileType.CSV)
+    full = load_frame(spec)
+
+    monkeypatch.setattr(io_utils, "_read_frame", lambda *args: pytest.fail("parsed again"))
+    projected = load_frame(spec, ["email", "nombre"])
+
+    assert list(projected.columns) == ["nombre", "email"]
+    assert projected["email"].tolist() == full["email"].tolist()
@@ -0,0 +1,64 @@
+"""Test vectorized date format classification"""
+import pandas as pd
+from app.detectors import dates
+from app.detectors.dates import classify_date_formats, detect_date_format
+
+
+def test_classifier_matches_per_value_detection():
+    """Column-wide labels equal detect_date_format value by value"""
+    values = pd.Series(
+        [
+            "15/01/2024", "2024-01-16", "15-01-2024", "2024/01/17", "16/01/24", "1.2.2024",
+            "2024.01.05", "15-1-24", "12/3/123", "2024-01", "15/01/2024/3", "2024-1-1 10:00",
+            "a/b/cc", "hoy", "",
+        ],
+        dtype=object,
+    )
+
+    labels = classify_date_formats(values)
+
+    assert labels.tolist() == [detect_date_format(value) for value in values]
+
+
+def test_issues_grouped_by_format_in_order_of_appearance():
+    """Minority formats are reported per format, rows in order; ties keep the first format"""
+    df = pd.DataFrame(
+        {"fecha": ["2024-01-01", "01/02/2024", "2024-01-03", "03.01.24", "02/02/2024", None, "2024-01-05"]}
+    )
+
+    issues = dates.detect(df, "fecha").to_issues()
+
+    assert [(i.row, i.details["detected_format"]) for i in issues] == [
+        (1, "DD/MM/YYYY"),
+        (4, "DD/MM/YYYY"),
+        (3, "DD.MM.YY"),
+    ]
+    assert issues[0].details == {
+        "dominant_format": "YYYY-MM-DD",
+        "value": "01/02/2024",
+        "detected_format": "DD/MM/YYYY",
+        "reason": "Inconsistent date format. Found DD/MM/YYYY, expected YYYY-MM-DD",
+    }
+
+    tie = dates.detect(pd.DataFrame({"fecha": ["01/02/2024", "2024-01-01"]}), "fecha").to_issues()
+    assert [i.row for i in tie] == [1]
+
+
+def test_chunk_state_keeps_compact_rows():
+    """Across chunks, state holds per-format counts and row/value codes, not row values"""
+    state = {}
+    for start in range(0, 300, 100):
+        chunk = pd.DataFrame(
+            {"fecha": ["2024-01-01", "01/02/2024", "2024-01-03"] * 33 + [None]},
+            index=range(start, start + 100),
+        )
+        assert dates.detect(chunk, "fecha", state=state).to_issues() == []
+
+    assert state["format_counts"] == [198, 99]
+    assert list(state["value_codes"]) == ["2024-01-01", "01/02/2024", "2024-01-03"]
+    assert all(rows.dtype == "int64" for rows in state["rows"])
+
+    issues = dates.finalize("fecha", state).to_issues()
+    assert len(issues) == 99
+    assert issues[0].row == 1 and issues[-1].row == 297
+    assert issues[0].details["value"] == "01/02/2024"
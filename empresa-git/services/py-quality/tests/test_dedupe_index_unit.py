@@ -0,0 +1,110 @@
+"""Test the persistent dedupe index"""
+import pandas as pd
+import pytest
+from httpx import AsyncClient
+from app.main import app
+from app.config import settings
+from app.detectors import duplicates
+from app.schemas import InputSpec
+from app.services import dedupe_service
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    """Keep indexes of each test in its own temp dir"""
+    monkeypatch.setattr(settings, "quality_tmp_dir", str(tmp_path))
+    return tmp_path
+
+
+def _csv(path, nombres, emails):
+    pd.DataFrame({"nombre": nombres, "email": emails}).to_csv(path, index=False)
+    return {"file_path": str(path), "file_type": "csv"}
+
+
+@pytest.mark.asyncio
+async def test_match_and_append(index_dir):
+    """Uploads are matched against the index, then optionally appended"""
+    reference = _csv(
+        index_dir / "ref.csv",
+        ["Juan Pérez", "Ana López", "Juan Pérez", "Luis Gómez"],
+        ["juan@x.com", "ana@y.es", "juan@x.com", "luis@z.org"],
+    )
+    delta = _csv(
+        index_dir / "delta.csv",
+        ["Nuevo Cliente", "Luis Gómez", "Ana Lópes", "Nuevo Cliente"],
+        ["nuevo@c.com", "luis@z.org", "ana@y.es", "nuevo@c.com"],
+    )
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        built = await client.post("/dedupe_index/clientes", json=reference)
+        matched = await client.post("/dedupe_index/clientes/match", json=delta, params={"append": True})
+        again = await client.post("/dedupe_index/clientes/match", json=delta)
+        info = await client.get("/dedupe_index/clientes")
+
+    assert built.status_code == 200
+    # The exact duplicate in the reference is stored once
+    assert built.json() == {
+        "name": "clientes",
+        "engine": "blocking",
+        "key_columns": ["nombre", "email"],
+        "records": 4,
+        "rows": 3,
+    }
+
+    issues = [(i["row"], i["details"]["duplicate_of"], i["details"].get("source")) for i in matched.json()["issues"]]
+    assert issues == [(1, 3, "index"), (2, 1, "index"), (3, 0, None)]
+    assert matched.json()["summary"]["index"]["records"] == 8
+
+    # Once appended, every row is found in the index as stored (records 4..7)
+    issues = [(i["row"], i["details"]["duplicate_of"], i["details"].get("source")) for i in again.json()["issues"]]
+    assert issues == [(0, 4, "index"), (1, 3, "index"), (2, 6, "index"), (3, 4, "index")]
+    assert info.json()["rows"] == 5
+
+
+def test_appends_running_together_allocate_distinct_rows(index_dir, monkeypatch):
+    """An append committed while another upload is matched is not overwritten"""
+    reference = _csv(index_dir / "ref.csv", ["Ana López"], ["ana@y.es"])
+    first = _csv(index_dir / "first.csv", ["Luis Gómez", "Eva Ruiz"], ["luis@z.org", "eva@r.es"])
+    second = _csv(
+        index_dir / "second.csv", ["Marta Gil", "Pablo Sanz"], ["marta@g.es", "pablo@s.es"]
+    )
+    dedupe_service.build_index(InputSpec(**reference), "clientes")
+
+    detect = duplicates.detect
+    calls = []
+
+    def detect_racing_an_append(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            dedupe_service.match_index(InputSpec(**second), "clientes", append=True)
+        return detect(*args, **kwargs)
+
+    monkeypatch.setattr(duplicates, "detect", detect_racing_an_append)
+    dedupe_service.match_index(InputSpec(**first), "clientes", append=True)
+    monkeypatch.setattr(duplicates, "detect", detect)
+
+    info = dedupe_service.index_info("clientes")
+    assert (info.records, info.rows) == (5, 5)
+    again = dedupe_service.match_index(InputSpec(**first), "clientes")
+    assert [(i.row, i.details["duplicate_of"]) for i in again.issues] == [(0, 3), (1, 4)]
+
+
+@pytest.mark.asyncio
+async def test_index_errors(index_dir):
+    """Unknown indexes are 404, invalid names and key-less uploads 422"""
+    delta = _csv(index_dir / "delta.csv", ["Ana"], ["ana@y.es"])
+    pd.DataFrame({"otro": ["x"]}).to_csv(index_dir / "otro.csv", index=False)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        missing = await client.post("/dedupe_index/nope/match", json=delta)
+        invalid = await client.get("/dedupe_index/bad.name")
+        await client.post("/dedupe_index/clientes", json=delta)
+        keyless = await client.post(
+            "/dedupe_index/clientes/match",
+            json={"file_path": str(index_dir / "otro.csv"), "file_type": "csv"},
+        )
+
+    assert missing.status_code == 404
+    assert missing.json()["detail"]["code"] == "NOT_FOUND"
+    assert invalid.status_code == 422
+    assert keyless.status_code == 422
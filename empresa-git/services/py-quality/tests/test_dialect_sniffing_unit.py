@@ -0,0 +1,81 @@
+"""Test CSV delimiter, encoding and header sniffing"""
+import base64
+import gzip
+import pandas as pd
+from app.io_utils import load_frame, read_header, resolve_dialect
+from app.schemas import InputSpec, FileType
+
+
+SEMICOLON_LATIN1 = "id;nombre;ciudad;precio\n1;José;Cádiz;10\n2;Begoña;Logroño;12\n3;Iñaki;Málaga;7\n"
+
+
+def _auto_spec(**kwargs):
+    return InputSpec(file_type=FileType.CSV, delimiter="auto", encoding="auto", **kwargs)
+
+
+def test_sniffs_semicolon_latin1(tmp_path):
+    """A Latin-1 semicolon export parses into its real columns"""
+    path = tmp_path / "export.csv"
+    path.write_bytes(SEMICOLON_LATIN1.encode("latin-1"))
+
+    spec = resolve_dialect(_auto_spec(file_path=str(path)))
+    df = load_frame(_auto_spec(file_path=str(path)))
+
+    assert (spec.delimiter, spec.encoding) == (";", "cp1252")
+    assert list(df.columns) == ["id", "nombre", "ciudad", "precio"]
+    assert df["ciudad"].tolist() == ["Cádiz", "Logroño", "Málaga"]
+
+
+def test_sniffs_utf8_bom_tabs_in_compressed_base64():
+    """BOM and delimiter are read from the decompressed prefix only"""
+    text = "\ufeffemail\ttelefono\nana@example.com\t600123456\nluis@example.com\t600234567\n"
+    payload = base64.b64encode(gzip.compress(text.encode("utf-8"))).decode()
+
+    spec = _auto_spec(content_b64=payload)
+
+    assert resolve_dialect(spec).delimiter == "\t"
+    assert read_header(spec) == ["email", "telefono"]
+
+
+def test_sniffs_missing_header(tmp_path):
+    """header=None tells a header row from a data row"""
+    with_header = tmp_path / "with_header.csv"
+    with_header.write_text("id,precio,cantidad\n1,10.5,3\n2,12.0,4\n3,7.25,1\n")
+    without_header = tmp_path / "without_header.csv"
+    without_header.write_text("1,10.5,3\n2,12.0,4\n3,7.25,1\n")
+
+    spec = InputSpec(file_path=str(with_header), file_type=FileType.CSV, header=None)
+    assert resolve_dialect(spec).header is True
+    df = load_frame(InputSpec(file_path=str(without_header), file_type=FileType.CSV, header=None))
+
+    assert list(df.columns) == [0, 1, 2]
+    assert len(df) == 3
+
+
+def test_sniffs_all_text_header(tmp_path):
+    """Text-only columns keep their header; data rows are told by the shape of their values"""
+    cases = {
+        "nombre,email\nJuan,a@b.com\nAna,c@d.es\n": True,
+        "nombre;ciudad\nJuan;Cádiz\nAna;Logroño\n": True,
+        "Juan,a@b.com\nAna,c@d.es\n": False,
+        "Juan,600123456\nAna,+34 655 987 654\n": False,
+        "Juan,15/01/2024\nAna,2024-01-16\n": False,
+        "Juan,Juan\nAna,Ana\n": False,
+        "nombre\n": True,
+    }
+
+    for position, (text, header) in enumerate(cases.items()):
+        path = tmp_path / f"data{position}.csv"
+        path.write_text(text)
+        spec = _auto_spec(file_path=str(path), header=None)
+        assert resolve_dialect(spec).header is header, text
+
+
+def test_explicit_options_are_not_sniffed(sample_csv_dirty):
+    """Specs without auto options are returned untouched"""
+    spec = InputSpec(file_path=sample_csv_dirty, file_type=FileType.CSV)
+
+    assert resolve_dialect(spec) is spec
+    pd.testing.assert_frame_equal(
+        load_frame(_auto_spec(file_path=sample_csv_dirty)), load_frame(spec)
+    )
@@ -0,0 +1,92 @@
+"""Test distinct-value evaluation in detectors and fixes"""
+import os
+import numpy as np
+import pandas as pd
+from app.detectors import email, phone_es
+from app.schemas import InputSpec, FileType
+from app.services.fixes_service import apply_fixes
+from app.utils import distinct_values, map_distinct, object_array
+
+
+def test_distinct_values_strip_and_skip_blanks():
+    """Values equal after stripping share a code; blanks and nulls get -1"""
+    distinct = distinct_values(pd.Series(["a@x.com", " a@x.com", None, "  ", "b@", "a@x.com"]))
+
+    assert distinct.values == ["a@x.com", "b@"]
+    assert distinct.codes.tolist() == [0, 0, -1, -1, 1, 0]
+
+    rows, codes = distinct.select(np.array([False, True]))
+    assert rows.tolist() == [4]
+    assert distinct.take(distinct.values, codes).tolist() == ["b@"]
+
+
+def test_checks_run_once_per_distinct_value():
+    """A repetitive column is evaluated once per distinct value"""
+    calls = []
+    distinct = distinct_values(pd.Series(["600123456", "700", "600123456 "] * 1000))
+
+    results = distinct.map(lambda value: calls.append(value) or len(value))
+
+    assert calls == ["600123456", "700"]
+    rows, codes = distinct.select(np.array(results) < 9)
+    assert len(rows) == 1000
+    assert distinct.take(results, codes)[:2].tolist() == [3, 3]
+
+
+def test_phone_detection_on_repetitive_column():
+    """Every row holding an invalid distinct phone is reported"""
+    df = pd.DataFrame({"telefono": ["600123456", "700", "600123456 "] * 1000})
+
+    issues = phone_es.detect(df, "telefono")
+
+    assert len(issues) == 3000
+    assert issues.to_issues(limit=2)[1].details["value"] == "700"
+
+
+def test_email_rows_follow_row_order():
+    """Issues are reported for every failing row, in row order"""
+    df = pd.DataFrame({"email": ["bad", "ok@example.com", None, "bad", "also bad@"]})
+
+    issues = email.detect(df, "email").to_issues()
+
+    assert [(i.row, i.details["value"]) for i in issues] == [
+        (0, "bad"),
+        (3, "bad"),
+        (4, "also bad@"),
+    ]
+
+
+def test_map_distinct_matches_map():
+    """map_distinct broadcasts per-value results like Series.map"""
+    series = pd.Series(["15/01/2024", "x", "15/01/2024"])
+
+    assert map_distinct(series, len).tolist() == series.map(len).tolist()
+
+
+def test_apply_fixes_normalizes_repeated_values(tmp_path):
+    """Every row holding a fixable distinct value is rewritten"""
+    path = tmp_path / "data.csv"
+    path.write_text(
+        "id,telefono,fecha\n"
+        + "".join(f"{i},600 123 456,15/01/2024\n{i}b,+34600123456,2024-01-15\n" for i in range(3))
+        + "9,600123456,2024-01-16\n"
+    )
+
+    result = apply_fixes(InputSpec(file_path=str(path), file_type=FileType.CSV))
+    clean = pd.read_csv(result.file_clean_path, dtype=str)
+    os.unlink(result.file_clean_path)
+
+    assert set(clean["telefono"]) == {"+34600123456"}
+    assert clean["fecha"].tolist() == ["2024-01-15"] * 6 + ["2024-01-16"]
+    assert result.applied == 3 + 4
+
+
+def test_object_array_keeps_sequences_whole():
+    """Equal-length tuples stay elements, whatever the input container"""
+    pairs = [("a", 1), ("b", 2)]
+
+    for values in (pairs, iter(pairs), pd.Series(pairs), np.array(["x", "y"])):
+        array = object_array(values)
+        assert array.dtype == object and array.shape == (2,)
+    assert object_array(pairs)[1] == ("b", 2)
+    assert object_array([("solo",)])[0] == ("solo",)
@@ -0,0 +1,154 @@
+"""Test blocked duplicate detection"""
+import numpy as np
+import pandas as pd
+import pytest
+from rapidfuzz import fuzz
+from app.detectors import duplicates
+from app.utils import connected_components
+from app.schemas import InputSpec, FileType
+from app.services.issues_service import detect_issue_batch, detect_issues_chunked
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "nombre": ["Juan Pérez", "Ana López", "juan perez ", "Luis Gómez", "Juan Peres", "Ana Lopez"],
+            "email": ["juan@x.com", "ana@y.es", "juan@x.com", "luis@z.org", "juan@x.com", None],
+        }
+    )
+
+
+def test_blocked_matches():
+    """Exact and typo duplicates are found among rows sharing a block"""
+    state = {}
+    issues = duplicates.detect(_frame(), state=state).to_issues()
+
+    assert [(i.row, i.details["duplicate_of"], i.details["similarity"]) for i in issues] == [
+        (2, 0, 0.95),
+        (4, 0, 0.9),
+    ]
+
+    stats = duplicates.summarize(state)
+    assert 0 < stats["comparisons"] < stats["all_pairs_comparisons"]
+
+
+def test_block_size_bounds_comparisons():
+    """Each block only keeps its latest dup_block_max_size rows"""
+    df = pd.DataFrame({"nombre": [f"cliente numero {i:05d}" for i in range(300)]})
+    config = {"dup_key_columns": ["nombre"], "dup_block_max_size": 5, "dup_recall_stride": 1}
+
+    state = {}
+    duplicates.detect(df, config=config, state=state)
+    stats = duplicates.summarize(state)
+
+    # Two blocks per row (prefix and suffix), five rows kept in each
+    assert stats["comparisons"] <= 300 * 2 * 5
+    assert stats["all_pairs_comparisons"] == 300 * 299 // 2
+
+
+def test_recall_estimate_in_summary(tmp_path):
+    """The summary reports comparisons and recall, equal when chunked"""
+    path = tmp_path / "dups.csv"
+    pd.DataFrame(
+        {
+            "nombre": ["Juan Pérez", "Ana López"] * 97 + ["Juan Peres"],
+            "email": ["juan@x.com", "ana@y.es"] * 97 + ["juan@x.com"],
+        }
+    ).to_csv(path, index=False)
+    spec = InputSpec(file_path=str(path), file_type=FileType.CSV)
+
+    _, summary = detect_issue_batch(spec)
+    _, chunked = detect_issues_chunked(spec, 7)
+
+    # Row 194 (the only fuzzy duplicate) is sampled and found by blocking
+    assert summary["duplicates"] == chunked["duplicates"]
+    assert summary["duplicates"]["recall_estimate"] == 1.0
+    assert summary["duplicates"]["recall_sample"] == 1
+    assert summary["duplicates"]["comparisons"] < summary["duplicates"]["all_pairs_comparisons"]
+
+
+def test_score_pairs_averages_filled_columns():
+    """Columns empty on either side are left out of the average"""
+    left = np.array([0, 0, 1])
+    columns = [(["juan", "juan", ""], ["juan", "juana", "ana"]), (["a@x", "a@x", "b@y"], ["a@x", "", "b@y"])]
+
+    scores = duplicates.score_pairs(left, columns, workers=1)
+
+    assert scores.tolist() == [1.0, pytest.approx(0.8889, abs=1e-4), 1.0]
+    assert np.isnan(duplicates.score_pairs(np.array([0]), [([""], ["x"])]))[0]
+
+
+def test_score_matrix_slabs_and_recall_sample(monkeypatch):
+    """Slabs of a large score matrix, and the batched recall sample, match pair by pair"""
+    names = [f"cliente {i % 13} {'garcia' if i % 3 else 'lopez'}" for i in range(60)]
+    left = np.repeat(np.arange(20), 3)
+    right = (left * 7 + np.tile([1, 2, 5], 20)) % 60
+    columns = [([names[i] for i in left], [names[i] for i in right])]
+    expected = [fuzz.ratio(names[a], names[b]) / 100.0 for a, b in zip(left, right)]
+
+    monkeypatch.setattr(duplicates, "SCORE_MATRIX_CELLS", 16)
+    assert duplicates.score_pairs(left, columns, workers=1) == pytest.approx(expected)
+
+    sampled = [((names[50],), 50), ((names[7],), 7), (("",), 3)]
+    best = duplicates._best_similarities(sampled, [names], workers=1)
+    assert best.tolist() == [
+        max(fuzz.ratio(names[50], name) for name in names[:50]) / 100.0,
+        max(fuzz.ratio(names[7], name) for name in names[:7]) / 100.0,
+        0.0,
+    ]
+
+
+def test_tiles_and_threads_do_not_change_results():
+    """Small tiles and several scoring threads give the same issues"""
+    df = pd.DataFrame({"nombre": [f"cliente {i % 40:03d} garcia" for i in range(400)]})
+    df.loc[::7, "nombre"] += "z"
+    config = {"dup_key_columns": ["nombre"]}
+
+    default = duplicates.detect(df, config=config).to_issues()
+    tiled = duplicates.detect(
+        df, config={**config, "dup_tile_rows": 16, "dup_workers": 4}
+    ).to_issues()
+
+    assert len(default) > 0
+    assert [i.model_dump() for i in tiled] == [i.model_dump() for i in default]
+
+
+def test_clusters_collapse_pairs():
+    """Chains of pairwise matches become one cluster issue on the earliest row"""
+    df = _frame()
+    # Only similar enough to row 2, itself a duplicate of row 0
+    df.loc[6] = ["Juan Peresz", None]
+    issues = duplicates.detect(df)
+    assert issues.detail_array("duplicate_of").tolist() == [0, 0, 2]
+
+    clustered = duplicates.cluster(issues).to_issues()
+
+    assert [(i.kind.value, i.row, i.details["members"], i.details["size"]) for i in clustered] == [
+        ("duplicate_cluster", 0, (2, 4, 6), 4),
+    ]
+    assert clustered[0].details["similarity"] == 0.9
+    # Clusters resolve to the same rows from either form
+    for batch in (issues, duplicates.cluster(issues)):
+        rows, survivors = duplicates.cluster_rows(batch)
+        assert rows.tolist() == [0, 2, 4, 6]
+        assert survivors.tolist() == [0, 0, 0, 0]
+
+
+def test_connected_components_are_transitive():
+    """Edges in any direction and order join components under their smallest node"""
+    nodes, labels = connected_components(np.array([9, 3, 7, 5]), np.array([7, 5, 3, 20]))
+
+    assert nodes.tolist() == [3, 5, 7, 9, 20]
+    assert labels.tolist() == [3, 3, 3, 3, 3]
+
+
+def test_fallback_keys_skip_numeric_text_columns(tmp_path):
+    """CSV values are text: an id column of numbers is not taken as a dedupe key"""
+    path = tmp_path / "clientes.csv"
+    path.write_text("id,name,city\n1001,Juan Perez,Madrid\n1002,Juan Perez,Madrid\n")
+    spec = InputSpec(file_path=str(path), file_type=FileType.CSV)
+
+    batch, _ = detect_issue_batch(spec)
+
+    dups = [issue for issue in batch.to_issues() if issue.kind.value == "duplicate"]
+    assert [(issue.row, issue.details["duplicate_of"]) for issue in dups] == [(1, 0)]
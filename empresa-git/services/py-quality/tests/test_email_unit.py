@@ -0,0 +1,33 @@
+"""Test vectorized email validation"""
+import pandas as pd
+from app.detectors import email
+from app.detectors.email import EMAIL_PATTERN, valid_email_mask
+from app.schemas import InferredType
+from app.services.infer_service import infer_type
+
+
+VALUES = ["ana@example.com", "maria@", " luis@test.es ", "a b@c.com", "x@y", "", None, 42]
+
+
+def test_detect_matches_row_by_row_regex():
+    """The column-wide match flags exactly the rows the per-row regex did"""
+    df = pd.DataFrame({"email": VALUES})
+
+    issues = email.detect(df, "email").to_issues()
+
+    expected = [
+        (idx, str(value).strip())
+        for idx, value in enumerate(VALUES)
+        if value is not None
+        and str(value).strip()
+        and not EMAIL_PATTERN.match(str(value).strip())
+    ]
+    assert [(i.row, i.details["value"]) for i in issues] == expected
+
+
+def test_mask_and_infer_share_the_pattern():
+    """infer_type uses the same vectorized mask as the detector"""
+    series = pd.Series(["ana@example.com", "luis@test.es", "eva@example.org", "nope"], name="contacto")
+
+    assert valid_email_mask(series).tolist() == [True, True, True, False]
+    assert infer_type(series) == (InferredType.EMAIL, 0.75)
@@ -0,0 +1,41 @@
+"""Test bulk row fingerprints"""
+import pandas as pd
+from app.utils import fingerprint_rows, normalize_keys, normalized_fingerprints
+from app.services.infer_service import calculate_kpis
+
+
+def test_fingerprints_follow_normalized_values():
+    """Rows equal once stripped and lowercased share a fingerprint"""
+    df = pd.DataFrame(
+        {
+            "nombre": [" Juan", "juan", "Ana", None, "x"],
+            "email": ["J@X.COM", "j@x.com ", "j@x.com", "", "y"],
+            "swapped": ["y", "y", "y", "y", "x"],
+        }
+    )
+
+    fingerprints = fingerprint_rows(df, ["nombre", "email"])
+
+    assert fingerprints[0] == fingerprints[1]
+    assert len(set(fingerprints.tolist())) == 4
+    # Nulls hash like blanks, and missing columns like null ones
+    assert fingerprint_rows(df.fillna(" "), ["nombre", "email"])[3] == fingerprints[3]
+    keys = ["nombre", "email", "missing"]
+    assert (fingerprint_rows(df, keys) == fingerprint_rows(df.assign(missing=None), keys)).all()
+    # Columns are not interchangeable
+    assert fingerprint_rows(df, ["nombre", "swapped"])[0] != fingerprint_rows(df, ["swapped", "nombre"])[0]
+    # Normalized keys hash like the raw rows
+    normalized = normalize_keys(df, ["nombre", "email"])
+    assert normalized.loc[0].tolist() == ["juan", "j@x.com"]
+    assert (fingerprint_rows(normalized) == fingerprints).all()
+    # Both in one pass
+    together, together_fingerprints = normalized_fingerprints(df, ["nombre", "email"])
+    pd.testing.assert_frame_equal(together, normalized)
+    assert (together_fingerprints == fingerprints).all()
+
+
+def test_kpis_count_normalized_duplicates():
+    """Duplicate counting ignores case and surrounding whitespace"""
+    df = pd.DataFrame({"nombre": ["Ana", "ana ", "Luis", "Ana"], "precio": [1, 1, 2, 1]})
+
+    assert calculate_kpis(df)["duplicates_suspected"] == 2
@@ -2,7 +2,8 @@
 import pytest
 from httpx import AsyncClient
 from app.main import app
-from app.schemas import FileType
+from app.schemas import FileType, InputSpec
+from app.services.infer_service import infer_schema
 
 
 @pytest.mark.asyncio
@@ -39,3 +40,12 @@ async def test_infer_endpoint(sample_csv_dirty):
     kpis = data["kpis"]
     assert kpis["rows"] == 5
     assert kpis["cols"] == 6
+
+
+def test_numeric_samples_stay_numbers(sample_csv_dirty):
+    """CSV values are read as text; numeric columns still sample numbers"""
+    result = infer_schema(InputSpec(file_path=sample_csv_dirty, file_type=FileType.CSV))
+
+    precio = next(c for c in result.columns if c.name == "precio")
+    assert precio.inferred_type.value == "numeric"
+    assert all(isinstance(value, (int, float)) for value in precio.sample)
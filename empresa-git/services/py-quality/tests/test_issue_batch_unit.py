@@ -0,0 +1,74 @@
+"""Test the columnar IssueBatch container"""
+import json
+from app.schemas import InputSpec, FileType, IssueBatch, IssueKind, Severity
+from app.services.issues_service import calculate_summary, detect_issue_batch
+
+
+def test_build_concat_and_expand():
+    """Shared and per-issue details survive concatenation and expansion"""
+    phones = IssueBatch.build(
+        IssueKind.PHONE_INVALID,
+        [Severity.WARN, Severity.ERROR],
+        [0, 3],
+        "telefono",
+        value=["600123456", "700"],
+        suggestion=["+34600123456", None],
+    )
+    mixed = IssueBatch.build(
+        IssueKind.CURRENCY, Severity.WARN, [None], "precio", shared={"currencies": ["€", "$"]}
+    )
+    dups = IssueBatch.build(
+        IssueKind.DUPLICATE, Severity.WARN, [3], shared={"match_fields": ["email"]}, duplicate_of=[0]
+    )
+
+    batch = IssueBatch.concat([phones, IssueBatch.empty(), mixed, dups])
+    issues = batch.to_issues()
+
+    assert len(batch) == 4
+    assert [(i.kind, i.severity, i.row, i.col) for i in issues] == [
+        (IssueKind.PHONE_INVALID, Severity.WARN, 0, "telefono"),
+        (IssueKind.PHONE_INVALID, Severity.ERROR, 3, "telefono"),
+        (IssueKind.CURRENCY, Severity.WARN, None, "precio"),
+        (IssueKind.DUPLICATE, Severity.WARN, 3, None),
+    ]
+    assert issues[0].details == {"value": "600123456", "suggestion": "+34600123456"}
+    assert issues[1].details == {"value": "700"}
+    assert issues[2].details == {"currencies": ["€", "$"]}
+    assert issues[3].details == {"match_fields": ["email"], "duplicate_of": 0}
+    assert list(batch.cells()) == [
+        (IssueKind.PHONE_INVALID, 0, "telefono"),
+        (IssueKind.PHONE_INVALID, 3, "telefono"),
+    ]
+
+
+def test_summary_is_aggregated_from_arrays():
+    """calculate_summary counts kinds, severities and affected rows"""
+    batch = IssueBatch.concat(
+        [
+            IssueBatch.build(IssueKind.EMAIL_INVALID, Severity.ERROR, [1, 4], "email"),
+            IssueBatch.build(IssueKind.PRICE_ZERO, Severity.WARN, [1], "precio"),
+            IssueBatch.build(IssueKind.CURRENCY, Severity.WARN, [None], "precio"),
+        ]
+    )
+
+    summary = calculate_summary(batch, 5)
+
+    assert summary == {
+        "total_issues": 4,
+        "by_kind": {IssueKind.EMAIL_INVALID: 2, IssueKind.PRICE_ZERO: 1, IssueKind.CURRENCY: 1},
+        "by_severity": {Severity.WARN: 2, Severity.ERROR: 2},
+        "affected_rows": 2,
+        "total_rows": 5,
+    }
+
+
+def test_detected_details_are_json_native(sample_csv_dirty):
+    """Expanded details hold plain Python values, not numpy scalars"""
+    batch, summary = detect_issue_batch(
+        InputSpec(file_path=sample_csv_dirty, file_type=FileType.CSV)
+    )
+
+    issues = batch.to_issues()
+
+    assert len(issues) == summary["total_issues"] > 0
+    json.dumps([issue.details for issue in issues])
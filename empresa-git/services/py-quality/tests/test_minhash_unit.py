@@ -0,0 +1,65 @@
+"""Test the MinHash/LSH duplicate engine"""
+import pandas as pd
+from app.detectors import duplicates
+from app.schemas import DedupeEngine, FileType, InputSpec
+from app.services.issues_service import detect_issue_batch, detect_issues_chunked
+from app.utils import MinHasher
+
+
+def test_band_keys_are_stable_and_shared():
+    """Equal rows share every band, similar rows some, blank rows none"""
+    hasher = MinHasher(bands=20, rows=4)
+    keys = hasher.band_keys(
+        [
+            ("juan perez garcia", "juan.perez@x.com"),
+            ("juan perez garcia", "juan.perez@x.com"),
+            ("juan peres garcia", "juan.perez@x.com"),
+            ("maria lopez", "maria@y.es"),
+            ("", ""),
+        ]
+    )
+
+    again = MinHasher(bands=20, rows=4).band_keys([("juan perez garcia", "juan.perez@x.com")])
+    assert keys[0] == keys[1] == again[0]
+    assert set(keys[0]) & set(keys[2])
+    assert not set(keys[0]) & set(keys[3])
+    assert keys[4] == []
+
+
+def test_minhash_engine_selected_per_request(tmp_path):
+    """InputSpec.dup_engine switches engines; chunked runs agree"""
+    path = tmp_path / "clientes.csv"
+    pd.DataFrame(
+        {
+            "nombre": ["Juan Pérez García", "Ana López", "Luis Gómez", "Juan Peres García"],
+            "email": ["juan.perez@x.com", "ana@y.es", "luis@z.org", "juan.perez@x.com"],
+        }
+    ).to_csv(path, index=False)
+    spec = InputSpec(file_path=str(path), file_type=FileType.CSV, dup_engine=DedupeEngine.MINHASH)
+
+    issues, summary = detect_issue_batch(spec)
+    _, chunked = detect_issues_chunked(spec, 2)
+
+    dups = [i for i in issues.to_issues() if i.kind == "duplicate"]
+    assert [(i.row, i.details["duplicate_of"], i.details["method"]) for i in dups] == [
+        (3, 0, "fuzzy")
+    ]
+    assert summary["duplicates"]["engine"] == "minhash"
+    assert chunked["duplicates"] == summary["duplicates"]
+
+
+def test_engines_agree_on_clear_duplicates():
+    """Both engines find the same obvious duplicates"""
+    df = pd.DataFrame(
+        {
+            "nombre": ["carlos ruiz", "elena diaz", "carlos ruis", "elena diaz", "pablo sanz"],
+            "email": ["carlos@a.com", "elena@b.com", "carlos@a.com", "elena@b.com", "pablo@c.com"],
+        }
+    )
+
+    found = {}
+    for engine in ("blocking", "minhash"):
+        issues = duplicates.detect(df, config={"dup_engine": engine}).to_issues()
+        found[engine] = [(i.row, i.details["duplicate_of"]) for i in issues]
+
+    assert found["blocking"] == found["minhash"] == [(2, 0), (3, 1)]
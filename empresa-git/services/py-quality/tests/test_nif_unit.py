@@ -0,0 +1,45 @@
+"""Test NIF/NIE/CIF control character validation"""
+import pandas as pd
+from app.detectors import nif_cif_basic
+from app.schemas import Severity
+
+
+def test_valid_ids_pass():
+    """Valid NIF, NIE, K/L/M and CIF values (with separators) are not flagged"""
+    values = [
+        "12345678Z", "X1234567L", "Y1234567X", "K1234567L",
+        "A58818501", "B12345674", "P1234567D", "Q2826000H",
+        "12345678-z", " b 1234567 4 ", None, "",
+    ]
+    df = pd.DataFrame({"nif": values})
+
+    assert len(nif_cif_basic.detect(df, "nif")) == 0
+
+
+def test_control_failures_are_errors():
+    """Wrong control characters name the check and suggest the fixed ID"""
+    df = pd.DataFrame({"nif": ["12345678A", "X1234567A", "A58818502", "P1234567J"]})
+
+    issues = nif_cif_basic.detect(df, "nif").to_issues()
+
+    assert [(i.row, i.details["check"], i.details["suggestion"]) for i in issues] == [
+        (0, "nif_letter", "12345678Z"),
+        (1, "nie_letter", "X1234567L"),
+        (2, "cif_control", "A58818501"),
+        (3, "cif_control", "P1234567D"),
+    ]
+    assert all(i.severity == Severity.ERROR for i in issues)
+    assert issues[0].details["value"] == "12345678A"
+
+
+def test_format_failures_are_warnings():
+    """Values not shaped like any ID get a WARN without suggestion"""
+    df = pd.DataFrame({"nif": ["12345678Z", "1234", "ABCDEFGHI"]})
+
+    issues = nif_cif_basic.detect(df, "nif").to_issues()
+
+    assert [(i.row, i.severity, i.details["check"]) for i in issues] == [
+        (1, Severity.WARN, "format"),
+        (2, Severity.WARN, "format"),
+    ]
+    assert "suggestion" not in issues[0].details
@@ -0,0 +1,42 @@
+"""Test vectorized Spanish phone validation and normalization"""
+import pandas as pd
+from app.detectors import phone_es
+from app.normalizers import phone
+from app.schemas import Severity
+
+
+def test_classification():
+    """WARN for national numbers, ERROR for bad lengths or country codes"""
+    df = pd.DataFrame(
+        {
+            "telefono": [
+                "600123456",
+                "+34 655 98 76 54",
+                "700",
+                "+3460012345",
+                "+44600123456",
+                "600-12-34-56",
+                None,
+                "",
+            ]
+        }
+    )
+
+    issues = phone_es.detect(df, "telefono").to_issues()
+
+    assert [(i.row, i.severity, i.details["reason"]) for i in issues] == [
+        (0, Severity.WARN, "Missing country code +34"),
+        (2, Severity.ERROR, "Expected 9 digits, got 3"),
+        (3, Severity.ERROR, "Expected 12 characters with +34, got 11"),
+        (4, Severity.ERROR, "Expected country code +34"),
+        (5, Severity.WARN, "Missing country code +34"),
+    ]
+    assert issues[1].details == {"value": "700", "normalized": "700", "reason": "Expected 9 digits, got 3"}
+    assert issues[4].details["suggestion"] == "+34600123456"
+
+
+def test_normalize_series_matches_normalize():
+    """The column-level normalizer agrees with the per-value one"""
+    values = pd.Series(["600 123 456", "+34 600 123 456", "(91) 123-45-67", "", "nan"])
+
+    assert phone.normalize_series(values).tolist() == [phone.normalize(v) for v in values]
@@ -0,0 +1,30 @@
+"""Test mask-based price and ID detectors"""
+import pandas as pd
+from app.detectors import id_sku, price
+from app.schemas import IssueKind, Severity
+
+
+def test_price_masks():
+    """Zero and negative prices are flagged in row order; text is skipped"""
+    df = pd.DataFrame({"precio": ["10.5", "0", "-3", "gratis", None, " 0 ", "-0.01"]})
+
+    issues = price.detect(df, "precio").to_issues()
+
+    assert [(i.row, i.kind, i.severity, i.details["value"]) for i in issues] == [
+        (1, IssueKind.PRICE_ZERO, Severity.WARN, 0.0),
+        (2, IssueKind.PRICE_NEGATIVE, Severity.ERROR, -3.0),
+        (5, IssueKind.PRICE_ZERO, Severity.WARN, 0.0),
+        (6, IssueKind.PRICE_NEGATIVE, Severity.ERROR, -0.01),
+    ]
+    assert issues[0].details["reason"] == "Zero price may indicate missing data"
+
+
+def test_id_missing_mask():
+    """Null and blank IDs are flagged"""
+    df = pd.DataFrame({"sku": ["A1", None, "  ", "B2", ""]})
+
+    issues = id_sku.detect(df, "sku").to_issues()
+
+    assert [i.row for i in issues] == [1, 2, 4]
+    assert issues[0].details == {"reason": "Required ID field is empty"}
+    assert len(id_sku.detect(pd.DataFrame({"id": [1, 2, 3]}), "id")) == 0
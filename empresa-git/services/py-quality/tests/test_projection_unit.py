@@ -0,0 +1,93 @@
+"""Test column projection pushdown"""
+import base64
+import gzip
+import pytest
+from app import io_utils
+from app.io_utils import load_frame, read_header, save_frame
+from app.schemas import InputSpec, FileType
+from app.services.issues_service import detect_issues, needed_columns
+
+
+@pytest.fixture
+def wide_csv(tmp_path):
+    """A CSV where most columns are irrelevant to detectors"""
+    path = tmp_path / "wide.csv"
+    filler = [f"extra_{i}" for i in range(20)]
+    header = ["Nombre", "Email", "Telefono"] + filler
+    rows = [
+        ["Ana", "ana@example.com", "600123456"] + ["x"] * 20,
+        ["Luis", "luis@", "700"] + ["y"] * 20,
+    ]
+    path.write_text("\n".join(",".join(r) for r in [header] + rows) + "\n")
+    return str(path)
+
+
+def test_read_header_normalizes_names(wide_csv):
+    spec = InputSpec(file_path=wide_csv, file_type=FileType.CSV, columns_map={"Telefono": "tel"})
+
+    header = read_header(spec)
+
+    assert header[:3] == ["nombre", "email", "tel"]
+    assert len(header) == 23
+
+
+def test_read_header_decodes_only_a_prefix(wide_csv, monkeypatch):
+    """Headers come from the cached frame, else from the first bytes of the payload"""
+    with open(wide_csv, "rb") as f:
+        data = f.read()
+    payload = base64.b64encode(gzip.compress(data + b"Eva,eva@example.com,600\n" * 50000))
+    spec = InputSpec(content_b64=payload.decode(), file_type=FileType.CSV)
+
+    def whole_content(_spec):
+        raise AssertionError("whole content decoded")
+
+    monkeypatch.setattr(io_utils, "_open_raw", whole_content)
+    monkeypatch.setattr(io_utils, "_open_source", whole_content)
+    assert read_header(spec)[:3] == ["nombre", "email", "telefono"]
+
+    cached = InputSpec(file_path=wide_csv, file_type=FileType.CSV, columns=["email", "nombre"])
+    monkeypatch.undo()
+    load_frame(cached.model_copy(update={"columns": None}))
+    monkeypatch.setattr(io_utils, "_header_source", whole_content)
+    assert read_header(cached) == ["nombre", "email"]
+
+
+def test_spec_columns_selects_columns(wide_csv):
+    spec = InputSpec(file_path=wide_csv, file_type=FileType.CSV, columns=["EMAIL", "extra_3"])
+
+    assert list(load_frame(spec).columns) == ["email", "extra_3"]
+    assert read_header(spec) == ["email", "extra_3"]
+
+
+def test_detection_loads_only_routed_columns(wide_csv, monkeypatch):
+    """Detection parses routed and duplicate key columns only"""
+    loaded = []
+    read_frame = io_utils._read_frame
+
+    def spy(spec, columns=None):
+        df = read_frame(spec, columns)
+        loaded.append(list(df.columns))
+        return df
+
+    monkeypatch.setattr(io_utils, "_read_frame", spy)
+
+    result = detect_issues(InputSpec(file_path=wide_csv, file_type=FileType.CSV))
+
+    assert loaded == [["nombre", "email", "telefono"]]
+    assert result.summary["total_issues"] > 0
+
+
+def test_needed_columns_without_duplicate_keys():
+    """Without key columns the duplicates fallback needs the loaded dtypes"""
+    assert needed_columns(["a", "b", "telefono"]) is None
+    assert needed_columns(["nombre", "b", "telefono"]) == ["nombre", "telefono"]
+
+
+@pytest.mark.parametrize("file_type", [FileType.XLSX, FileType.PARQUET, FileType.ARROW])
+def test_projection_other_formats(wide_csv, tmp_path, file_type):
+    df = load_frame(InputSpec(file_path=wide_csv, file_type=FileType.CSV))
+    path = save_frame(df, str(tmp_path / f"wide.{file_type.value}"))
+    spec = InputSpec(file_path=path, file_type=file_type)
+
+    assert read_header(spec) == list(df.columns)
+    assert list(load_frame(spec, ["email", "extra_5"]).columns) == ["email", "extra_5"]
@@ -0,0 +1,102 @@
+"""Test column routing plans"""
+import pandas as pd
+from app.schemas import ColumnRole, InputSpec, FileType
+from app.services.routing_service import RoutingPlanner, compile_plan, name_roles
+from app.services.issues_service import detect_issue_batch
+
+
+def test_name_words_route_without_substring_misfires():
+    """Whole words route a column; words merely containing them do not"""
+    assert name_roles("hotel") == []
+    assert name_roles("idioma") == []
+    assert name_roles("costa") == []
+    assert name_roles("update") == []
+
+    assert name_roles("Teléfono_2") == [ColumnRole.PHONE]
+    assert name_roles("e-mail") == [ColumnRole.EMAIL]
+    assert name_roles("fechas") == [ColumnRole.DATE]
+    assert name_roles("customer_id") == [ColumnRole.ID]
+    assert name_roles("precio_coste") == [ColumnRole.PRICE]
+
+
+def test_joined_words_route():
+    """Role words may start or end a joined word, whatever its case"""
+    assert name_roles("CustomerID") == [ColumnRole.ID]
+    assert name_roles("PhoneNumber") == [ColumnRole.PHONE]
+    assert name_roles("EmailAddress") == [ColumnRole.EMAIL]
+
+    assert name_roles("customerid") == [ColumnRole.ID]
+    assert name_roles("emailaddress") == [ColumnRole.EMAIL]
+    assert name_roles("unitprice") == [ColumnRole.PRICE]
+    assert name_roles("idcliente") == [ColumnRole.ID]
+
+    assert name_roles("candidate") == []
+    assert name_roles("costumbre") == []
+
+
+def test_date_and_phone_stems_route():
+    """Common date and phone column names route; look-alike words do not"""
+    for name in ["updated_at", "created_at", "enddate", "duedate", "dateofbirth", "fechanac"]:
+        assert name_roles(name) == [ColumnRole.DATE], name
+    assert name_roles("fecha_nac") == [ColumnRole.DATE]
+    assert name_roles("telf") == [ColumnRole.PHONE]
+    assert name_roles("tlf_movil") == [ColumnRole.PHONE]
+
+    assert name_roles("costcenter") == []
+    assert name_roles("cost_center") == []
+    assert name_roles("costcenter_id") == [ColumnRole.ID]
+    assert name_roles("hybrid") == []
+    assert name_roles("headphones") == []
+    assert name_roles("mandate") == []
+
+
+def test_roles_and_types_complete_the_plan():
+    """Declared roles win over names; types route the columns names leave out"""
+    sample = pd.DataFrame(
+        {
+            "contacto": ["a@x.com", "b@y.es", "c@z.org"],
+            "telefono": ["600123456", "600123457", "600123458"],
+            "hotel": ["Sol", "Luz", "Mar"],
+        }
+    )
+    roles = {"telefono": ColumnRole.NONE, "hotel": ColumnRole.ID}
+
+    plan = compile_plan(list(sample.columns), roles, sample)
+
+    assert plan.describe() == {
+        "contacto": {"detectors": ["email"], "source": "type"},
+        "hotel": {"detectors": ["id_sku"], "source": "role"},
+    }
+    assert compile_plan(list(sample.columns)).describe() == {
+        "telefono": {"detectors": ["phone_es"], "source": "name"},
+    }
+
+
+def test_plans_are_cached_per_header():
+    """A header signature is compiled once and evicted least recently used first"""
+    planner = RoutingPlanner(max_plans=2)
+
+    first = planner.plan(["email", "hotel"])
+    assert planner.plan(["email", "hotel"]) is first
+    assert planner.plan(["email", "hotel"], {"hotel": ColumnRole.ID}) is not first
+
+    planner.plan(["precio"])
+    assert len(planner) == 2
+    assert planner.plan(["email", "hotel"]) is not first
+
+
+def test_plan_in_summary(tmp_path):
+    """The issue summary shows the plan; declared roles reach the detectors"""
+    path = tmp_path / "reservas.csv"
+    pd.DataFrame(
+        {"hotel": ["Hotel Sol", "Hostal Luz"], "Correo": ["a@x.com", "malo@"], "ref": ["", "R2"]}
+    ).to_csv(path, index=False)
+    spec = InputSpec(file_path=str(path), file_type=FileType.CSV, column_roles={"Ref": "id"})
+
+    issues, summary = detect_issue_batch(spec)
+
+    assert summary["routing"] == {
+        "correo": {"detectors": ["email"], "source": "name"},
+        "ref": {"detectors": ["id_sku"], "source": "role"},
+    }
+    assert sorted(kind.value for kind in summary["by_kind"]) == ["email_invalid", "id_missing"]
@@ -0,0 +1,77 @@
+"""Test chunked (streaming) issue detection"""
+import pytest
+from app.io_utils import iter_frames
+from app.schemas import InputSpec, FileType, IssueKind
+from app.services.issues_service import detect_issues
+
+
+def _key(issue):
+    return (issue.kind.value, issue.row, issue.col, sorted(issue.details.items(), key=str))
+
+
+def test_iter_frames_keeps_global_row_index(sample_csv_dirty):
+    """Chunks are bounded and carry the row numbers of the whole file"""
+    spec = InputSpec(file_path=sample_csv_dirty, file_type=FileType.CSV)
+
+    chunks = list(iter_frames(spec, chunk_rows=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [int(i) for chunk in chunks for i in chunk.index] == [0, 1, 2, 3, 4]
+    assert list(chunks[0].columns) == ["id", "nombre", "email", "telefono", "precio", "fecha"]
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 3])
+def test_chunked_detection_matches_full_load(sample_csv_dirty, chunk_rows):
+    """Cross-chunk state yields the same issues as loading the whole frame"""
+    full = detect_issues(InputSpec(file_path=sample_csv_dirty, file_type=FileType.CSV))
+    chunked = detect_issues(
+        InputSpec(file_path=sample_csv_dirty, file_type=FileType.CSV, chunk_rows=chunk_rows)
+    )
+
+    assert sorted(map(_key, chunked.issues), key=str) == sorted(map(_key, full.issues), key=str)
+    assert chunked.summary["total_rows"] == 5
+
+
+def test_chunked_detection_carries_state(tmp_path):
+    """Dominant date format, currencies and seen rows span chunk boundaries"""
+    path = tmp_path / "data.csv"
+    path.write_text(
+        "nombre,email,fecha,precio\n"
+        "Ana,ana@example.com,2024-01-01,10 EUR\n"
+        "Luis,luis@example.com,2024-01-02,12 EUR\n"
+        "Eva,eva@example.com,03/01/2024,$5\n"
+        "Ana,ana@example.com,2024-01-04,7 EUR\n"
+    )
+
+    result = detect_issues(InputSpec(file_path=str(path), file_type=FileType.CSV, chunk_rows=1))
+    issues = result.issues
+
+    date_issues = [i for i in issues if i.kind == IssueKind.DATE_FORMAT]
+    assert [i.row for i in date_issues] == [2]
+    assert date_issues[0].details["dominant_format"] == "YYYY-MM-DD"
+
+    mixed = [i for i in issues if i.kind == IssueKind.CURRENCY and i.row is None]
+    assert len(mixed) == 1
+
+    dups = [i for i in issues if i.kind == IssueKind.DUPLICATE]
+    assert [(i.row, i.details["duplicate_of"]) for i in dups] == [(3, 0)]
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7])
+def test_chunked_detection_reads_values_as_text(tmp_path, chunk_rows):
+    """Chunks do not infer dtypes: a chunk of numbers reads like the whole file"""
+    phones = ["+34655987654", "600123456", "", "+34 911 234 567"]
+    # From row 40 on, no value stops a chunk from parsing as numbers
+    values = [phones[row % 4 if row < 40 else row % 3] for row in range(60)]
+    path = tmp_path / "data.csv"
+    rows = "".join(f"Cliente {row},{value}\n" for row, value in enumerate(values))
+    path.write_text("nombre,telefono\n" + rows)
+
+    full = detect_issues(InputSpec(file_path=str(path), file_type=FileType.CSV))
+    chunked = detect_issues(
+        InputSpec(file_path=str(path), file_type=FileType.CSV, chunk_rows=chunk_rows)
+    )
+
+    assert sorted(map(_key, chunked.issues), key=str) == sorted(map(_key, full.issues), key=str)
+    phone_issues = [i for i in chunked.issues if i.col == "telefono"]
+    assert {i.details.get("value") for i in phone_issues} <= {"600123456"}
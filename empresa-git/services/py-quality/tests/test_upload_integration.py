@@ -0,0 +1,137 @@
+"""Test binary upload endpoints"""
+import os
+import pytest
+from httpx import AsyncClient
+from app.main import app
+from app.config import settings
+
+
+def _uploads_left():
+    uploads_dir = os.path.join(settings.quality_tmp_dir, "uploads")
+    return os.listdir(uploads_dir) if os.path.isdir(uploads_dir) else []
+
+
+@pytest.mark.asyncio
+async def test_detect_issues_multipart(sample_csv_dirty):
+    """POST /detect_issues/upload with a multipart file matches the JSON endpoint"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        with open(sample_csv_dirty, "rb") as f:
+            response = await client.post(
+                "/detect_issues/upload", files={"file": ("clientes.csv", f, "text/csv")}
+            )
+        expected = await client.post(
+            "/detect_issues", json={"file_path": sample_csv_dirty, "file_type": "csv"}
+        )
+
+    assert response.status_code == 200
+    assert response.json()["summary"] == expected.json()["summary"]
+    assert _uploads_left() == []
+
+
+@pytest.mark.asyncio
+async def test_infer_octet_stream(sample_csv_dirty):
+    """POST /infer/upload with a raw body and options in the query string"""
+    with open(sample_csv_dirty, "rb") as f:
+        body = f.read()
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/infer/upload",
+            params={"file_type": "csv", "columns": "email,telefono"},
+            content=body,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+
+    assert response.status_code == 200
+    assert [c["name"] for c in response.json()["columns"]] == ["email", "telefono"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_spooled_in_pieces():
+    """A body arriving in many small messages is written whole, past the copy buffer"""
+    rows = [f"{i},cliente{i}@example.com\n".encode() for i in range(50000)]
+
+    async def body():
+        yield b"id,email\n"
+        for start in range(0, len(rows), 1000):
+            yield b"".join(rows[start : start + 1000])
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/detect_issues/upload",
+            params={"file_type": "csv", "columns": "id"},
+            content=body(),
+            headers={"Content-Type": "application/octet-stream"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["summary"]["total_rows"] == 50000
+    assert _uploads_left() == []
+
+
+@pytest.mark.asyncio
+async def test_apply_fixes_upload_keeps_filename(sample_csv_dirty):
+    with open(sample_csv_dirty, "rb") as f:
+        body = f.read()
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/apply_fixes/upload",
+            content=body,
+            headers={"Content-Type": "application/octet-stream", "X-Filename": "ventas.csv"},
+        )
+
+    assert response.status_code == 200
+    clean_path = response.json()["file_clean_path"]
+    assert os.path.basename(clean_path) == "clean_ventas.csv"
+    assert os.path.exists(clean_path)
+    os.unlink(clean_path)
+
+
+@pytest.mark.asyncio
+async def test_upload_unknown_type():
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/detect_issues/upload",
+            content=b"a,b\n1,2\n",
+            headers={"Content-Type": "application/octet-stream"},
+        )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["code"] == "PARSE_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_upload_forwards_every_option(sample_csv_dirty):
+    """JSON-only options (roles, compression, dedupe...) are query parameters too"""
+    with open(sample_csv_dirty, "rb") as f:
+        body = f.read()
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/detect_issues/upload",
+            params={
+                "file_type": "csv",
+                "header": "auto",
+                "column_roles": '{"nombre": "none", "id": "id"}',
+                "columns_map": '{"telefono": "movil"}',
+                "route_types": "false",
+                "dup_clusters": "true",
+            },
+            content=body,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+        invalid = await client.post(
+            "/detect_issues/upload",
+            params={"file_type": "csv", "column_roles": "{nombre"},
+            content=body,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+
+    assert response.status_code == 200
+    routing = response.json()["summary"]["routing"]
+    assert routing["id"]["source"] == "role"
+    assert routing["movil"]["source"] == "name"
+    assert "nombre" not in routing
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"]["code"] == "PARSE_ERROR"
@@ -0,0 +1,71 @@
+"""Test the streaming XLSX reader"""
+import openpyxl
+import pandas as pd
+import pytest
+from app.io_utils import iter_frames, load_frame
+from app.schemas import InputSpec, FileType
+from app.services.issues_service import detect_issues
+
+
+@pytest.fixture
+def dirty_xlsx(tmp_path):
+    """Workbook with ragged rows, a blank row in the middle and trailing blank rows"""
+    path = tmp_path / "data.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["ID", "Nombre", "Email", "Precio"])
+    sheet.append([1, "Juan", "juan@example.com", 10.5])
+    sheet.append([2, "María", "maria@", 0])
+    sheet.append([None, None, None, None])
+    sheet.append([4, "juan", "juan@example.com"])
+    sheet.append([None, "Luis", "luis@", -5.25])
+    sheet.cell(row=9, column=1, value=None)
+    workbook.save(path)
+    return str(path)
+
+
+def test_streamed_chunks_match_read_excel(dirty_xlsx):
+    spec = InputSpec(file_path=dirty_xlsx, file_type=FileType.XLSX)
+
+    chunks = list(iter_frames(spec, chunk_rows=2))
+
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    streamed = pd.concat(chunks)
+    pd.testing.assert_frame_equal(streamed, load_frame(spec))
+
+
+def test_streamed_projection(dirty_xlsx):
+    spec = InputSpec(file_path=dirty_xlsx, file_type=FileType.XLSX)
+
+    chunks = list(iter_frames(spec, chunk_rows=10, columns=["email"]))
+
+    assert len(chunks) == 1
+    assert list(chunks[0].columns) == ["email"]
+    assert chunks[0]["email"].tolist()[:2] == ["juan@example.com", "maria@"]
+
+
+def test_chunked_detection_on_xlsx(dirty_xlsx):
+    full = detect_issues(InputSpec(file_path=dirty_xlsx, file_type=FileType.XLSX))
+    chunked = detect_issues(InputSpec(file_path=dirty_xlsx, file_type=FileType.XLSX, chunk_rows=2))
+
+    assert chunked.summary == full.summary
+
+
+def test_cells_read_as_text_in_every_chunk(tmp_path):
+    """A blank cell does not turn a chunk's phone numbers into floats"""
+    path = tmp_path / "telefonos.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Telefono", "Precio"])
+    for phone, amount in [(600123456, 10.5), (None, 3.0), (600234567, None), (655987654, 7)]:
+        sheet.append([phone, amount])
+    workbook.save(path)
+    spec = InputSpec(file_path=str(path), file_type=FileType.XLSX)
+
+    full = load_frame(spec)
+    assert full["telefono"].tolist()[::2] == ["600123456", "600234567"]
+    assert full["precio"].tolist()[:2] == ["10.5", "3"]
+    pd.testing.assert_frame_equal(pd.concat(iter_frames(spec, chunk_rows=1)), full)
+
+    chunked = detect_issues(spec.model_copy(update={"chunk_rows": 1}))
+    assert chunked.issues == detect_issues(spec).issues